@@ -0,0 +1,292 @@
+"""
+This file runs the benchmark suite for the hand evaluator and for full rounds of the game.
+
+Every benchmark calls one function over a corpus of deals generated from a fixed seed,
+so two runs with the same seed and corpus size do exactly the same work. Calls are
+timed in batches: the ops/sec of a benchmark is its total calls over its total time,
+and its latency percentiles are taken over the average call time of each batch (timing
+every call on its own would mostly measure the timer).
+
+Results can be saved as JSON and compared against a baseline saved by an earlier run;
+any benchmark whose ops/sec fell by more than the threshold is reported as a slowdown.
+Baselines depend on the machine, so none is kept in the repository.
+
+Usage:
+    python -m benchmarks.run_benchmarks --output results.json
+    python -m benchmarks.run_benchmarks --baseline results.json --threshold 0.1
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+import numpy as np
+
+import src.hand_evaluator as poker
+from src.deck import Deck
+from src.round_engine import RoundEngine, Strategy
+
+DEFAULT_SEED = 1
+DEFAULT_CORPUS_SIZE = 2000
+# The least time to spend timing each benchmark
+DEFAULT_MIN_SECONDS = 0.5
+# A benchmark is a slowdown if its ops/sec fell by more than this fraction of the baseline
+DEFAULT_THRESHOLD = 0.10
+BATCH_SIZE = 100
+PERCENTILES = (50, 90, 99)
+
+PREDICATES = (
+    'is_royal_flush',
+    'is_straight_flush',
+    'is_four_of_a_kind',
+    'is_full_house',
+    'is_flush',
+    'is_straight',
+    'is_three_of_a_kind',
+    'is_two_pair',
+    'is_pair'
+)
+# Each tie breaker, and the rankings of the hands it breaks ties between
+TIE_BREAKERS = {
+    'break_tie_straight': ('royal flush', 'straight flush', 'straight'),
+    'break_tie_four_of_a_kind': ('four of a kind',),
+    'break_tie_full_house': ('full house',),
+    'break_tie_flush': ('flush',),
+    'break_tie_three_of_a_kind': ('three of a kind',),
+    'break_tie_two_pairs': ('two pairs',),
+    'break_tie_one_pair': ('one pair',),
+    'break_tie_high_card': ('high card',)
+}
+
+ROUND_STARTING_CHIPS = 1000000
+
+
+class PairStrategy(Strategy):
+    """
+    Picks up the first pair of pocket cards that holds a pair (so the player is given the
+    third pair if neither of the first two does).
+    """
+
+    def pick_up(self, hand, rejected_hands):
+        return hand[0].value == hand[1].value
+
+
+class BenchmarkResult:
+    def __init__(self, name, calls, seconds, batch_latencies):
+        """
+        Params:
+            name: the name of the benchmark
+            calls: the number of calls timed
+            seconds: the total time of those calls
+            batch_latencies: the average time of a call in each timed batch, in seconds
+        """
+        self.name = name
+        self.calls = calls
+        self.seconds = seconds
+        self.batch_latencies = batch_latencies
+
+    def ops_per_second(self):
+        return self.calls / self.seconds if self.seconds else 0.0
+
+    def to_json(self):
+        result = {'calls': self.calls, 'seconds': self.seconds, 'ops_per_second': self.ops_per_second()}
+        for (percentile, latency) in zip(PERCENTILES, np.percentile(self.batch_latencies, PERCENTILES)):
+            result['p{}_microseconds'.format(percentile)] = float(latency) * 1e6
+        return result
+
+
+def build_corpus(seed=DEFAULT_SEED, size=DEFAULT_CORPUS_SIZE):
+    """
+    Deals size rounds from a fixed seed. Each deal is eleven cards in their integer form:
+    the player's hand, the dealer's two hands, and the five community cards.
+    """
+    rng = random.Random(seed)
+    return [tuple(rng.sample(range(52), 11)) for _ in range(size)]
+
+
+def get_benchmarks(corpus, seed=DEFAULT_SEED):
+    """
+    Returns the benchmarks as (name, function, arguments) tuples, where function is
+    called once with each tuple of arguments in turn.
+    """
+    deals = [(deal[0:2], deal[2:4], deal[4:6], deal[6:11]) for deal in corpus]
+    seven_cards = [deal[0:2] + deal[6:11] for deal in corpus]
+    # The five best cards of each player's seven, so the predicates see realistic hands
+    five_card_hands = [
+        (tuple(poker.find_best_hand(cards[:2], cards[2:])[1]),) for cards in seven_cards
+    ]
+    tie_pairs = get_tie_pairs([hand for (hand,) in five_card_hands])
+    all_hands = [(poker.get_all_possible_hands_sorted(cards[:2], cards[2:]),) for cards in seven_cards]
+
+    round_engine = RoundEngine(PairStrategy(), ROUND_STARTING_CHIPS)
+
+    benchmarks = []
+    benchmarks += [(name, getattr(poker, name), five_card_hands) for name in PREDICATES]
+    # A tie breaker is left out if the corpus has none of its hands
+    benchmarks += [(name, getattr(poker, name), tie_pairs[name]) for name in TIE_BREAKERS if tie_pairs[name]]
+    benchmarks += [
+        ('get_hand_strength', poker.get_hand_strength, five_card_hands),
+        ('get_best_hand', poker.get_best_hand, all_hands),
+        ('find_best_hand', poker.find_best_hand, [(cards[:2], cards[2:]) for cards in seven_cards]),
+        ('determine_outcome', poker.determine_outcome, deals),
+        ('determine_outcome_from_table', poker.determine_outcome_from_table, deals),
+        ('headless_round', play_headless_round, [(round_engine, Deck(rng=random.Random(seed)))])
+    ]
+    return benchmarks
+
+
+def get_tie_pairs(hands):
+    """
+    Pairs up five-card hands of the same ranking for each tie breaker, so each one is
+    timed on the ties it breaks: every hand is paired with the previous hand of its
+    ranking (or with itself, if it is the only one).
+
+    Returns:
+        A dictionary of the lists of (hand, hand) arguments, by tie breaker
+    """
+    hands_by_ranking = {}
+    for hand in hands:
+        hands_by_ranking.setdefault(poker.get_best_possible_ranking(hand), []).append(hand)
+
+    tie_pairs = {}
+    for (name, hand_names) in TIE_BREAKERS.items():
+        tie_pairs[name] = []
+        for hand_name in hand_names:
+            group = hands_by_ranking.get(poker.hand_ranking[hand_name], [])
+            tie_pairs[name] += [(group[i], group[i - 1]) for i in range(len(group))]
+    return tie_pairs
+
+
+def play_headless_round(round_engine, deck):
+    """
+    Plays one full round of the game with the headless round engine (see round_engine.py),
+    dealing from a deck with its own seeded generator so the rounds are the same from run to run.
+    """
+    if round_engine.is_game_over():
+        round_engine.new_game()
+    deck.reset()
+    return round_engine.play_round(deck)
+
+
+def run_benchmark(name, function, arguments, min_seconds=DEFAULT_MIN_SECONDS):
+    """
+    Calls function with each tuple of arguments, cycling through them in batches of
+    BATCH_SIZE calls until at least min_seconds have been timed.
+    """
+    calls = 0
+    seconds = 0.0
+    batch_latencies = []
+    index = 0
+    while seconds < min_seconds or calls < len(arguments):
+        batch = [arguments[(index + i) % len(arguments)] for i in range(BATCH_SIZE)]
+        index = (index + BATCH_SIZE) % len(arguments)
+
+        start = time.perf_counter()
+        for call_arguments in batch:
+            function(*call_arguments)
+        elapsed = time.perf_counter() - start
+
+        calls += BATCH_SIZE
+        seconds += elapsed
+        batch_latencies.append(elapsed / BATCH_SIZE)
+    return BenchmarkResult(name, calls, seconds, batch_latencies)
+
+
+def run_benchmarks(seed=DEFAULT_SEED, corpus_size=DEFAULT_CORPUS_SIZE, min_seconds=DEFAULT_MIN_SECONDS, names=None):
+    """
+    Runs the benchmark suite.
+
+    Params:
+        seed: the seed of the corpus of deals
+        corpus_size: the number of deals in the corpus
+        min_seconds: the least time to spend timing each benchmark
+        names: if given, only the benchmarks whose names contain one of these strings are run
+    Returns:
+        A dictionary of the run's settings and of each benchmark's results, ready to be saved as JSON
+    """
+    results = {}
+    for (name, function, arguments) in get_benchmarks(build_corpus(seed, corpus_size), seed):
+        if names and not any(part in name for part in names):
+            continue
+        results[name] = run_benchmark(name, function, arguments, min_seconds).to_json()
+
+    return {
+        'settings': {
+            'seed': seed,
+            'corpus_size': corpus_size,
+            'min_seconds': min_seconds,
+            'python': platform.python_version(),
+            'platform': platform.platform()
+        },
+        'benchmarks': results
+    }
+
+
+def find_slowdowns(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares the results of a run against a baseline run.
+
+    Params:
+        results: the dictionary returned by run_benchmarks
+        baseline: a dictionary returned by an earlier run_benchmarks
+        threshold: the fraction by which ops/sec may fall before a benchmark is flagged
+    Returns:
+        A list of (name, baseline ops/sec, current ops/sec) tuples for each benchmark
+        in both runs whose ops/sec fell by more than the threshold
+    """
+    slowdowns = []
+    for (name, result) in results['benchmarks'].items():
+        baseline_result = baseline['benchmarks'].get(name)
+        if baseline_result is None:
+            continue
+        if result['ops_per_second'] < baseline_result['ops_per_second'] * (1 - threshold):
+            slowdowns.append((name, baseline_result['ops_per_second'], result['ops_per_second']))
+    return slowdowns
+
+
+def format_results(results):
+    lines = ['{:<32}{:>14}{:>12}{:>12}{:>12}'.format('benchmark', 'ops/sec', 'p50 us', 'p90 us', 'p99 us')]
+    for (name, result) in results['benchmarks'].items():
+        lines.append('{:<32}{:>14,.0f}{:>12.2f}{:>12.2f}{:>12.2f}'.format(
+            name,
+            result['ops_per_second'],
+            result['p50_microseconds'],
+            result['p90_microseconds'],
+            result['p99_microseconds']
+        ))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the hand evaluator and full rounds of the game.')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='seed of the corpus of deals')
+    parser.add_argument('--corpus-size', type=int, default=DEFAULT_CORPUS_SIZE, help='number of deals in the corpus')
+    parser.add_argument('--min-seconds', type=float, default=DEFAULT_MIN_SECONDS, help='least time per benchmark')
+    parser.add_argument('--only', nargs='*', default=None, help='only run benchmarks whose names contain these')
+    parser.add_argument('--output', default=None, help='save the results as JSON to this path')
+    parser.add_argument('--baseline', default=None, help='compare against results saved by an earlier run')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='allowed fraction of slowdown')
+    arguments = parser.parse_args(argv)
+
+    results = run_benchmarks(arguments.seed, arguments.corpus_size, arguments.min_seconds, arguments.only)
+    print(format_results(results))
+
+    if arguments.output:
+        with open(arguments.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if arguments.baseline:
+        with open(arguments.baseline) as baseline_file:
+            slowdowns = find_slowdowns(results, json.load(baseline_file), arguments.threshold)
+        for (name, baseline_ops, ops) in slowdowns:
+            print('SLOWDOWN {}: {:,.0f} -> {:,.0f} ops/sec ({:.1%})'.format(name, baseline_ops, ops, ops / baseline_ops - 1))
+        if slowdowns:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,13 @@
+import argparse
+
 from src.game_engine import GameEngine
+from src.gui_constants import FRAME_RATE
 
 if __name__ == '__main__':
-    engine = GameEngine()
+    parser = argparse.ArgumentParser(description='Play Triple Pocket Hold\'em.')
+    parser.add_argument('--history', default=None, help='append every round played to this hand history file')
+    parser.add_argument('--fps', type=int, default=FRAME_RATE, help='the most frames per second to draw')
+    arguments = parser.parse_args()
+
+    engine = GameEngine(arguments.history, arguments.fps)
     engine.run_game()
@@ -0,0 +1,119 @@
+"""
+This file maps card situations to a canonical form under permutations of the suites.
+
+The suites carry no value in poker, so two situations that differ only by a relabelling
+of the suites (e.g. swapping every heart for a spade and every spade for a heart) have
+the same outcome. Mapping both to the same canonical form lets results computed for
+one be shared with all of its (up to 24) isomorphic situations.
+
+A situation is a sequence of groups of cards (e.g. the player's hand, the dealer's two
+hands, and the community cards). The order of the groups matters, but the order of
+cards within a group does not. Each suite is described by a signature: the masks of
+ranks it holds in each group. Suites are relabelled in order of decreasing signature,
+so isomorphic situations always produce the same canonical form.
+"""
+
+import operator
+
+import numpy as np
+
+# Each group's 13-bit rank mask takes its own field of a suite's signature.
+RANK_MASK_BITS = 13
+# The most groups the batch functions can handle while a signature fits in an int64.
+MAX_BATCH_GROUPS = 4
+
+
+def canonicalize(*groups):
+    """
+    Maps a situation to its canonical form.
+
+    Params:
+        groups: sequences of cards, either card objects or their integer forms
+    Returns:
+        1) a tuple holding a sorted tuple of integer cards for each group
+        2) the permutation used, a tuple holding the canonical suite index of each original suite index
+    """
+    signatures = [0, 0, 0, 0]
+    int_groups = []
+    for group in groups:
+        int_group = tuple(map(operator.index, group))
+        for suite in range(4):
+            signatures[suite] <<= RANK_MASK_BITS
+        for card in int_group:
+            signatures[card & 3] |= 1 << (card >> 2)
+        int_groups.append(int_group)
+
+    permutation = [0, 0, 0, 0]
+    for canonical_suite, suite in enumerate(sorted(range(4), key=signatures.__getitem__, reverse=True)):
+        permutation[suite] = canonical_suite
+
+    canonical_groups = tuple(
+        tuple(sorted((card & ~3) | permutation[card & 3] for card in int_group))
+        for int_group in int_groups
+    )
+    return (canonical_groups, tuple(permutation))
+
+
+def get_canonical_key(*groups):
+    """
+    Returns the canonical form of a situation without the permutation, for use as a cache key.
+    """
+    (canonical_groups, _) = canonicalize(*groups)
+    return canonical_groups
+
+
+def apply_permutation(cards, permutation):
+    """
+    Relabels the suites of cards (in integer form) according to permutation.
+    """
+    return tuple((card & ~3) | permutation[card & 3] for card in map(operator.index, cards))
+
+
+def invert_permutation(permutation):
+    """
+    Returns the permutation that undoes permutation, mapping canonical suites back to the original suites.
+    """
+    inverse = [0, 0, 0, 0]
+    for suite, canonical_suite in enumerate(permutation):
+        inverse[canonical_suite] = suite
+    return tuple(inverse)
+
+
+def canonicalize_batch(cards, group_sizes):
+    """
+    Maps many situations to their canonical forms at once.
+
+    Params:
+        cards: an (N, k) array of cards in integer form, each row holding the groups of one situation side by side
+        group_sizes: the number of cards in each group, adding up to k (at most MAX_BATCH_GROUPS groups)
+    Returns:
+        1) an (N, k) int8 array of the canonical situations, with the cards of each group sorted
+        2) an (N, 4) int8 array holding the canonical suite index of each original suite index
+    """
+    cards = np.asarray(cards, dtype=np.int64)
+    if len(group_sizes) > MAX_BATCH_GROUPS or sum(group_sizes) != cards.shape[1]:
+        raise ValueError('Expected at most {} groups adding up to {} cards'.format(MAX_BATCH_GROUPS, cards.shape[1]))
+
+    num_situations = len(cards)
+    rows = np.arange(num_situations)
+    suites = cards & 3
+    ranks = cards >> 2
+
+    signatures = np.zeros((num_situations, 4), dtype=np.int64)
+    start = 0
+    for group_size in group_sizes:
+        signatures <<= RANK_MASK_BITS
+        for column in range(start, start + group_size):
+            signatures[rows, suites[:, column]] |= np.int64(1) << ranks[:, column]
+        start += group_size
+
+    order = np.argsort(-signatures, axis=1, kind='stable')
+    permutation = np.empty((num_situations, 4), dtype=np.int64)
+    permutation[rows[:, np.newaxis], order] = np.arange(4)
+
+    canonical_cards = (cards & ~3) | permutation[rows[:, np.newaxis], suites]
+    start = 0
+    for group_size in group_sizes:
+        canonical_cards[:, start:start + group_size].sort(axis=1)
+        start += group_size
+    return (canonical_cards.astype(np.int8), permutation.astype(np.int8))
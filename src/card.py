@@ -2,8 +2,13 @@
 This file specifies the Card class.
 The card class  is very rudimentary: it consists solely of three properties:
 a suite, a value (2-14, where 11-14 represent jack, queen, king, and ace respectively),
-and a path to an image of that respective card.
-The image path dictionary below specifies the paths.
+and the integer form of the card.
+Each card is also represented by an integer from 0 to 51: (value - 2) * 4 + suite index,
+so the value of a card is (card >> 2) + 2 and its suite index is card & 3. The hand
+evaluator can work on either form.
+There are exactly 52 card objects (one per integer), which are created once when this file
+is imported and shared everywhere else. The image path dictionary below specifies the paths
+to the images of the cards.
 """
 
 image_paths = {
@@ -70,8 +75,95 @@ image_paths = {
 
 }
 
+SUITES = ('diamonds', 'hearts', 'spades', 'clubs')
+VALUES = (2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14)
+SUITE_INDEX = {suite: index for index, suite in enumerate(SUITES)}
+
+
 class Card:
-    def __init__(self, suite, value):
-        self.suite = suite
-        self.value = value
-        self.img_path = image_paths[self.suite][self.value]
+    __slots__ = ('suite', 'value', 'index')
+
+    def __new__(cls, suite, value):
+        """
+        Returns the shared card object for the given suite and value
+        rather than creating a new one.
+        """
+        return CARDS[card_to_int(suite, value)]
+
+    @property
+    def img_path(self):
+        return IMAGE_PATHS[self.index]
+
+    def __index__(self):
+        """
+        Allows a card object to be used wherever its integer form is
+        expected (i.e. to index the lookup tables used by the evaluator).
+        """
+        return self.index
+
+    __int__ = __index__
+
+    def __setattr__(self, name, value):
+        """
+        Cards are shared by every hand in the process, so changing one would change
+        them all; they cannot be changed once created.
+        """
+        raise AttributeError('Card objects are immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('Card objects are immutable')
+
+    def __reduce__(self):
+        return (card_from_int, (self.index,))
+
+    def __repr__(self):
+        return 'Card({!r}, {!r})'.format(self.suite, self.value)
+
+
+def card_to_int(suite, value):
+    """
+    Returns the integer form (0-51) of the card with the given suite and value.
+    """
+    return (value - 2) * 4 + SUITE_INDEX[suite]
+
+
+def card_from_int(card):
+    """
+    Returns the shared card object for the integer form of a card.
+    """
+    return CARDS[card]
+
+
+def to_cards(cards):
+    """
+    Given a sequence of cards in either form (card objects or integers),
+    returns a tuple of the equivalent card objects.
+    """
+    return tuple(CARDS[card] for card in cards)
+
+
+def to_ints(cards):
+    """
+    Given a sequence of cards in either form (card objects or integers),
+    returns a tuple of their integer forms.
+    """
+    return tuple(card.__index__() for card in cards)
+
+
+def get_img_path(card):
+    """
+    Returns the image path of a card given in either form.
+    """
+    return IMAGE_PATHS[card]
+
+
+def _create_card(index):
+    card = object.__new__(Card)
+    object.__setattr__(card, 'suite', SUITES[index & 3])
+    object.__setattr__(card, 'value', (index >> 2) + 2)
+    object.__setattr__(card, 'index', index)
+    return card
+
+
+CARDS = tuple(_create_card(index) for index in range(52))
+IMAGE_PATHS = tuple(image_paths[card.suite][card.value] for card in CARDS)
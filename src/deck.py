@@ -1,61 +1,184 @@
 """
 This file specifies the deck class. 
 Each deck object represents a deck of standard playing cards,
-consisting of 52 card objects.
+consisting of the 52 shared card objects (or, optionally, their integer forms).
 The deck class has methods to draw cards and shuffle the  deck.
+
+A deck is made once and reused: reset returns every card to it without creating
+anything, and each draw picks one of the cards still in the deck at random (one step
+of a Fisher-Yates shuffle), so only as many cards are shuffled as are drawn -- eleven
+in a round, rather than all 52.
+
+For batch simulation, deal_rounds deals many rounds at once into a NumPy array of
+integer cards, with the same partial shuffle applied to every round together, so
+no Python objects are created per round. Its output can be split into the columns
+the batch evaluator takes (see determine_outcome_batch in hand_evaluator.py).
 """
 
 import random
 
-from src.card import Card
+import numpy as np
+
+from src.card import CARDS, SUITES, VALUES
+
+CARDS_PER_ROUND = 11
+# The columns of a row dealt by deal_rounds: the three pairs of pocket cards, in the
+# order they are shown to the player, then the five community cards
+ROUND_HAND_COLUMNS = (slice(0, 2), slice(2, 4), slice(4, 6))
+ROUND_COMMUNITY_COLUMNS = slice(6, 11)
+# The number of rounds dealt at once. The decks of a chunk (52 bytes a round) stay in
+# the processor's cache, which makes small chunks several times faster than large ones.
+DEAL_CHUNK_SIZE = 1 << 14
 
 # Note: the values 11-14 represent the Jack, Queen, King, and Ace respectively.
 # Representing their values with numbers simplifies the logic for  determining
 # which hands a player holds.
-card_values = [2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14]
-suites = ['diamonds', 'hearts', 'spades', 'clubs']
+card_values = list(VALUES)
+suites = list(SUITES)
 
 class Deck:
-    def __init__(self):
+    def __init__(self, integer_cards=False, rng=None):
+        """
+        Params:
+            integer_cards: if true, the deck holds the integer forms of the cards (0-51)
+                rather than card objects.
+            rng: the source of randomness for the draws, such as a random.Random
+                (defaults to the random module). A deck given its own seeded generator
+                always draws the same cards.
+        """
+        self.integer_cards = integer_cards
+        self.rng = rng if rng is not None else random
         self.cards = []
+        # The cards still in the deck are self.cards[:self.remaining]; the drawn cards
+        # follow them, the most recently drawn first.
+        self.remaining = 0
         self.create()
-        self.shuffle()
-    
+
     def create(self):
-        for suite in suites:
-            for value in card_values:
-                self.cards.append(Card(suite, value))
-        
+        if self.integer_cards:
+            self.cards = list(range(52))
+        else:
+            self.cards = list(CARDS)
+        self.remaining = len(self.cards)
+
+    def reset(self):
+        """
+        Returns every drawn card to the deck. The draws are random, so the deck does not
+        need to be shuffled again.
+        """
+        self.remaining = len(self.cards)
+
     def shuffle(self):
-        random.shuffle(self.cards)
+        """
+        Returns every drawn card to the deck and shuffles the whole deck. The draws are
+        random regardless, so this is only needed to reorder self.cards.
+        """
+        self.reset()
+        self.rng.shuffle(self.cards)
 
     def draw(self):
-        return self.cards.pop()
+        """
+        Swaps a card picked at random from the cards still in the deck with the last of
+        them, and draws it.
+        """
+        remaining = self.remaining - 1
+        if remaining < 0:
+            raise IndexError('draw from an empty deck')
+        cards = self.cards
+        index = int(self.rng.random() * (remaining + 1))
+        card = cards[index]
+        cards[index] = cards[remaining]
+        cards[remaining] = card
+        self.remaining = remaining
+        return card
+
+    def __len__(self):
+        return self.remaining
 
     def draw_two_card_hand(self):
         """
         Since the players are presented with two-card hands (the pocket cards),
-        this method pops two card off the deck and returns them.
+        this method draws two cards off the deck and returns them.
 
         Returns:
-            A pair of card objects popped off the deck.
+            A pair of cards drawn off the deck.
         """
-        first_card = self.cards.pop()
-        second_card = self.cards.pop()
-        return (first_card, second_card)
+        return (self.draw(), self.draw())
 
     def draw_five_community_cards(self):
         """
         Since there are five community cards in Hold'Em,
-        this methods pops five cards off the deck and returns
+        this methods draws five cards off the deck and returns
         them.
 
         Returns:
-            A quintuple of card objects that were popped off the deck.
-        """
-        first_card = self.cards.pop()
-        second_card = self.cards.pop()
-        third_card = self.cards.pop()
-        fourth_card = self.cards.pop()
-        fifth_card = self.cards.pop()
-        return (first_card, second_card, third_card, fourth_card, fifth_card)
+            A quintuple of cards that were drawn off the deck.
+        """
+        draw = self.draw
+        return (draw(), draw(), draw(), draw(), draw())
+
+
+def deal_rounds(num_rounds, seed=None, rng=None):
+    """
+    Deals num_rounds complete rounds at once: each round draws eleven cards without
+    replacement from its own full deck.
+
+    Params:
+        num_rounds: the number of rounds to deal
+        seed: the seed of the generator (ignored if rng is given)
+        rng: a NumPy Generator to deal with (defaults to np.random.default_rng(seed))
+    Returns:
+        A (num_rounds, 11) uint8 array of cards in their integer form, one round per row
+        (see ROUND_HAND_COLUMNS and ROUND_COMMUNITY_COLUMNS)
+    """
+    if rng is None:
+        rng = np.random.default_rng(seed)
+    cards = np.arange(52, dtype=np.uint8)
+    rounds = np.empty((num_rounds, CARDS_PER_ROUND), dtype=np.uint8)
+    for start in range(0, num_rounds, DEAL_CHUNK_SIZE):
+        end = min(start + DEAL_CHUNK_SIZE, num_rounds)
+        rounds[start:end] = draw_cards(rng, cards, end - start, CARDS_PER_ROUND)
+    return rounds
+
+
+def draw_cards(rng, cards, num_deals, num_cards):
+    """
+    Draws num_cards cards without replacement from cards, independently for each of
+    num_deals deals.
+
+    Params:
+        rng: a NumPy Generator
+        cards: an array of the cards in the deck
+        num_deals: the number of deals
+        num_cards: the number of cards drawn in each deal
+    Returns:
+        A (num_deals, num_cards) array of the drawn cards
+    """
+    return draw_cards_from_decks(rng, np.tile(cards, (num_deals, 1)), num_cards)
+
+
+def draw_cards_from_decks(rng, decks, num_cards):
+    """
+    Draws num_cards cards without replacement from each row of decks, with a partial
+    Fisher-Yates shuffle across all of the rows at once. The rows are shuffled in place
+    if decks is C-contiguous.
+
+    Params:
+        rng: a NumPy Generator
+        decks: an (N, deck size) array, each row holding the cards of one deck
+        num_cards: the number of cards drawn from each deck
+    Returns:
+        An (N, num_cards) view of the drawn cards
+    """
+    # The swaps index the decks as one flat array, which is much faster than indexing
+    # by row and column.
+    decks = np.ascontiguousarray(decks)
+    (num_decks, deck_size) = decks.shape
+    flat_decks = decks.reshape(-1)
+    row_offsets = np.arange(0, num_decks * deck_size, deck_size)
+    for position in range(num_cards):
+        swap_indexes = row_offsets + rng.integers(position, deck_size, size=num_decks)
+        swapped_cards = flat_decks[swap_indexes]
+        flat_decks[swap_indexes] = decks[:, position]
+        decks[:, position] = swapped_cards
+    return decks[:, :num_cards]
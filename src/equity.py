@@ -0,0 +1,367 @@
+"""
+This file contains functions that measure how a player's hand fares against
+the dealer's two hands in Triple Pocket Hold'em.
+
+Once the six pocket cards are known, C(46, 5) = 1,370,754 sets of community cards
+remain. calculate_exact_outcome enumerates all of them with the batch evaluator
+(see determine_outcome_batch in hand_evaluator.py) to give the exact probabilities
+of winning, tying, and losing and the exact expected wager multiple.
+
+When some of the cards are unknown (i.e. before the dealer's hands are dealt),
+estimate_outcome plays out random deals instead. The deals are split into shards,
+each with its own independent random stream, and the shards are scored across a
+pool of processes.
+"""
+
+import itertools
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from functools import lru_cache
+
+import numpy as np
+
+from src.card import to_ints
+from src.deck import draw_cards
+from src.hand_evaluator import determine_outcome_batch
+
+NUM_COMMUNITY_CARDS = 5
+
+DEFAULT_TRIALS = 1000000
+# The number of shards is fixed rather than tied to the number of processes,
+# so the same seed gives the same estimate on any machine.
+DEFAULT_SHARDS = 16
+# The number of deals each shard scores at once
+TRIAL_BATCH_SIZE = 100000
+
+
+class ExactOutcome:
+    def __init__(self, num_boards, wins, ties, losses, total_multiple):
+        """
+        Params:
+            num_boards: the number of sets of community cards enumerated
+            wins: the number of boards on which the player wins
+            ties: the number of boards on which the player and the dealer tie
+            losses: the number of boards on which the dealer wins
+            total_multiple: the sum of the player's wager multiples over every board
+        """
+        self.num_boards = num_boards
+        self.wins = wins
+        self.ties = ties
+        self.losses = losses
+        self.total_multiple = total_multiple
+
+    def win_probability(self):
+        return Fraction(self.wins, self.num_boards)
+
+    def tie_probability(self):
+        return Fraction(self.ties, self.num_boards)
+
+    def loss_probability(self):
+        return Fraction(self.losses, self.num_boards)
+
+    def expected_multiple(self):
+        """
+        Returns the exact expected wager multiple for the player (see get_wager_multiples
+        in hand_evaluator.py). The dealer's expected multiple is its negation.
+        """
+        return Fraction(self.total_multiple, self.num_boards)
+
+    def __add__(self, other):
+        return ExactOutcome(
+            self.num_boards + other.num_boards,
+            self.wins + other.wins,
+            self.ties + other.ties,
+            self.losses + other.losses,
+            self.total_multiple + other.total_multiple
+        )
+
+    def __repr__(self):
+        return 'ExactOutcome(num_boards={}, wins={}, ties={}, losses={}, total_multiple={})'.format(
+            self.num_boards, self.wins, self.ties, self.losses, self.total_multiple
+        )
+
+
+class MonteCarloOutcome:
+    def __init__(self, trials, wins, ties, losses, total_multiple, total_squared_multiple):
+        """
+        Params:
+            trials: the number of random deals played out
+            wins: the number of deals the player wins
+            ties: the number of deals the player and the dealer tie
+            losses: the number of deals the dealer wins
+            total_multiple: the sum of the player's wager multiples over every deal
+            total_squared_multiple: the sum of the squares of those multiples
+        """
+        self.trials = trials
+        self.wins = wins
+        self.ties = ties
+        self.losses = losses
+        self.total_multiple = total_multiple
+        self.total_squared_multiple = total_squared_multiple
+
+        # Filled in by estimate_outcome once every shard has been scored
+        self.seed = None
+        self.num_shards = 0
+        self.elapsed_seconds = 0.0
+
+    def win_probability(self):
+        return self.wins / self.trials
+
+    def tie_probability(self):
+        return self.ties / self.trials
+
+    def loss_probability(self):
+        return self.losses / self.trials
+
+    def expected_multiple(self):
+        """
+        Returns the estimated expected wager multiple for the player.
+        """
+        return self.total_multiple / self.trials
+
+    def standard_error(self):
+        """
+        Returns the standard error of the estimated expected wager multiple.
+        """
+        mean = self.expected_multiple()
+        variance = self.total_squared_multiple / self.trials - mean * mean
+        return math.sqrt(max(variance, 0.0) / self.trials)
+
+    def trials_per_second(self):
+        return self.trials / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def __add__(self, other):
+        return MonteCarloOutcome(
+            self.trials + other.trials,
+            self.wins + other.wins,
+            self.ties + other.ties,
+            self.losses + other.losses,
+            self.total_multiple + other.total_multiple,
+            self.total_squared_multiple + other.total_squared_multiple
+        )
+
+    def __repr__(self):
+        return 'MonteCarloOutcome(trials={}, wins={}, ties={}, losses={}, total_multiple={}, num_shards={})'.format(
+            self.trials, self.wins, self.ties, self.losses, self.total_multiple, self.num_shards
+        )
+
+
+def calculate_exact_outcome(player_hand, dealer_hand_one, dealer_hand_two, processes=None):
+    """
+    Enumerates every set of community cards that can be dealt alongside the given
+    pocket cards and tallies the outcome of the round on each one.
+
+    The boards are split by their first card (in deck order), and the groups are
+    scored in parallel across a pool of processes, largest group first.
+
+    Params:
+        player_hand: the two-card hand for the player
+        dealer_hand_one: the first two-card hand for the dealer
+        dealer_hand_two: the second two-card hand for the dealer
+        processes: the number of worker processes (defaults to the number of CPUs);
+            1 scores every board in the current process
+    Returns:
+        An ExactOutcome
+    """
+    pocket_cards = (to_ints(player_hand), to_ints(dealer_hand_one), to_ints(dealer_hand_two))
+    if any(len(hand) != 2 for hand in pocket_cards):
+        raise ValueError('Every pocket hand holds two cards')
+    check_known_cards(itertools.chain.from_iterable(pocket_cards))
+    dead_cards = set(itertools.chain.from_iterable(pocket_cards))
+    remaining_cards = tuple(card for card in range(52) if card not in dead_cards)
+
+    # Boards whose first card is remaining_cards[i] hold four more cards from those after it
+    tasks = [
+        (pocket_cards, remaining_cards, first_card_index)
+        for first_card_index in range(len(remaining_cards) - NUM_COMMUNITY_CARDS + 1)
+    ]
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    if processes == 1:
+        results = map(score_boards_starting_with, tasks)
+        return sum(results, ExactOutcome(0, 0, 0, 0, 0))
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        results = executor.map(score_boards_starting_with, tasks)
+        return sum(results, ExactOutcome(0, 0, 0, 0, 0))
+
+
+def check_known_cards(cards):
+    """
+    Raises a ValueError unless the known cards (in integer form) are distinct cards of the deck,
+    since overlapping cards would be counted in deals that cannot happen.
+    """
+    cards = tuple(cards)
+    if any(not 0 <= card < 52 for card in cards):
+        raise ValueError('Expected cards from 0 to 51, got {}'.format(cards))
+    if len(set(cards)) != len(cards):
+        raise ValueError('Expected distinct cards, got {}'.format(cards))
+
+
+def score_boards_starting_with(task):
+    """
+    Scores every board whose first card is remaining_cards[first_card_index].
+    This runs in the worker processes, so it takes a single picklable tuple.
+
+    Params:
+        task: a tuple of the pocket cards (player, first dealer, and second dealer hands
+            in integer form), the cards remaining in the deck, and the index of the
+            first card of the boards
+    Returns:
+        An ExactOutcome for those boards
+    """
+    (pocket_cards, remaining_cards, first_card_index) = task
+    later_cards = np.array(remaining_cards[first_card_index + 1:], dtype=np.int8)
+    combinations = get_combinations(len(later_cards), NUM_COMMUNITY_CARDS - 1)
+
+    num_boards = len(combinations)
+    boards = np.empty((num_boards, NUM_COMMUNITY_CARDS), dtype=np.int8)
+    boards[:, 0] = remaining_cards[first_card_index]
+    boards[:, 1:] = later_cards[combinations]
+
+    (player_hand, dealer_hand_one, dealer_hand_two) = (
+        np.broadcast_to(np.array(hand, dtype=np.int8), (num_boards, 2)) for hand in pocket_cards
+    )
+    (_, _, player_multiples, _) = determine_outcome_batch(player_hand, dealer_hand_one, dealer_hand_two, boards)
+
+    wins = int(np.count_nonzero(player_multiples > 0))
+    losses = int(np.count_nonzero(player_multiples < 0))
+    return ExactOutcome(
+        num_boards,
+        wins,
+        num_boards - wins - losses,
+        losses,
+        int(player_multiples.sum(dtype=np.int64))
+    )
+
+
+@lru_cache(maxsize=None)
+def get_combinations(n, k):
+    """
+    Returns every k-element combination of range(n), in lexicographic order,
+    as a read-only (C(n, k), k) array of indexes.
+    """
+    count = math.comb(n, k)
+    combinations = np.fromiter(
+        itertools.chain.from_iterable(itertools.combinations(range(n), k)),
+        dtype=np.int8,
+        count=count * k
+    ).reshape(count, k)
+    combinations.setflags(write=False)
+    return combinations
+
+
+def estimate_outcome(
+    player_hand,
+    dealer_hands=(),
+    dead_cards=(),
+    trials=DEFAULT_TRIALS,
+    seed=None,
+    shards=DEFAULT_SHARDS,
+    processes=None
+):
+    """
+    Estimates the outcome of a round by playing out random deals of the unknown cards:
+    whichever of the dealer's hands are not given, and the five community cards.
+
+    Each shard draws its deals from its own random stream, spawned from the seed, so
+    the estimate depends only on the cards, the seed, the number of trials, and the
+    number of shards -- not on the number of processes.
+
+    Params:
+        player_hand: the two-card hand for the player
+        dealer_hands: the dealer's known two-card hands (zero, one, or two of them)
+        dead_cards: any other cards known to be out of the deck
+        trials: the number of deals to play out
+        seed: the seed for the random streams (a fresh seed is chosen if this is None)
+        shards: the number of shards to split the deals into
+        processes: the number of worker processes (defaults to the number of CPUs);
+            1 scores every shard in the current process
+    Returns:
+        A MonteCarloOutcome, which also reports the seed used, the number of
+        shards, and the elapsed time
+    """
+    if len(dealer_hands) > 2:
+        raise ValueError('The dealer holds at most two hands')
+    if trials < 1 or shards < 1:
+        raise ValueError('Expected at least one trial and one shard, got {} and {}'.format(trials, shards))
+
+    player_hand = to_ints(player_hand)
+    dealer_hands = tuple(to_ints(hand) for hand in dealer_hands)
+    if any(len(hand) != 2 for hand in (player_hand,) + dealer_hands):
+        raise ValueError('Every pocket hand holds two cards')
+    check_known_cards(player_hand + sum(dealer_hands, ()) + to_ints(dead_cards))
+    known_cards = set(player_hand).union(*dealer_hands, to_ints(dead_cards))
+    remaining_cards = tuple(card for card in range(52) if card not in known_cards)
+
+    seed_sequence = np.random.SeedSequence(seed)
+    shards = min(shards, trials)
+    tasks = [
+        (player_hand, dealer_hands, remaining_cards, trials // shards + (shard < trials % shards), shard_seed)
+        for shard, shard_seed in enumerate(seed_sequence.spawn(shards))
+    ]
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    start_time = time.perf_counter()
+    if processes == 1:
+        outcome = sum(map(simulate_shard, tasks), MonteCarloOutcome(0, 0, 0, 0, 0, 0))
+    else:
+        with ProcessPoolExecutor(max_workers=min(processes, shards)) as executor:
+            outcome = sum(executor.map(simulate_shard, tasks), MonteCarloOutcome(0, 0, 0, 0, 0, 0))
+
+    outcome.seed = seed_sequence.entropy
+    outcome.num_shards = shards
+    outcome.elapsed_seconds = time.perf_counter() - start_time
+    return outcome
+
+
+def simulate_shard(task):
+    """
+    Plays out one shard of random deals. This runs in the worker processes,
+    so it takes a single picklable tuple.
+
+    Params:
+        task: a tuple of the player's hand, the dealer's known hands, the cards remaining
+            in the deck (all in integer form), the number of deals, and the shard's SeedSequence
+    Returns:
+        A MonteCarloOutcome for the shard
+    """
+    (player_hand, dealer_hands, remaining_cards, trials, shard_seed) = task
+    rng = np.random.default_rng(shard_seed)
+    remaining_cards = np.array(remaining_cards, dtype=np.int8)
+    num_unknown_dealer_hands = 2 - len(dealer_hands)
+    num_drawn_cards = 2 * num_unknown_dealer_hands + NUM_COMMUNITY_CARDS
+
+    outcome = MonteCarloOutcome(0, 0, 0, 0, 0, 0)
+    while outcome.trials < trials:
+        batch_size = min(TRIAL_BATCH_SIZE, trials - outcome.trials)
+        drawn_cards = draw_cards(rng, remaining_cards, batch_size, num_drawn_cards)
+
+        hands = [np.broadcast_to(np.array(hand, dtype=np.int8), (batch_size, 2)) for hand in dealer_hands]
+        hands += [drawn_cards[:, 2 * i:2 * i + 2] for i in range(num_unknown_dealer_hands)]
+        (_, _, player_multiples, _) = determine_outcome_batch(
+            np.broadcast_to(np.array(player_hand, dtype=np.int8), (batch_size, 2)),
+            hands[0],
+            hands[1],
+            drawn_cards[:, -NUM_COMMUNITY_CARDS:]
+        )
+
+        player_multiples = player_multiples.astype(np.int64)
+        wins = int(np.count_nonzero(player_multiples > 0))
+        losses = int(np.count_nonzero(player_multiples < 0))
+        outcome += MonteCarloOutcome(
+            batch_size,
+            wins,
+            batch_size - wins - losses,
+            losses,
+            int(player_multiples.sum()),
+            int((player_multiples * player_multiples).sum())
+        )
+    return outcome
@@ -0,0 +1,246 @@
+"""
+This file specifies the columnar export of rounds for analysis, written by the simulator
+(see simulator.py) and from hand histories (see history.py).
+
+An export is a directory of shards plus a small JSON manifest listing the shards, the
+number of rounds in each, and the columns. Every shard holds one array per column:
+    player_ranking, dealer_ranking: the rankings of the best hands (see hand_ranking in hand_evaluator.py)
+    player_multiple, dealer_multiple: the multiples applied to the wager
+    pick: the index (0-2) of the pair the player picked up, in the order the pairs were shown
+    wager: the number of chips wagered
+    player_chip_delta: the chips the player won (or lost, if negative)
+
+Shards are written in one of two formats:
+    npy: a directory of .npy files, one per column. A column is memory-mapped when it is
+        first used, so only the columns a query touches are read, and only the pages of
+        them it touches.
+    npz: a single compressed .npz file. This is several times smaller, but a .npz file is
+        a zip archive, which cannot be memory-mapped: a column is decompressed in full
+        the first time it is used (still without reading the other columns).
+
+A ColumnarDataset opens an export lazily, and select gathers chosen columns across
+the shards, filtering the rounds of each shard with a function of its columns.
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+from src.hand_evaluator import hand_ranking
+from src.history import load_history
+
+EXPORT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+EXPORT_FORMATS = ('npy', 'npz')
+DEFAULT_SHARD_ROUNDS = 1000000
+
+COLUMN_DTYPES = {
+    'player_ranking': np.dtype(np.uint8),
+    'dealer_ranking': np.dtype(np.uint8),
+    'player_multiple': np.dtype(np.int8),
+    'dealer_multiple': np.dtype(np.int8),
+    'pick': np.dtype(np.uint8),
+    'wager': np.dtype(np.int64),
+    'player_chip_delta': np.dtype(np.int64)
+}
+
+
+class RoundColumnBuilder:
+    """
+    Collects the columns of RoundResults (see round_engine.py) as they are played.
+    """
+
+    def __init__(self):
+        self.values = {name: [] for name in COLUMN_DTYPES}
+
+    def add_round(self, result):
+        values = self.values
+        values['player_ranking'].append(hand_ranking[result.player_best_hand])
+        values['dealer_ranking'].append(hand_ranking[result.dealer_best_hand])
+        values['player_multiple'].append(result.player_wager_multiple)
+        values['dealer_multiple'].append(result.dealer_wager_multiple)
+        values['pick'].append(result.pick)
+        values['wager'].append(result.wager)
+        values['player_chip_delta'].append(result.player_wager_multiple * result.wager)
+
+    def get_columns(self):
+        return {name: np.array(self.values[name], dtype=dtype) for (name, dtype) in COLUMN_DTYPES.items()}
+
+
+class Shard:
+    def __init__(self, directory, name, rounds, file_format):
+        """
+        One shard of an export, whose columns are opened as they are first used.
+
+        Params:
+            directory: the directory of the export
+            name: the name of the shard
+            rounds: the number of rounds in the shard
+            file_format: one of the EXPORT_FORMATS
+        """
+        self.directory = directory
+        self.name = name
+        self.rounds = rounds
+        self.file_format = file_format
+        self.columns = {}
+        self.npz_file = None
+
+    def __getitem__(self, column):
+        array = self.columns.get(column)
+        if array is None:
+            if column not in COLUMN_DTYPES:
+                raise KeyError(column)
+            if self.file_format == 'npy':
+                array = np.load(os.path.join(self.directory, self.name, column + '.npy'), mmap_mode='r')
+            else:
+                if self.npz_file is None:
+                    self.npz_file = np.load(os.path.join(self.directory, self.name + '.npz'))
+                array = self.npz_file[column]
+            self.columns[column] = array
+        return array
+
+    def __len__(self):
+        return self.rounds
+
+
+class ColumnarDataset:
+    def __init__(self, directory):
+        """
+        Opens an export by reading its manifest. No column is read until it is used.
+        """
+        with open(os.path.join(directory, MANIFEST_NAME)) as manifest_file:
+            manifest = json.load(manifest_file)
+        if manifest.get('version') != EXPORT_VERSION or manifest.get('format') not in EXPORT_FORMATS:
+            raise ValueError('{} is not a version {} export'.format(directory, EXPORT_VERSION))
+
+        self.directory = directory
+        self.file_format = manifest['format']
+        self.metadata = manifest.get('metadata', {})
+        self.shards = [Shard(directory, shard['name'], shard['rounds'], self.file_format) for shard in manifest['shards']]
+        self.rounds = sum(shard.rounds for shard in self.shards)
+
+    def select(self, columns, where=None):
+        """
+        Gathers columns across every shard.
+
+        Params:
+            columns: the names of the columns to gather
+            where: if given, a function taking a Shard and returning a boolean array that
+                picks the rounds to keep, e.g. lambda shard: shard['player_ranking'] >= 6
+        Returns:
+            A dictionary of the gathered arrays, by column
+        """
+        parts = {column: [] for column in columns}
+        for shard in self.shards:
+            mask = where(shard) if where is not None else None
+            for column in columns:
+                parts[column].append(shard[column] if mask is None else shard[column][mask])
+        return {
+            column: np.concatenate(arrays) if arrays else np.zeros(0, dtype=COLUMN_DTYPES[column])
+            for (column, arrays) in parts.items()
+        }
+
+    def __len__(self):
+        return self.rounds
+
+
+def get_history_columns(records):
+    """
+    Returns the columns of hand history records (see history.py).
+    """
+    return {
+        'player_ranking': np.asarray(records['player_ranking']),
+        'dealer_ranking': np.asarray(records['dealer_ranking']),
+        'player_multiple': np.asarray(records['player_multiple']),
+        'dealer_multiple': np.asarray(records['dealer_multiple']),
+        'pick': np.asarray(records['pick']),
+        'wager': np.asarray(records['wager']),
+        'player_chip_delta': records['player_multiple'].astype(np.int64) * records['wager']
+    }
+
+
+def get_shard_name(shard_index):
+    return 'shard_{:05d}'.format(shard_index)
+
+
+def write_shard(directory, name, columns, file_format='npy'):
+    """
+    Writes the columns of one shard.
+
+    Params:
+        directory: the directory of the export
+        name: the name of the shard
+        columns: a dictionary holding an array for each column, all of the same length
+        file_format: one of the EXPORT_FORMATS
+    Returns:
+        The shard's manifest entry
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError('Unknown export format {!r} (expected one of {})'.format(file_format, ', '.join(EXPORT_FORMATS)))
+    columns = {column: np.asarray(columns[column], dtype=dtype) for (column, dtype) in COLUMN_DTYPES.items()}
+    if file_format == 'npy':
+        shard_directory = os.path.join(directory, name)
+        os.makedirs(shard_directory, exist_ok=True)
+        for (column, array) in columns.items():
+            np.save(os.path.join(shard_directory, column + '.npy'), array)
+    else:
+        os.makedirs(directory, exist_ok=True)
+        np.savez_compressed(os.path.join(directory, name + '.npz'), **columns)
+    return {'name': name, 'rounds': len(columns['pick'])}
+
+
+def write_manifest(directory, shards, file_format='npy', metadata=None):
+    """
+    Writes the manifest of an export under a temporary name and then moves it into place,
+    so an export is only ever seen with all of its shards.
+
+    Params:
+        directory: the directory of the export
+        shards: the manifest entries of the shards, in order (see write_shard)
+        file_format: one of the EXPORT_FORMATS
+        metadata: a dictionary of anything else to record, e.g. the seed of a simulation
+    """
+    manifest = {
+        'version': EXPORT_VERSION,
+        'format': file_format,
+        'rounds': sum(shard['rounds'] for shard in shards),
+        'columns': {column: dtype.str for (column, dtype) in COLUMN_DTYPES.items()},
+        'shards': shards,
+        'metadata': metadata or {}
+    }
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, MANIFEST_NAME)
+    temporary_path = '{}.{}.tmp'.format(path, os.getpid())
+    with open(temporary_path, 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    os.replace(temporary_path, path)
+
+
+def export_history(history_path, directory, shard_rounds=DEFAULT_SHARD_ROUNDS, file_format='npy'):
+    """
+    Exports the rounds of a hand history, shard_rounds rounds to a shard.
+
+    Returns:
+        A ColumnarDataset of the export
+    """
+    records = load_history(history_path)
+    shards = [
+        write_shard(directory, get_shard_name(shard_index), get_history_columns(records[start:start + shard_rounds]), file_format)
+        for (shard_index, start) in enumerate(range(0, len(records), shard_rounds))
+    ]
+    write_manifest(directory, shards, file_format, {'source': 'history', 'history_path': os.path.abspath(history_path)})
+    return ColumnarDataset(directory)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Export the rounds of a hand history as columnar shards.')
+    parser.add_argument('history_path', help='the hand history file')
+    parser.add_argument('directory', help='the directory to write the export to')
+    parser.add_argument('--shard-rounds', type=int, default=DEFAULT_SHARD_ROUNDS)
+    parser.add_argument('--format', choices=EXPORT_FORMATS, default='npy')
+    arguments = parser.parse_args()
+
+    dataset = export_history(arguments.history_path, arguments.directory, arguments.shard_rounds, arguments.format)
+    print('exported {:,} rounds in {} shards to {}'.format(dataset.rounds, len(dataset.shards), arguments.directory))
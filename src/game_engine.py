@@ -2,324 +2,358 @@
 This file contains the game engine class that controls the flow
 of the games, intakes user input, and integrates the business logic
 with the GUI.
+The rules of each round are run by the headless round engine (see round_engine.py),
+which the game engine steps through one decision at a time as the user clicks.
+
+The game engine is a state machine run by a single event loop. The state is the screen
+being shown, and decides what mouse movements and clicks do. Nothing blocks: a screen
+that is shown for a while (e.g. the reveal of the cards) schedules the next step on the
+timer queue (see scheduler.py) and waits, and a click skips the rest of the wait.
 """
 import pygame, sys
 from pygame.locals import *
 import os
 
 from src.gui import GUI
-from src.player import Player
-from src.deck import Deck
-from src.hand_evaluator import determine_outcome
+from src.history import HandHistoryWriter
+from src.round_engine import (
+    INITIAL_WAGER,
+    MIN_WAGER,
+    WAGER_INCREMENT,
+    RoundEngine,
+    Strategy
+)
+from src.scheduler import Scheduler
+from src.strategy import load_strategy_table
+from src.gui_constants import ACCEPT_HINT_TEXT, FRAME_RATE, REJECT_HINT_TEXT
 
-MENU_NOW = 'menu_clicked'
-PLAY_NOW = 'play_clicked'
-RULES_NOW = 'rules_clicked'
-PLAY_AGAIN = 'play_again'
-PLAY_ANOTHER_ROUND = 'play_another_round'
+# The states of the game engine, named after the screen being shown
+MENU_SCREEN = 'menu'
+RULES_SCREEN = 'rules'
+WAGER_SCREEN = 'wager'
+HAND_SCREEN = 'hand'
+ROUND_END_SCREEN = 'round_end'
+# A screen is being shown for a while, after which the game moves on by itself
+WAITING = 'waiting'
 
-STARTING_CHIP_NUMBER = 1000
-INITIAL_WAGER = 100
-MIN_WAGER = 10
-WAGER_INCREMENT = 10
+# How long each timed screen is shown, in milliseconds
+WELCOME_DELAY = 500
+HAND_INSTRUCTIONS_DELAY = 2000
+THIRD_HAND_DELAY = 1500
+CARD_REVEAL_DELAY = 2000
+PLAYER_CARDS_DELAY = 2000
+COMMON_CARDS_DELAY = 5000
+OUTCOME_DELAY = 4000
 
 
-class GameEngine:
-    def __init__(self):
+class GameEngine(Strategy):
+    def __init__(self, history_path=None, frame_rate=FRAME_RATE):
+        """
+        Params:
+            history_path: if given, every round played is appended to the hand history
+                file at this path (see history.py)
+            frame_rate: the most frames per second the event loop runs at
+        """
+        self.history_path = history_path
+        self.history = None
+        self.frame_rate = frame_rate
+        self.clock = pygame.time.Clock()
+        self.scheduler = Scheduler(pygame.time.get_ticks)
         self.gui = None
         self.mouse_x = 0
         self.mouse_y = 0
-    
+        self.strategy_table = None
+
+        self.state = None
+        self.waiting_timer = None
+        self.round_engine = None
+        self.current_round = None
+        self.result = None
+        self.wager = INITIAL_WAGER
+        self.max_possible_wager = INITIAL_WAGER
+
     def run_game(self):
         """
-        Initializes the game, initializes the GUI, and calls the main game loop.
+        Initializes the game, initializes the GUI, and runs the main game loop.
+        """
+        self.start_game()
+        self.run_main_game_loop()
+
+    def start_game(self):
+        """
+        Initializes pygame and the GUI and shows the menu screen. The strategy table is
+        loaded by the event loop once the menu is on the screen.
         """
         pygame.init()
+        if self.history_path is not None:
+            # Every round is written as soon as it ends, since the game exits from within its loop
+            self.history = HandHistoryWriter(self.history_path, buffer_records=1)
         self.gui = GUI()
         self.gui.initialize_gui()
-        self.run_main_game_loop()
+        self.scheduler.schedule(0, self.load_strategy_hints)
+        self.show_menu()
 
     def run_main_game_loop(self):
         """
-        The main game loop, based on an action variable, determines which 
-        sub-loop to call.
-        The action is initially set to the menu option, meaning that it will run
-        the game logic for the opening menu screen.
-        If the action is set to rules, it will run the logic for the rules screen (which
-        specifies the rules of the game).
-        If the action is set to the play option, it will run the logic for the game itself.
+        The main game loop runs one frame at a time, for as long as the application is open.
         """
-        action = MENU_NOW
-        
         while True:
-            if action == MENU_NOW:
-                action = self.run_menu_loop()
-            elif action == PLAY_NOW:
-                action = self.run_play_loop()
-            elif action == RULES_NOW:
-                action = self.run_rules_loop()
-    
-    def run_menu_loop(self):
-        """
-        Controls the application when the user is on the menu screen.
-        Exit when the user quits the application.
-        Register the position of the mouse on the screen when the user moves the mouse. 
-        Change the color of buttons when the user hovers over them.
-        When a user clicks the mouse, check if he/she has either clicked
-        the play button or the rules button (the two menu options). If the user has,
-        exit this loop and enter the play or rules loop (as appropriate).
-        """
-        self.gui.create_menu_screen()  
-
-        while True: 
-            for event in pygame.event.get():
-                if event.type == QUIT:
-                    self.terminate()
-                elif event.type == MOUSEMOTION:
-                    next_mouse_x, next_mouse_y = event.pos
-                    self.gui.update_menu_screen_mouse_motion(self.mouse_x, self.mouse_y, next_mouse_x, next_mouse_y)
-                    self.mouse_x = next_mouse_x
-                    self.mouse_y = next_mouse_y
-                elif event.type == MOUSEBUTTONUP:
-                    self.mouse_x, self.mouse_y = event.pos
-                    if self.gui.mouse_on_play_button(self.mouse_x, self.mouse_y):
-                        return PLAY_NOW
-                    elif self.gui.mouse_on_rules_button(self.mouse_x, self.mouse_y):
-                        return RULES_NOW
-
-    def run_rules_loop(self):
-        """
-        Controls the application when the user is on the rules screen.
+            self.run_frame()
+
+    def run_frame(self):
+        """
+        One pass of the main game loop: handle the events the user has made, run the
+        timers that have come due, and draw the frame.
+        """
+        for event in pygame.event.get():
+            self.handle_event(event)
+        self.scheduler.run_due()
+        self.next_frame()
+
+    def handle_event(self, event):
+        """
         Exit when the user quits the application.
-        Register the position of the mouse on the screen when the user moves the mouse. 
-        Change the color of buttons when the user hovers over them.
-    
-        Return to the menu screen when the user clicks the back button.  
-        """
-        self.gui.create_rules_screen()
-
-        while True: 
-            for event in pygame.event.get():
-                if event.type == QUIT:
-                    self.terminate()
-                elif event.type == MOUSEMOTION:
-                    next_mouse_x, next_mouse_y = event.pos
-                    self.gui.update_rules_screen_mouse_motion(self.mouse_x, self.mouse_y, next_mouse_x, next_mouse_y)
-                    self.mouse_x = next_mouse_x
-                    self.mouse_y = next_mouse_y
-                elif event.type == MOUSEBUTTONUP:
-                    if self.gui.mouse_on_back_button(self.mouse_x, self.mouse_y):
-                        return MENU_NOW
-    
-    def run_play_loop(self):
-        """
-        Controls the application when the user is playing Triple Pocket Hold'Em.
-        Start by intializing the players and the playing screen. Then enter the loop. 
-        Each loop iteration carries the user through one round of the game. 
-        More specifically:
-        1) Initialize and shuffle a deck of cards.
-        2) Prompt the user to place a wager.
-        3) Present the pocket card options to the user.
-        4) Determine the best poker hand held by each player and the outcome of the game.
-        5) Add or deduct chips from the player and dealer accordingly
-        """        
-        player = Player('Player', STARTING_CHIP_NUMBER)
-        dealer = Player('Dealer', STARTING_CHIP_NUMBER)
+        Register the position of the mouse on the screen when the user moves the mouse,
+        and let the current screen change the color of the buttons the user hovers over.
+        When the user clicks the mouse, let the current screen handle the click.
+        """
+        if event.type == QUIT:
+            self.terminate()
+        elif event.type == MOUSEMOTION:
+            next_mouse_x, next_mouse_y = event.pos
+            update_on_mouse_move = self.get_mouse_move_handlers().get(self.state)
+            if update_on_mouse_move is not None:
+                update_on_mouse_move(self.mouse_x, self.mouse_y, next_mouse_x, next_mouse_y)
+            self.mouse_x = next_mouse_x
+            self.mouse_y = next_mouse_y
+        elif event.type == MOUSEBUTTONUP:
+            self.mouse_x, self.mouse_y = event.pos
+            self.get_click_handlers()[self.state]()
+
+    def get_mouse_move_handlers(self):
+        return {
+            MENU_SCREEN: self.gui.update_menu_screen_mouse_motion,
+            RULES_SCREEN: self.gui.update_rules_screen_mouse_motion,
+            WAGER_SCREEN: self.gui.update_wager_screen_on_mouse_move,
+            HAND_SCREEN: self.gui.update_hand_screen_on_mouse_move,
+            ROUND_END_SCREEN: self.gui.update_round_end_screen_mouse_move
+        }
+
+    def get_click_handlers(self):
+        return {
+            MENU_SCREEN: self.click_on_menu_screen,
+            RULES_SCREEN: self.click_on_rules_screen,
+            WAGER_SCREEN: self.click_on_wager_screen,
+            HAND_SCREEN: self.click_on_hand_screen,
+            ROUND_END_SCREEN: self.click_on_round_end_screen,
+            WAITING: self.skip_wait
+        }
+
+    def wait(self, time_in_ms, callback):
+        """
+        Leaves the user on a certain screen so they can read its content, then calls callback.
+        The main game loop keeps running meanwhile, so the user can still quit/exit the
+        application, or click to move on straight away (see skip_wait).
+        """
+        self.state = WAITING
+        self.waiting_timer = self.scheduler.schedule(time_in_ms, callback)
+
+    def skip_wait(self):
+        self.scheduler.run_now(self.waiting_timer)
+
+    def show_menu(self):
+        self.gui.create_menu_screen()
+        self.state = MENU_SCREEN
+
+    def click_on_menu_screen(self):
+        """
+        Check if the user has clicked either the play button or the rules button
+        (the two menu options), and move to the play or rules screen (as appropriate).
+        """
+        if self.gui.mouse_on_play_button(self.mouse_x, self.mouse_y):
+            self.start_playing()
+        elif self.gui.mouse_on_rules_button(self.mouse_x, self.mouse_y):
+            self.gui.create_rules_screen()
+            self.state = RULES_SCREEN
+
+    def click_on_rules_screen(self):
+        """
+        Return to the menu screen when the user clicks the back button.
+        """
+        if self.gui.mouse_on_back_button(self.mouse_x, self.mouse_y):
+            self.show_menu()
+
+    def start_playing(self):
+        """
+        Start by intializing the round engine and the playing screen. Each round then
+        carries the user through the following screens:
+        1) The wager screen, on which the user places a wager (see show_wager_screen).
+        2) The pocket card options, shown one at a time (see show_hand).
+        3) The reveal of the cards held by the user and the dealer, and the community cards,
+           followed by the best poker hand held by each player and the outcome of the round,
+           which the round engine has already paid out (see finish_round).
+        4) The round end screen (see show_round_end_screen).
+        """
+        self.round_engine = RoundEngine(self, history=self.history)
         self.gui.create_play_screen()
-        self.pause(500)
-        
-        while True:
-            deck = Deck()
-
-            # Prompt the user to place a wager
-            wager = self.get_wager(player, dealer)
-
-            # Handle the card selection process in triple pocket holdem
-            # Present the user with his/her options for cards and have him/her select the cards
-            self.select_cards(deck, player, dealer)
-            community_cards = deck.draw_five_community_cards()
-            
-            # Now, reveal the cards held by the user and the dealer, as well as the 
-            # five community cards
-            self.gui.explain_card_reveal()
-            self.pause(2000)
-            self.gui.reveal_player_cards(player, dealer)
-            self.pause(2000)
-            self.gui.reveal_common_cards(community_cards)
-            self.pause(5000)
-
-            # Determine the best hand held by each player and who won the round
-            # Add or subtract chips from the player and dealer's totals depending on the outcome
-            # Output to the user which poker hand the dealer had and what the consequent result was
-            (player_hand, dealer_hand, player_wager_multiple, dealer_wager_multiple) = determine_outcome(
-                player.hands[0], 
-                dealer.hands[0], 
-                dealer.hands[1], 
-                community_cards
-            )
-            player.alter_chip_balance(player_wager_multiple * wager)
-            dealer.alter_chip_balance(dealer_wager_multiple * wager)
-            self.gui.explain_outcome(
-                player_hand, 
-                dealer_hand, 
-                player_wager_multiple, 
-                player.num_chips, 
-                dealer.num_chips
-            )
-            self.pause(4000)
-            
-            # Get the next action from the user
-            # If the game has ended (i.e. the user or dealer has run out of chips),
-            # the user can elect to play again. Otherwise, the user can elect to continue with
-            # another round in the current game or to exit
-            next_action = self.get_action_at_round_end(player, dealer)
-            if next_action == MENU_NOW:
-                return next_action
-            elif next_action == PLAY_AGAIN:
-                player = Player('Player', STARTING_CHIP_NUMBER)
-                dealer = Player('Dealer', STARTING_CHIP_NUMBER)
-            else:
-                player.clear_hands()
-                dealer.clear_hands()
+        self.wait(WELCOME_DELAY, self.show_wager_screen)
 
-    
-    def get_wager(self, player, dealer):
+    def show_wager_screen(self):
+        """
+        Prompts the user to input an amount of chips to wager.
+        """
+        player = self.round_engine.player
+        dealer = self.round_engine.dealer
+        self.max_possible_wager = min(player.num_chips, dealer.num_chips)
+        self.wager = min(INITIAL_WAGER, self.max_possible_wager)
+        self.gui.ask_for_wager(self.wager, player.num_chips, dealer.num_chips)
+        self.state = WAGER_SCREEN
+
+    def click_on_wager_screen(self):
         """
-        Implements the control logic that prompts the user to input an amount
-        of chips to wager. Returns the wager.
         When the user clicks the plus button, increase the wager. When the user clicks the minus button,
-        decrease the wager. When the  user clicks confirm, return the magnitude of their wager.
-        Exit when the user quits the application.
-        Register the position of the mouse on the screen when the user moves the mouse. 
-        Change the color of buttons when the user hovers over them.
-        """
-        max_possible_wager = min(player.num_chips, dealer.num_chips)
-        wager = min(INITIAL_WAGER, max_possible_wager)
-        self.gui.ask_for_wager(wager, player.num_chips, dealer.num_chips)
-
-        while True: 
-            for event in pygame.event.get():
-                if event.type == QUIT:
-                    self.terminate()
-                elif event.type == MOUSEMOTION:
-                    next_mouse_x, next_mouse_y = event.pos
-                    self.gui.update_wager_screen_on_mouse_move(self.mouse_x, self.mouse_y, next_mouse_x, next_mouse_y)
-                    self.mouse_x = next_mouse_x
-                    self.mouse_y = next_mouse_y
-                elif event.type == MOUSEBUTTONUP:
-                    if self.gui.mouse_on_plus_button(self.mouse_x, self.mouse_y):
-                        wager = min(wager + WAGER_INCREMENT, max_possible_wager)
-                        self.gui.update_wager_amount(wager)
-                    elif self.gui.mouse_on_minus_button(self.mouse_x, self.mouse_y):
-                        wager = max(MIN_WAGER, wager - WAGER_INCREMENT)
-                        self.gui.update_wager_amount(wager)
-                    elif self.gui.mouse_on_confirm_button(self.mouse_x, self.mouse_y):
-                        return wager
-    
-    def select_cards(self, deck, player, dealer):
-        """
-        Provides the game logic that presents the user with his/her (maximum) three options for pocket cards.
-        Draw three sets of pocket cards. Show the first pair to the user. 
-        Wait for the user to make a decision. If the user picks up the cards, assign the user the pocket cards 
-        and return.
-        Otherwise, present the user with the second pair of pocket cards. If the user
-        does not pick up these cards, he/she is forced to accept the third pair of cards.
-        """
-        self.gui.show_hand_select_instructions()
-        self.pause(2000)
-        
-        first_hand = deck.draw_two_card_hand()
-        second_hand = deck.draw_two_card_hand()
-        third_hand = deck.draw_two_card_hand()
-        
-        self.gui.show_first_hand(first_hand[0].img_path, first_hand[1].img_path)
-        if self.picked_up_cards():
-            player.add_hand(first_hand)
-            dealer.add_hand(second_hand)
-            dealer.add_hand(third_hand)
+        decrease the wager. When the user clicks confirm, start the round with that wager.
+        """
+        if self.gui.mouse_on_plus_button(self.mouse_x, self.mouse_y):
+            self.wager = min(self.wager + WAGER_INCREMENT, self.max_possible_wager)
+            self.gui.update_wager_amount(self.wager)
+        elif self.gui.mouse_on_minus_button(self.mouse_x, self.mouse_y):
+            self.wager = max(MIN_WAGER, self.wager - WAGER_INCREMENT)
+            self.gui.update_wager_amount(self.wager)
+        elif self.gui.mouse_on_confirm_button(self.mouse_x, self.mouse_y):
+            self.current_round = self.round_engine.start_round()
+            self.gui.show_hand_select_instructions()
+            self.wait(HAND_INSTRUCTIONS_DELAY, self.show_hand)
+
+    def get_wager(self, player, dealer):
+        """
+        Returns the wager the user confirmed on the wager screen, which the round engine
+        asks for as the round starts.
+        """
+        return self.wager
+
+    def show_hand(self):
+        """
+        Presents the user with one of his/her (maximum) three options for pocket cards,
+        and waits for the user to make a decision.
+        """
+        hand = self.current_round.get_shown_hand()
+        rejected_hands = tuple(self.current_round.rejected_hands)
+        if not rejected_hands:
+            self.gui.show_first_hand(hand[0], hand[1], self.get_hint(hand))
         else:
-            dealer.add_hand(first_hand)
-            self.gui.show_second_hand(second_hand[0].img_path, second_hand[1].img_path)
+            self.gui.show_second_hand(hand[0], hand[1], self.get_hint(hand, rejected_hands))
+        self.state = HAND_SCREEN
 
-            if self.picked_up_cards():
-                player.add_hand(second_hand)
-                dealer.add_hand(third_hand)
+    def click_on_hand_screen(self):
+        """
+        If the user picks up the pair, finish the round. If the user passes on the first pair,
+        show the second pair. If the user does not pick up the second pair, he/she is forced
+        to accept the third pair.
+        """
+        if self.gui.mouse_on_accept_button(self.mouse_x, self.mouse_y):
+            self.current_round.accept()
+            self.finish_round()
+        elif self.gui.mouse_on_reject_button(self.mouse_x, self.mouse_y):
+            self.current_round.reject()
+            if self.current_round.is_choosing():
+                self.show_hand()
             else:
-                dealer.add_hand(second_hand)
-                player.add_hand(third_hand)
                 self.gui.alert_to_third_hand()
-                self.pause(1500)
-    
-    def picked_up_cards(self):
-        """
-        Waits as the user decides whether to pick up a given pair of pocket cards.
-        Return true if the user accepts the cards and false if the user rejects the cards.
-        """
-        while True: 
-            for event in pygame.event.get():
-                if event.type == QUIT:
-                    self.terminate()
-                elif event.type == MOUSEMOTION:
-                    next_mouse_x, next_mouse_y = event.pos
-                    self.gui.update_hand_screen_on_mouse_move(self.mouse_x, self.mouse_y, next_mouse_x, next_mouse_y)
-                    self.mouse_x = next_mouse_x
-                    self.mouse_y = next_mouse_y
-                elif event.type == MOUSEBUTTONUP:
-                    if self.gui.mouse_on_accept_button(self.mouse_x, self.mouse_y):
-                        return True
-                    elif self.gui.mouse_on_reject_button(self.mouse_x, self.mouse_y):
-                        return False                                   
-    
-    def get_action_at_round_end(self, player, dealer):
+                self.wait(THIRD_HAND_DELAY, self.finish_round)
+
+    def finish_round(self):
+        """
+        Has the round engine finish the round, then reveals the cards held by the user and
+        the dealer, as well as the five community cards.
+        """
+        self.result = self.round_engine.finish_round(self.current_round)
+        self.current_round = None
+        self.gui.explain_card_reveal()
+        self.wait(CARD_REVEAL_DELAY, self.reveal_player_cards)
+
+    def reveal_player_cards(self):
+        self.gui.reveal_player_cards(self.round_engine.player, self.round_engine.dealer)
+        self.wait(PLAYER_CARDS_DELAY, self.reveal_common_cards)
+
+    def reveal_common_cards(self):
+        self.gui.reveal_common_cards(self.result.community_cards)
+        self.wait(COMMON_CARDS_DELAY, self.explain_outcome)
+
+    def explain_outcome(self):
+        """
+        Output to the user which poker hand the dealer had and what the consequent result was.
+        """
+        self.gui.explain_outcome(
+            self.result.player_best_hand,
+            self.result.dealer_best_hand,
+            self.result.player_wager_multiple,
+            self.round_engine.player.num_chips,
+            self.round_engine.dealer.num_chips
+        )
+        self.wait(OUTCOME_DELAY, self.show_round_end_screen)
+
+    def show_round_end_screen(self):
         """
         When a round finishes, the user is presented with the option of playing another round.
-        If the user or dealer has no remaining chips, start a new game (i.e. reset the chip totals). 
-        Otherwise, play another round with the current chip totals.
-        
-        Returns the user's decision on whether to exit or start another round. 
+        If the user or dealer has no remaining chips, the game has ended and the user can
+        elect to play again. Otherwise, the user can elect to continue with another round
+        in the current game or to exit.
         """
+        player = self.round_engine.player
+        dealer = self.round_engine.dealer
         if dealer.no_chips_remaining():
             self.gui.show_victory(player.num_chips, dealer.num_chips)
-            continue_action = PLAY_AGAIN
         elif player.no_chips_remaining():
             self.gui.show_defeat(player.num_chips, dealer.num_chips)
-            continue_action = PLAY_AGAIN
-        else:      
+        else:
             self.gui.show_game_continuing(player.num_chips, dealer.num_chips)
-            continue_action = PLAY_ANOTHER_ROUND  
+        self.state = ROUND_END_SCREEN
+
+    def click_on_round_end_screen(self):
+        """
+        Play another round, starting a new game (i.e. resetting the chip totals) if the
+        last game has ended, or return to the menu screen.
+        """
+        if self.gui.mouse_on_play_again_button(self.mouse_x, self.mouse_y):
+            if self.round_engine.is_game_over():
+                self.round_engine.new_game()
+            self.show_wager_screen()
+        elif self.gui.mouse_on_back_button(self.mouse_x, self.mouse_y):
+            self.show_menu()
+
+    def load_strategy_hints(self):
+        """
+        Loads the solved strategy table (see strategy.py) so the hand selection screens
+        can hint at the best decision. The hints are left out if the table has not been solved.
+        """
+        try:
+            self.strategy_table = load_strategy_table()
+        except (OSError, ValueError):
+            self.strategy_table = None
+
+    def get_hint(self, hand, rejected_hands=()):
+        """
+        Returns the hint text for a hand shown to the user, or None if there is no strategy table.
+        """
+        if self.strategy_table is None:
+            return None
+        if self.strategy_table.should_accept(hand, rejected_hands):
+            return ACCEPT_HINT_TEXT
+        return REJECT_HINT_TEXT
+
+    def next_frame(self):
+        """
+        Called once per pass of the main game loop: pushes whatever was drawn since the
+        last frame to the screen in a single display update (see GUI.flush_display), then
+        sleeps out the rest of the frame so the loop runs at most frame_rate times a second
+        instead of spinning. Events that arrive meanwhile are queued, so none are missed.
+        """
+        self.gui.flush_display()
+        self.clock.tick(self.frame_rate)
 
-        while True:
-            for event in pygame.event.get():
-                if event.type == QUIT:
-                    self.terminate()
-                elif event.type == MOUSEMOTION:
-                    next_mouse_x, next_mouse_y = event.pos
-                    self.gui.update_round_end_screen_mouse_move(
-                        self.mouse_x, self.mouse_y, next_mouse_x, next_mouse_y
-                    )
-                    self.mouse_x = next_mouse_x
-                    self.mouse_y = next_mouse_y
-                elif event.type == MOUSEBUTTONUP:
-                    if self.gui.mouse_on_play_again_button(self.mouse_x, self.mouse_y):
-                        return continue_action
-                    elif self.gui.mouse_on_back_button(self.mouse_x, self.mouse_y):
-                        return MENU_NOW
-
-    def pause(self, time_in_ms):
-        """
-        Pauses the user on a certain screen so they can read its content.
-        This is preferrable to pausing the execution of the program because it
-        still allows the user to quit/exit the application.
-        """
-        current_time = pygame.time.get_ticks()
-        exit_time = current_time +  time_in_ms
-        
-        while current_time < exit_time:
-            for event in pygame.event.get():
-                if event.type == QUIT:
-                    self.terminate()
-            current_time  = pygame.time.get_ticks()
-    
     def terminate(self):
+        if self.history is not None:
+            self.history.close()
         pygame.quit()
-        sys.exit()
\ No newline at end of file
+        sys.exit()
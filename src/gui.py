@@ -1,53 +1,74 @@
 import pygame, sys
 from pygame.locals import *
-import os
 from src.gui_constants import *
-
-image_directory = os.path.join(os.path.dirname(__file__), '../img/')
+from src.gui_assets import AssetCache
 
 class GUI:
+    """
+    Draws the screens of the game. The drawing methods only draw onto the display
+    surface and record the rectangles they changed; flush_display then pushes all of
+    them to the screen with a single display update, once per frame (see
+    GameEngine.next_frame). Filling the screen marks the whole display as changed.
+    """
+
     def __init__(self):
         self.game_display = None
+        self.assets = AssetCache()
         self.current_screen = None
         self.player_num_chips = 0
         self.dealer_num_chips = 0
+        self.dirty_rects = []
+        self.whole_display_dirty = False
     
     def fill_screen(self):
         self.game_display.fill(BG_COLOR)
-        pygame.display.update()
+        self.whole_display_dirty = True
+        self.dirty_rects.clear()
+
+    def mark_dirty(self, rect):
+        """
+        Records a rectangle of the display that has changed since the last flush.
+        """
+        if not self.whole_display_dirty:
+            self.dirty_rects.append(rect)
+
+    def flush_display(self):
+        """
+        Pushes the changes drawn since the last flush to the screen with one display update.
+        """
+        (dirty_rects, self.dirty_rects) = (self.dirty_rects, [])
+        if self.whole_display_dirty:
+            pygame.display.update()
+        elif dirty_rects:
+            pygame.display.update(dirty_rects)
+        self.whole_display_dirty = False
 
     def render_text(self, text, font_size, location, color):
-        font = pygame.font.Font(FONT, font_size)
-        self.render_text_helper(text, font, location, color)
-        pygame.display.update()
+        self.render_text_helper(text, font_size, location, color)
 
     def render_multiple_lines_of_text(self, text, font_size, x, start_y, interval_y, color):
-        font = pygame.font.Font(FONT, font_size)
         y_location = start_y
         for line in text:
-            self.render_text_helper(line, font, (x, y_location), color)
+            self.render_text_helper(line, font_size, (x, y_location), color)
             y_location += interval_y
-        pygame.display.update()
 
-    def render_text_helper(self, text, font, location, color):
-        text_surface = font.render(text, True, color)        
-        self.game_display.blit(text_surface, location)
+    def render_text_helper(self, text, font_size, location, color):
+        self.mark_dirty(self.game_display.blit(self.assets.get_text(text, font_size, color), location))
 
     def render_image(self, file_path, location):
-        img = pygame.image.load(os.path.join(image_directory, file_path))
-        self.game_display.blit(img, location)
-        pygame.display.update()
+        self.mark_dirty(self.game_display.blit(self.assets.get_image(file_path), location))
+
+    def render_card(self, card, location):
+        self.mark_dirty(self.game_display.blit(self.assets.get_card(card), location))
     
     def render_box(self, color, location, text, text_location, text_color):
         """
         Renders a rectangular box with a border and text in it.
         These are often used as buttons.
         """
-        pygame.draw.rect(self.game_display, color, location)
+        self.mark_dirty(pygame.draw.rect(self.game_display, color, location))
         pygame.draw.rect(self.game_display, BLACK, location, BUTTON_BORDER_WIDTH)
-        font = pygame.font.Font(FONT, BUTTON_TEXT_SIZE)
-        self.render_text_helper(text, font, text_location, text_color)
-        pygame.display.update()
+        self.render_text_helper(text, BUTTON_TEXT_SIZE, text_location, text_color)
 
     def update_button_on_hover(
         self, 
@@ -91,6 +112,8 @@ class GUI:
     def initialize_gui(self):
         self.game_display = pygame.display.set_mode((DISPLAY_WIDTH, DISPLAY_HEIGHT))
         pygame.display.set_caption(DISPLAY_NAME)
+        # The images are converted to the display's pixel format, so they are loaded once it exists
+        self.assets.load()
 
     def create_menu_screen(self):
         self.fill_screen()
@@ -261,22 +284,25 @@ class GUI:
             BLACK
         )
     
-    def show_hand(self, card_one_img_path, card_two_img_path, label):
+    def show_hand(self, card_one, card_two, label, hint=None):
         """
         Shows the user the hands they have an opportunity to pick up.
+        If hint is given, it is shown beneath the cards.
         """
         self.create_game_board()
         self.render_text(label, HAND_LABEL_FONT_SIZE,HAND_LABEL_POSITION, BLACK)
-        self.render_image(card_one_img_path, FIRST_CARD_POSITION)
-        self.render_image(card_two_img_path, SECOND_CARD_POSITION)
+        self.render_card(card_one, FIRST_CARD_POSITION)
+        self.render_card(card_two, SECOND_CARD_POSITION)
         self.render_box(LIGHTGREEN, ACCEPT_BUTTON_LOCATION, 'Accept', ACCEPT_TEXT_LOCATION, BLACK)
         self.render_box(LIGHTRED, REJECT_BUTTON_LOCATION, 'Reject', REJECT_TEXT_LOCATION, BLACK)
+        if hint is not None:
+            self.render_text(hint, HAND_HINT_FONT_SIZE, HAND_HINT_LOCATION, BLACK)
 
-    def show_first_hand(self, card_one_img_path, card_two_img_path):
-        self.show_hand(card_one_img_path, card_two_img_path, 'First Hand:')
+    def show_first_hand(self, card_one, card_two, hint=None):
+        self.show_hand(card_one, card_two, 'First Hand:', hint)
     
-    def show_second_hand(self, card_one_img_path, card_two_img_path):
-        self.show_hand(card_one_img_path, card_two_img_path, 'Second Hand:')
+    def show_second_hand(self, card_one, card_two, hint=None):
+        self.show_hand(card_one, card_two, 'Second Hand:', hint)
 
     def update_hand_screen_on_mouse_move(self, mouse_x, mouse_y, next_mouse_x, next_mouse_y):
         self.update_button_on_hover(
@@ -345,12 +371,12 @@ class GUI:
         Shows the cards held by the player and the dealer.
         """
         self.create_game_board()
-        self.render_image(player.hands[0][0].img_path, PLAYER_FIRST_CARD_LOCATION)
-        self.render_image(player.hands[0][1].img_path, PLAYER_SECOND_CARD_LOCATION)
-        self.render_image(dealer.hands[0][0].img_path, DEALER_FIRST_CARD_LOCATION)
-        self.render_image(dealer.hands[0][1].img_path, DEALER_SECOND_CARD_LOCATION)
-        self.render_image(dealer.hands[1][0].img_path, DEALER_THIRD_CARD_LOCATION)
-        self.render_image(dealer.hands[1][1].img_path, DEALER_FOURTH_CARD_LOCATION)
+        self.render_card(player.hands[0][0], PLAYER_FIRST_CARD_LOCATION)
+        self.render_card(player.hands[0][1], PLAYER_SECOND_CARD_LOCATION)
+        self.render_card(dealer.hands[0][0], DEALER_FIRST_CARD_LOCATION)
+        self.render_card(dealer.hands[0][1], DEALER_SECOND_CARD_LOCATION)
+        self.render_card(dealer.hands[1][0], DEALER_THIRD_CARD_LOCATION)
+        self.render_card(dealer.hands[1][1], DEALER_FOURTH_CARD_LOCATION)
         self.render_image(DECK_IMG_PATH, FIRST_COMMON_CARD_LOCATION)
         self.render_image(DECK_IMG_PATH, SECOND_COMMON_CARD_LOCATION)
         self.render_image(DECK_IMG_PATH, THIRD_COMMON_CARD_LOCATION)
@@ -358,11 +384,11 @@ class GUI:
         self.render_image(DECK_IMG_PATH, FIFTH_COMMON_CARD_LOCATION)
     
     def reveal_common_cards(self, community_cards):
-        self.render_image(community_cards[0].img_path, FIRST_COMMON_CARD_LOCATION)
-        self.render_image(community_cards[1].img_path, SECOND_COMMON_CARD_LOCATION)
-        self.render_image(community_cards[2].img_path, THIRD_COMMON_CARD_LOCATION)
-        self.render_image(community_cards[3].img_path, FOURTH_COMMON_CARD_LOCATION)
-        self.render_image(community_cards[4].img_path, FIFTH_COMMON_CARD_LOCATION)
+        self.render_card(community_cards[0], FIRST_COMMON_CARD_LOCATION)
+        self.render_card(community_cards[1], SECOND_COMMON_CARD_LOCATION)
+        self.render_card(community_cards[2], THIRD_COMMON_CARD_LOCATION)
+        self.render_card(community_cards[3], FOURTH_COMMON_CARD_LOCATION)
+        self.render_card(community_cards[4], FIFTH_COMMON_CARD_LOCATION)
 
     def explain_outcome(self, player_hand, dealer_hand, wager_multiple, player_num_chips, dealer_num_chips):
         self.player_num_chips = player_num_chips
@@ -0,0 +1,97 @@
+"""
+This file specifies the asset cache, which holds every image, font, and piece of text
+the GUI draws.
+
+The 52 card images, the back of the deck, and the title are loaded from disk once, when
+the display is created, and converted to the display's pixel format (convert_alpha for
+images with transparency, convert for the rest), so drawing one is a plain blit from
+memory. The card images are indexed by card (either form -- see card.py).
+
+Fonts are opened once per size, and rendered text is kept in a bounded least-recently-used
+cache (see outcome_cache.py) keyed by the text, its size, and its color, so button
+labels, chip counts, and the rules are rendered once and then only blitted.
+"""
+
+import os
+
+import pygame
+
+from src.card import IMAGE_PATHS
+from src.gui_constants import DECK_IMG_PATH, FONT, TITLE_IMG_PATH
+from src.outcome_cache import LRUCache
+
+image_directory = os.path.join(os.path.dirname(__file__), '../img/')
+
+# The most rendered pieces of text to keep. Every screen together draws fewer than this,
+# so only text that changes (e.g. chip counts) is ever evicted.
+MAX_TEXT_SURFACES = 256
+
+
+class AssetCache:
+    def __init__(self, directory=image_directory, max_text_surfaces=MAX_TEXT_SURFACES):
+        """
+        Params:
+            directory: the directory that holds the images
+            max_text_surfaces: the most rendered pieces of text to keep
+        """
+        self.directory = directory
+        self.card_surfaces = ()
+        self.images = {}
+        self.fonts = {}
+        self.text_surfaces = LRUCache(max_text_surfaces)
+
+    def load(self):
+        """
+        Loads and converts every image. The display must already have been created
+        (see GUI.initialize_gui), since the images are converted to its pixel format.
+        """
+        self.card_surfaces = tuple(self.get_image(path) for path in IMAGE_PATHS)
+        self.get_image(DECK_IMG_PATH)
+        self.get_image(TITLE_IMG_PATH)
+
+    def get_card(self, card):
+        """
+        Returns the surface of a card, given in either form.
+        """
+        return self.card_surfaces[card]
+
+    def get_image(self, file_path):
+        """
+        Returns the surface of the image at file_path (relative to the image directory),
+        loading and converting it the first time it is asked for.
+        """
+        surface = self.images.get(file_path)
+        if surface is None:
+            surface = load_converted_image(os.path.join(self.directory, file_path))
+            self.images[file_path] = surface
+        return surface
+
+    def get_font(self, font_size):
+        """
+        Returns the GUI's font at font_size, opening it the first time it is asked for.
+        """
+        font = self.fonts.get(font_size)
+        if font is None:
+            font = pygame.font.Font(FONT, font_size)
+            self.fonts[font_size] = font
+        return font
+
+    def get_text(self, text, font_size, color):
+        """
+        Returns a surface of text rendered in the GUI's font, rendering it only if it is not cached.
+        """
+        return self.text_surfaces.get_or_compute(
+            (text, font_size, color),
+            lambda: self.get_font(font_size).render(text, True, color)
+        )
+
+
+def load_converted_image(path):
+    """
+    Loads an image and converts it to the display's pixel format, keeping its
+    transparency if it has any.
+    """
+    surface = pygame.image.load(path)
+    if surface.get_flags() & pygame.SRCALPHA:
+        return surface.convert_alpha()
+    return surface.convert()
@@ -13,6 +13,9 @@ WHITE = (255, 255, 255)
 DISPLAY_WIDTH = 800
 DISPLAY_HEIGHT = 600
 DISPLAY_NAME = 'Triple Pocket Texas Hold\'Em'
+# The most frames per second the event loops run at. Each loop sleeps out the rest of
+# its frame, so an idle game barely uses the processor.
+FRAME_RATE = 60
 
 # The image ont he menu page
 TITLE_IMG_PATH = 'title.png'
@@ -77,6 +80,11 @@ ACCEPT_BUTTON_LOCATION = (500, 280, 80, 40)
 ACCEPT_TEXT_LOCATION = (505, 290)
 REJECT_BUTTON_LOCATION = (500, 330, 80, 40)
 REJECT_TEXT_LOCATION = (507, 340)
+# Hint from the strategy table, shown under the cards when the table has been solved
+HAND_HINT_LOCATION = (250, 410)
+HAND_HINT_FONT_SIZE = 20
+ACCEPT_HINT_TEXT = 'Hint: pick up this hand'
+REJECT_HINT_TEXT = 'Hint: pass on this hand'
 
 # Text explaining to the user that they will be forced to accept
 # the third pair of pocket cards
@@ -4,11 +4,31 @@ This file contains functions that fall into one of the following three categorie
    (i.e. is the series of five cards a royal flush?).
 2) Break ties between 5 card sets -- i.e. which set of five cards is 
    victorious if they are both pairs?
+   Each five-card hand has a single integer strength (see get_hand_strength)
+   that encodes both its ranking and all of its tie-breaking cards, so the
+   stronger of two hands is simply the one with the greater strength.
 3) Determine the outcome of a round of Triple Pocket Holdem, first adjudicating
    a winner and then determining what the wager multiple should be.
 """
 
 import itertools
+from collections import Counter
+from operator import attrgetter, itemgetter
+
+import numpy as np
+
+from src.card import to_cards
+from src.rank_table import (
+    CARD_RANK_KEYS,
+    CARD_SUITE_COUNT_BITS,
+    CARD_SUITE_RANK_BITS,
+    FLUSH_SUITE,
+    RANK_MASK,
+    SUITE_RANK_BITS_SHIFT,
+    BoardState,
+    get_board_state,
+    get_rank_table
+)
 
 # Maps a poker hand to a ranking number
 hand_ranking = {
@@ -38,6 +58,10 @@ ranking_to_hand = {
     1: 'high card',
 }
 
+# A hand strength holds the ranking above in its upper bits and the values of the
+# tie-breaking cards, most significant first, in the five four-bit fields below.
+STRENGTH_RANKING_SHIFT = 20
+
 # Maps a poker hand to its wager multiple.
 # In triple pocket hold'em, the player receives a 50x multiple on their wager
 # if they get a royal flush, a 20x multiple if they get a straight flush, and so
@@ -55,6 +79,17 @@ ranking_multiple = {
     'high card': 1
 }
 
+# Lookup arrays for the batch evaluator: the rank table lookups indexed by the integer
+# form of a card (see rank_table.py), and the wager multiples indexed by ranking.
+BATCH_CARD_RANK_KEYS = np.array(CARD_RANK_KEYS, dtype=np.int64)
+BATCH_CARD_SUITE_COUNT_BITS = np.array(CARD_SUITE_COUNT_BITS, dtype=np.int64)
+BATCH_CARD_SUITE_RANK_BITS = np.array(CARD_SUITE_RANK_BITS, dtype=np.int64)
+BATCH_FLUSH_SUITE = np.frombuffer(FLUSH_SUITE, dtype=np.uint8)
+BATCH_RANKING_MULTIPLES = np.array(
+    [0] + [ranking_multiple[ranking_to_hand[ranking]] for ranking in range(1, 11)],
+    dtype=np.int8
+)
+
 
 def determine_outcome(hand_one, hand_two, hand_three, community_cards):
     """
@@ -73,30 +108,188 @@ def determine_outcome(hand_one, hand_two, hand_three, community_cards):
         3) the wager multiple for the player
         4) the wager multiple for the dealer
     """
-    all_player_hands = get_all_possible_hands_sorted(hand_one, community_cards)
-    (player_highest_value, player_best_hand) = get_best_hand(all_player_hands)
+    (player_strength, player_best_hand) = find_best_hand(hand_one, community_cards)
+    (dealer_strength, dealer_best_hand) = max(
+        find_best_hand(hand_two, community_cards),
+        find_best_hand(hand_three, community_cards),
+        key=itemgetter(0)
+    )
+
+    return get_outcome_from_strengths(player_strength, dealer_strength)
 
-    all_hand_two_combos = get_all_possible_hands_sorted(hand_two, community_cards)
-    all_hand_three_combos = get_all_possible_hands_sorted(hand_three, community_cards)
-    all_dealer_hands =  all_hand_two_combos + all_hand_three_combos
-    (dealer_highest_value, dealer_best_hand) = get_best_hand(all_dealer_hands)
 
-    if player_highest_value > dealer_highest_value:
+def get_outcome_from_strengths(player_strength, dealer_strength):
+    """
+    Given the strengths of the best hands held by the player and the dealer,
+    determines the outcome of the round.
+
+    Params:
+        player_strength: the strength of the player's best hand
+        dealer_strength: the strength of the dealer's best hand
+    Returns:
+        The same four values as determine_outcome
+    """
+    if player_strength > dealer_strength:
         winner = 1
-    elif player_highest_value < dealer_highest_value:
+    elif player_strength < dealer_strength:
         winner = 2
     else:
-        winner = break_tie(player_best_hand, dealer_best_hand, player_highest_value)
+        winner = 0
 
+    player_highest_value = get_strength_ranking(player_strength)
     player_wager_multiple, dealer_wager_multiple = get_wager_multiples(winner, player_highest_value)
     return (
         ranking_to_hand[player_highest_value], 
-        ranking_to_hand[dealer_highest_value], 
+        ranking_to_hand[get_strength_ranking(dealer_strength)], 
         player_wager_multiple, 
         dealer_wager_multiple
     )
 
 
+def determine_outcome_from_table(hand_one, hand_two, hand_three, community_cards, table=None):
+    """
+    Determines the outcome for a round exactly as determine_outcome does, but scores
+    each set of seven cards with the precomputed rank table (see rank_table.py) rather
+    than comparing all of their five-card combinations. The community cards are only
+    summed once, and each of the three hands is finished against that sum.
+
+    Params:
+        hand_one: the two-card hand for the player
+        hand_two: the first two-card hand for the dealer
+        hand_three: the second two-card hand for the dealer
+        community_cards: the five communal cards
+        table: the RankTable to use (defaults to the table shared across the process)
+    Returns:
+        The same four values as determine_outcome
+    """
+    if table is None:
+        table = get_rank_table()
+
+    board_state = get_board_state(community_cards)
+    player_strength = table.get_strength_on_board(hand_one, board_state)
+    dealer_strength = max(
+        table.get_strength_on_board(hand_two, board_state),
+        table.get_strength_on_board(hand_three, board_state)
+    )
+    return get_outcome_from_strengths(player_strength, dealer_strength)
+
+
+def get_strengths_batch(cards, table=None):
+    """
+    Scores a batch of seven-card hands at once with the precomputed rank table.
+
+    Params:
+        cards: an (N, 7) integer array, each row holding seven cards in their integer form
+        table: the RankTable to use (defaults to the table shared across the process)
+    Returns:
+        An array of N hand strengths (see get_hand_strength)
+    """
+    cards = np.asarray(cards, dtype=np.intp)
+    return get_strengths_on_boards_batch(cards[:, :2], get_board_states_batch(cards[:, 2:]), table)
+
+
+def get_board_states_batch(community_cards):
+    """
+    The batch form of get_board_state in rank_table.py.
+
+    Params:
+        community_cards: an integer array of cards in their integer form, holding the
+            cards of each board in its last axis (e.g. (N, 5) for N boards)
+    Returns:
+        A BoardState holding an array in each field, shaped like community_cards without its last axis
+    """
+    cards = np.asarray(community_cards, dtype=np.intp)
+    return BoardState(
+        BATCH_CARD_RANK_KEYS[cards].sum(axis=-1),
+        BATCH_CARD_SUITE_COUNT_BITS[cards].sum(axis=-1),
+        BATCH_CARD_SUITE_RANK_BITS[cards].sum(axis=-1)
+    )
+
+
+def get_strengths_on_boards_batch(hands, board_states, table=None):
+    """
+    Scores a batch of pocket hands against boards that have already been summed (see
+    get_board_states_batch), so a board shared by several hands is only examined once.
+    The hands and the boards broadcast against each other: hands shaped (N, 2) score
+    against N boards, and hands shaped (H, 2) score against every one of B boards
+    summed from an array shaped (B, 1, 5), giving a (B, H) array of strengths.
+
+    Params:
+        hands: an integer array holding two pocket cards in its last axis
+        board_states: a BoardState of arrays from get_board_states_batch
+        table: the RankTable to use (defaults to the table shared across the process)
+    Returns:
+        An array of hand strengths (see get_hand_strength)
+    """
+    if table is None:
+        table = get_rank_table()
+    (non_flush_strengths, flush_strengths) = table.get_arrays()
+
+    hands = np.asarray(hands, dtype=np.intp)
+    rank_key_sums = board_states.rank_key_sum + BATCH_CARD_RANK_KEYS[hands].sum(axis=-1)
+    suite_counts = board_states.suite_counts + BATCH_CARD_SUITE_COUNT_BITS[hands].sum(axis=-1)
+    strengths = non_flush_strengths[rank_key_sums]
+
+    # Only a few hands hold a flush, so their suites are only examined for those hands.
+    flush_suites = BATCH_FLUSH_SUITE[suite_counts]
+    has_flush = flush_suites > 0
+    if has_flush.any():
+        suite_rank_bits = (
+            np.broadcast_to(board_states.suite_rank_bits, has_flush.shape)[has_flush]
+            + BATCH_CARD_SUITE_RANK_BITS[np.broadcast_to(hands, has_flush.shape + (2,))[has_flush]].sum(axis=1)
+        )
+        shifts = SUITE_RANK_BITS_SHIFT * (flush_suites[has_flush].astype(np.int64) - 1)
+        strengths[has_flush] = flush_strengths[(suite_rank_bits >> shifts) & RANK_MASK]
+    return strengths
+
+
+def determine_outcome_batch(player_hands, dealer_hands_one, dealer_hands_two, community_cards, table=None):
+    """
+    Determines the outcomes of a batch of rounds at once, matching determine_outcome
+    and get_wager_multiples round by round.
+
+    Params:
+        player_hands: an (N, 2) integer array holding the player's two-card hand for each round
+        dealer_hands_one: an (N, 2) integer array holding the dealer's first two-card hand
+        dealer_hands_two: an (N, 2) integer array holding the dealer's second two-card hand
+        community_cards: an (N, 5) integer array holding the five communal cards
+        table: the RankTable to use (defaults to the table shared across the process)
+    Returns:
+        1) an array of the rankings (see dictionaries above) of the player's best hands
+        2) an array of the rankings of the dealer's best hands
+        3) an array of the wager multiples for the player
+        4) an array of the wager multiples for the dealer
+    """
+    board_states = get_board_states_batch(community_cards)
+    player_strengths = get_strengths_on_boards_batch(player_hands, board_states, table)
+    dealer_strengths = np.maximum(
+        get_strengths_on_boards_batch(dealer_hands_one, board_states, table),
+        get_strengths_on_boards_batch(dealer_hands_two, board_states, table)
+    )
+    return get_outcomes_from_strengths_batch(player_strengths, dealer_strengths)
+
+
+def get_outcomes_from_strengths_batch(player_strengths, dealer_strengths):
+    """
+    The batch form of get_outcome_from_strengths.
+
+    Params:
+        player_strengths: an array of the strengths of the player's best hands
+        dealer_strengths: an array of the strengths of the dealer's best hands
+    Returns:
+        The same four arrays as determine_outcome_batch
+    """
+    player_rankings = (player_strengths >> STRENGTH_RANKING_SHIFT).astype(np.int8)
+    dealer_rankings = (dealer_strengths >> STRENGTH_RANKING_SHIFT).astype(np.int8)
+
+    player_wager_multiples = np.where(
+        player_strengths > dealer_strengths,
+        BATCH_RANKING_MULTIPLES[player_rankings],
+        np.where(player_strengths < dealer_strengths, -1, 0)
+    ).astype(np.int8)
+    return (player_rankings, dealer_rankings, player_wager_multiples, -player_wager_multiples)
+
+
 def get_all_possible_hands_sorted(player_hand, community_cards):
     """
     Given a player's hand (will be 2 cards in our case, but could be any size) and 
@@ -108,42 +301,123 @@ def get_all_possible_hands_sorted(player_hand, community_cards):
         community_card: the tuple of cards available to all players
     Returns:
         All possible five-card hand combinations, each of which is sorted in descending 
-        order of rank.
+        order of rank. Cards given in their integer form are returned as card objects.
     """
-    all_cards = player_hand + community_cards
+    all_cards = to_cards(itertools.chain(player_hand, community_cards))
     all_combos = list(itertools.combinations(all_cards, 5))
     return [
         sorted(all_combos[i], key=lambda x: x.value, reverse=True) for i in range(len(all_combos))
     ]
 
 
+def iter_possible_hands_sorted(player_hand, community_cards):
+    """
+    The lazy form of get_all_possible_hands_sorted. The cards are sorted once, in descending
+    order of rank, so every combination of them comes out already sorted. The combinations
+    are yielded in lexicographic order of their positions in the sorted cards.
+
+    Params:
+        player_hand: the tuple of cards held in the player's hand
+        community_card: the tuple of cards available to all players
+    Returns:
+        An iterator over all possible five-card hand combinations, as tuples of card
+        objects sorted in descending order of rank
+    """
+    return itertools.combinations(sort_cards_descending(player_hand, community_cards), 5)
+
+
+def find_best_hand(player_hand, community_cards):
+    """
+    Finds the best five-card hand a player can make, with the same strength that
+    get_best_hand finds among get_all_possible_hands_sorted, without scoring every combination.
+    The best ranking any combination can reach is determined from the cards as a whole
+    (see get_best_possible_ranking), and the combinations are searched in the order of
+    iter_possible_hands_sorted until one reaches it. Since the cards are sorted in
+    descending order, the first combination to reach a ranking holds the highest
+    tie-breaking cards of any combination with that ranking, so the search stops there.
+    When several combinations tie for the best, the one returned may differ from the one
+    get_best_hand returns, but its strength is the same.
+
+    Params:
+        player_hand: the tuple of cards held in the player's hand
+        community_card: the tuple of cards available to all players
+    Returns:
+        The same tuple as get_best_hand: the strength of the best hand and the hand itself
+    """
+    all_cards = sort_cards_descending(player_hand, community_cards)
+    best_possible_ranking = get_best_possible_ranking(all_cards)
+    for hand in itertools.combinations(all_cards, 5):
+        if get_hand_value(hand) == best_possible_ranking:
+            return (get_hand_strength(hand), hand)
+
+
+def sort_cards_descending(player_hand, community_cards):
+    """
+    Returns a player's cards and the community cards together as a list of card
+    objects, sorted in descending order of rank.
+    """
+    return sorted(to_cards(itertools.chain(player_hand, community_cards)), key=attrgetter('value'), reverse=True)
+
+
+def get_best_possible_ranking(cards):
+    """
+    Given any number of cards, determines the highest ranking (see dictionaries above)
+    that any five of them fulfill, from the counts of their values and suites.
+
+    Params:
+        cards: a sequence of card objects
+    Returns:
+        The numerical ranking of the best possible hand
+    """
+    value_counts = sorted(Counter(card.value for card in cards).values(), reverse=True) + [0]
+    suite_counts = Counter(card.suite for card in cards)
+    (flush_suite, flush_count) = max(suite_counts.items(), key=itemgetter(1))
+
+    if flush_count >= 5:
+        flush_values = {card.value for card in cards if card.suite == flush_suite}
+        if {14, 13, 12, 11, 10} <= flush_values:
+            return hand_ranking['royal flush']
+        elif has_straight(flush_values):
+            return hand_ranking['straight flush']
+
+    if value_counts[0] == 4:
+        return hand_ranking['four of a kind']
+    elif value_counts[0] == 3 and value_counts[1] >= 2:
+        return hand_ranking['full house']
+    elif flush_count >= 5:
+        return hand_ranking['flush']
+    elif has_straight({card.value for card in cards}):
+        return hand_ranking['straight']
+    elif value_counts[0] == 3:
+        return hand_ranking['three of a kind']
+    elif value_counts[0] == 2 and value_counts[1] == 2:
+        return hand_ranking['two pairs']
+    elif value_counts[0] == 2:
+        return hand_ranking['one pair']
+    else:
+        return hand_ranking['high card']
+
+
+def has_straight(values):
+    """
+    Determines whether a set of card values holds five consecutive values.
+    As in is_straight, the ace only counts high.
+    """
+    return any(all(value + step in values for step in range(5)) for value in range(2, 11))
+
+
 def get_best_hand(hands): 
     """
     Given a list of five-card hands, determines which has the most value (i.e. would win)
-    in poker. Iterates through the list of hands and keeps track of the maximum-value hand seen thus far.
+    in poker: the hand with the greatest strength (see get_hand_strength).
 
     Params:
-        hands: a list of quintuples consisting of cards
+        hands: a list of quintuples consisting of cards, each sorted in descending rank order
     Returns:
-        A tuple consisting of the maximimum value (see dictionaries above) of any hand and the 
-        actual five-card hand that corresponds said value.
+        A tuple consisting of the maximum strength of any hand and the 
+        actual five-card hand that corresponds to said strength.
     """       
-    max_value = 0
-    best_hand = None
-    
-    for hand in hands:
-        value = get_hand_value(hand)
-        
-        if value > max_value:
-            best_hand = hand
-            max_value = value
-        elif value == max_value:
-            better_hand = break_tie(best_hand, hand, value)
-            if better_hand == 2:
-                best_hand = hand
-                max_value = value
-    
-    return (max_value, best_hand)
+    return max(((get_hand_strength(hand), hand) for hand in hands), key=itemgetter(0))
 
 
 def get_wager_multiples(winner, player_highest_value):
@@ -173,6 +447,40 @@ def get_wager_multiples(winner, player_highest_value):
         return (ranking_multiple[hand_type], -ranking_multiple[hand_type])
 
 
+def get_hand_strength(hand):
+    """
+    Given a tuple of five cards, determines the strength of the hand: a single integer
+    that is greater for every hand that would win in poker and equal for hands that tie.
+    The ranking of the hand (see get_hand_value) sits in the upper bits, followed by the
+    values of the cards in the order they break ties. Cards are ordered by how many cards
+    of their value the hand holds and then by value, so a full house of three 10s and two 2s
+    is followed by 10 and then 2, and two pairs are followed by the higher pair, the lower
+    pair, and then the kicker card.
+
+    Params:
+        hand: a tuple consisting of five card objects, sorted in descending rank order
+    Returns:
+        The strength of the hand
+    """
+    values = [card.value for card in hand]
+    tie_breakers = sorted(set(values), key=lambda value: (values.count(value), value), reverse=True)
+
+    strength = get_hand_value(hand)
+    for value in tie_breakers:
+        strength = (strength << 4) | value
+    return strength << (4 * (5 - len(tie_breakers)))
+
+
+def get_strength_ranking(strength):
+    """
+    Params:
+        strength: the strength of a hand (see get_hand_strength)
+    Returns:
+        The numerical ranking (see dictionaries above) of the hand
+    """
+    return strength >> STRENGTH_RANKING_SHIFT
+
+
 def get_hand_value(hand):
     """
     Given a tuple of five cards, determines the highest-ranking poker hand that the set of cards
@@ -397,43 +705,48 @@ def is_pair(hand):
     )
 
 
+def compare_hand_strengths(hand_one, hand_two):
+    """
+    Compares two five-card hands by their strengths (see get_hand_strength).
+
+    Params:
+        hand_one: A tuple of five card objects, sorted in descending rank order.
+        hand_two: A tuple of five card objects, sorted in descending rank order.
+    Returns:
+        0 if the two hands have an exactly even poker value 
+        1 if the first hand is greater
+        2 if the second hand is greater
+    """
+    strength_one = get_hand_strength(hand_one)
+    strength_two = get_hand_strength(hand_two)
+    if strength_one > strength_two:
+        return 1
+    elif strength_two > strength_one:
+        return 2
+    else:
+        return 0
+
+
 def break_tie(hand_one, hand_two, value):
     """
     Breaks ties between hands, meaning that if two hands have the same rank
     (i.e. both are flushes, both are straights), this function determines
     which is greater. Each type of hand has its own rules for tie breakers
-    in poker.
+    in poker, all of which are captured by the strength of the hand
+    (see get_hand_strength).
 
     Params:
         hand_one: A tuple of five card objects, sorted in descending rank order.
         hand_two: A tuple of five card objects, sorted in descending rank order.
-        value: The value of the given hands (see dictionary at the top of file)
+        value: The ranking of the given hands (see dictionary at the top of file). The
+            strength of each hand already includes its ranking, so this is not needed
+            to break the tie.
     Returns:
         0 if the two hands have an exactly even poker value 
         1 if the first hand is greater
         2 if the second hand is greater
     """
-    # If both hands are royal flushes, they are tied.
-    if value == hand_ranking['royal flush']:
-        return 0
-    elif value == hand_ranking['straight flush']:
-        return break_tie_straight(hand_one, hand_two)
-    elif value == hand_ranking['four of a kind']:
-        return break_tie_four_of_a_kind(hand_one, hand_two)
-    elif value == hand_ranking['full house']:
-        return break_tie_full_house(hand_one, hand_two)
-    elif value == hand_ranking['flush']:
-        return break_tie_flush(hand_one, hand_two)
-    elif value == hand_ranking['straight']:
-        return break_tie_straight(hand_one, hand_two)
-    elif value == hand_ranking['three of a kind']:
-        return break_tie_three_of_a_kind(hand_one, hand_two)
-    elif value == hand_ranking['two pairs']:
-        return break_tie_two_pairs(hand_one, hand_two)
-    elif value == hand_ranking['one pair']:
-        return break_tie_one_pair(hand_one, hand_two)
-    else:
-        return break_tie_high_card(hand_one, hand_two)
+    return compare_hand_strengths(hand_one, hand_two)
 
 
 def break_tie_straight(hand_one, hand_two):
@@ -450,12 +763,7 @@ def break_tie_straight(hand_one, hand_two):
         1 if the first hand is greater
         2 if the second hand is greater         
     """
-    if hand_one[0].value > hand_two[0].value:
-        return 1
-    elif hand_two[0].value >  hand_one[0].value:
-        return 2
-    else: 
-        return 0
+    return compare_hand_strengths(hand_one, hand_two)
 
 
 def break_tie_four_of_a_kind(hand_one, hand_two):
@@ -476,30 +784,7 @@ def break_tie_four_of_a_kind(hand_one, hand_two):
         1 if the first hand is greater
         2 if the second hand is greater  
     """
-    if hand_one[0].value == hand_one[1].value:
-        four_card_value_hand_one = hand_one[0].value
-        kicker_hand_one = hand_one[4].value
-    else:
-        four_card_value_hand_one = hand_one[1].value
-        kicker_hand_one = hand_one[0].value
-    
-    if hand_two[0].value == hand_two[1].value:
-        four_card_value_hand_two = hand_two[0].value
-        kicker_hand_two = hand_two[4].value
-    else:
-        four_card_value_hand_two = hand_two[1].value
-        kicker_hand_two = hand_two[0].value
-
-    if four_card_value_hand_one > four_card_value_hand_two:
-        return 1
-    elif four_card_value_hand_two > four_card_value_hand_one:
-        return 2
-    elif kicker_hand_one > kicker_hand_two:
-        return 1
-    elif kicker_hand_two > kicker_hand_one:
-        return 2
-    else:
-        return 0
+    return compare_hand_strengths(hand_one, hand_two)
 
 
 def break_tie_full_house(hand_one, hand_two):
@@ -520,30 +805,7 @@ def break_tie_full_house(hand_one, hand_two):
         1 if the first hand is greater
         2 if the second hand is greater  
     """
-    if hand_one[0].value == hand_one[1].value and hand_one[0].value == hand_one[2].value:
-        hand_one_trips = hand_one[0].value
-        hand_one_pair = hand_one[3].value
-    else:
-        hand_one_trips = hand_one[2].value
-        hand_one_pair = hand_one[0].value
-
-    if hand_two[0].value == hand_two[1].value and hand_two[0].value == hand_two[2].value:
-        hand_two_trips = hand_two[0].value
-        hand_two_pair = hand_two[3].value
-    else:
-        hand_two_trips = hand_two[2].value
-        hand_two_pair = hand_two[0].value
-
-    if hand_one_trips > hand_two_trips:
-        return 1
-    elif hand_two_trips > hand_one_trips:
-        return 2
-    elif hand_one_pair > hand_two_pair:
-        return 1
-    elif  hand_two_pair > hand_one_pair: 
-        return 2
-    else:
-        return 0
+    return compare_hand_strengths(hand_one, hand_two)
 
 
 def break_tie_flush(hand_one, hand_two):
@@ -561,7 +823,7 @@ def break_tie_flush(hand_one, hand_two):
         1 if the first hand is greater
         2 if the second hand is greater  
     """
-    return break_tie_high_card(hand_one, hand_two)
+    return compare_hand_strengths(hand_one, hand_two)
 
 
 def break_tie_three_of_a_kind(hand_one, hand_two):
@@ -583,46 +845,7 @@ def break_tie_three_of_a_kind(hand_one, hand_two):
         1 if the first hand is greater
         2 if the second hand is greater  
     """
-    if hand_one[0].value == hand_one[1].value and hand_one[0].value == hand_one[2].value:
-        hand_one_trips = hand_one[0].value
-        hand_one_first_kicker = hand_one[3].value
-        hand_one_second_kicker = hand_one[4].value
-    elif hand_one[1].value == hand_one[2].value and hand_one[1].value == hand_one[3].value:
-        hand_one_trips = hand_one[1].value
-        hand_one_first_kicker = hand_one[0].value
-        hand_one_second_kicker = hand_one[4].value
-    else:
-        hand_one_trips = hand_one[2].value
-        hand_one_first_kicker = hand_one[0].value
-        hand_one_second_kicker = hand_one[1].value
-
-    if hand_two[0].value == hand_two[1].value and hand_two[0].value == hand_two[2].value:
-        hand_two_trips = hand_two[0].value
-        hand_two_first_kicker = hand_two[3].value
-        hand_two_second_kicker = hand_two[4].value
-    elif hand_two[1].value == hand_two[2].value and hand_two[1].value == hand_two[3].value:
-        hand_two_trips = hand_two[1].value
-        hand_two_first_kicker = hand_two[0].value
-        hand_two_second_kicker = hand_two[4].value
-    else:
-        hand_two_trips = hand_two[2].value
-        hand_two_first_kicker = hand_two[0].value
-        hand_two_second_kicker = hand_two[1].value
-
-    if hand_one_trips > hand_two_trips:
-        return 1
-    elif hand_two_trips > hand_one_trips:
-        return 2
-    elif hand_one_first_kicker > hand_two_first_kicker:
-        return 1
-    elif hand_two_first_kicker > hand_one_first_kicker:
-        return 2
-    elif hand_one_second_kicker > hand_two_second_kicker:
-        return 1
-    elif hand_two_second_kicker > hand_two_first_kicker:
-        return 2
-    else:
-        return 0
+    return compare_hand_strengths(hand_one, hand_two)
 
 
 def break_tie_two_pairs(hand_one, hand_two):
@@ -641,46 +864,7 @@ def break_tie_two_pairs(hand_one, hand_two):
         1 if the first hand is greater
         2 if the second hand is greater  
     """
-    if hand_one[0].value == hand_one[1].value and hand_one[2].value == hand_one[3].value:
-        hand_one_first_pair = hand_one[0].value
-        hand_one_second_pair = hand_one[2].value
-        hand_one_kicker = hand_one[4].value
-    elif hand_one[0].value == hand_one[1].value:
-        hand_one_first_pair = hand_one[0].value
-        hand_one_second_pair = hand_one[3].value
-        hand_one_kicker = hand_one[2].value
-    else:
-        hand_one_first_pair = hand_one[1].value
-        hand_one_second_pair = hand_one[3].value
-        hand_one_kicker = hand_one[0].value
-
-    if hand_two[0].value == hand_two[1].value and hand_two[2].value == hand_two[3].value:
-        hand_two_first_pair = hand_two[0].value
-        hand_two_second_pair = hand_two[2].value
-        hand_two_kicker = hand_two[4].value
-    elif hand_two[0].value == hand_two[1].value:
-        hand_two_first_pair = hand_two[0].value
-        hand_two_second_pair = hand_two[3].value
-        hand_two_kicker = hand_two[2].value
-    else:
-        hand_two_first_pair = hand_two[1].value
-        hand_two_second_pair = hand_two[3].value
-        hand_two_kicker = hand_two[0].value
-
-    if hand_one_first_pair > hand_two_first_pair:
-        return 1
-    elif hand_two_first_pair > hand_one_first_pair:
-        return 2
-    elif hand_one_second_pair > hand_two_second_pair:
-        return 1
-    elif hand_two_second_pair > hand_one_second_pair:
-        return 2
-    elif hand_one_kicker > hand_two_kicker:
-        return 1
-    elif hand_two_kicker > hand_one_kicker:
-        return 2
-    else:
-        return 0
+    return compare_hand_strengths(hand_one, hand_two)
 
 
 def break_tie_one_pair(hand_one, hand_two):
@@ -700,66 +884,7 @@ def break_tie_one_pair(hand_one, hand_two):
         1 if the first hand is greater
         2 if the second hand is greater  
     """
-    if hand_one[0].value == hand_one[1].value:
-        hand_one_pair = hand_one[0].value
-        hand_one_first_kicker = hand_one[2].value
-        hand_one_second_kicker = hand_one[3].value
-        hand_one_third_kicker = hand_one[4].value
-    elif hand_one[1].value == hand_one[2].value:
-        hand_one_pair = hand_one[1].value
-        hand_one_first_kicker = hand_one[0].value
-        hand_one_second_kicker = hand_one[3].value
-        hand_one_third_kicker = hand_one[4].value
-    elif hand_one[2].value == hand_one[3].value:
-        hand_one_pair = hand_one[2].value
-        hand_one_first_kicker = hand_one[0].value
-        hand_one_second_kicker = hand_one[1].value
-        hand_one_third_kicker = hand_one[4].value
-    else:
-        hand_one_pair = hand_one[3].value
-        hand_one_first_kicker = hand_one[0].value
-        hand_one_second_kicker = hand_one[1].value
-        hand_one_third_kicker = hand_one[2].value
-    
-    if hand_two[0].value == hand_two[1].value:
-        hand_two_pair = hand_two[0].value
-        hand_two_first_kicker = hand_two[2].value
-        hand_two_second_kicker = hand_two[3].value
-        hand_two_third_kicker = hand_two[4].value
-    elif hand_two[1].value == hand_two[2].value:
-        hand_two_pair = hand_two[1].value
-        hand_two_first_kicker = hand_two[0].value
-        hand_two_second_kicker = hand_two[3].value
-        hand_two_third_kicker = hand_two[4].value
-    elif hand_two[2].value == hand_two[3].value:
-        hand_two_pair = hand_two[2].value
-        hand_two_first_kicker = hand_two[0].value
-        hand_two_second_kicker = hand_two[1].value
-        hand_two_third_kicker = hand_two[4].value
-    else:
-        hand_two_pair = hand_two[3].value
-        hand_two_first_kicker = hand_two[0].value
-        hand_two_second_kicker = hand_two[1].value
-        hand_two_third_kicker = hand_two[2].value
-
-    if hand_one_pair > hand_two_pair:
-        return 1
-    elif hand_two_pair > hand_one_pair:
-        return 2
-    elif hand_one_first_kicker > hand_two_first_kicker:
-        return 1
-    elif hand_two_first_kicker > hand_one_first_kicker:
-        return 2
-    elif hand_one_second_kicker > hand_two_second_kicker:
-        return 1
-    elif hand_two_second_kicker > hand_one_second_kicker:
-        return 2
-    elif hand_one_third_kicker > hand_two_third_kicker:
-        return 1
-    elif hand_two_third_kicker > hand_one_third_kicker:
-        return 2
-    else:
-        return 0
+    return compare_hand_strengths(hand_one, hand_two)
 
 
 def break_tie_high_card(hand_one, hand_two):
@@ -778,10 +903,4 @@ def break_tie_high_card(hand_one, hand_two):
         1 if the first hand is greater
         2 if the second hand is greater  
     """
-    for i in range(5):
-        if hand_one[i].value > hand_two[i].value:
-            return 1
-        elif hand_two[i].value < hand_one[i].value:
-            return 2
-    
-    return 0
+    return compare_hand_strengths(hand_one, hand_two)
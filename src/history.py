@@ -0,0 +1,164 @@
+"""
+This file specifies the hand history log, a compact binary record of every round played.
+
+A history file is a small header followed by fixed-width records, one per round, which
+are only ever appended. Each record holds:
+    wager: the number of chips wagered
+    player_chips, dealer_chips: the chips held by the player and the dealer once the wager was paid out
+    cards: the eleven cards in their integer form -- the player's pair, the dealer's two
+        pairs, and the five community cards, in the order the batch evaluator takes them
+    pick: the index (0-2) of the pair the player picked up, in the order the pairs were
+        shown (the pairs were shown in the order of the dealer's pairs, with the player's
+        pair inserted at this index)
+    player_ranking, dealer_ranking: the rankings of the best hands (see hand_ranking in hand_evaluator.py)
+    player_multiple, dealer_multiple: the multiples applied to the wager
+
+load_history memory-maps a file and returns its records as a NumPy structured array,
+so even a very long history is read without copying it or creating an object per round.
+A record cut short (e.g. by a crash while it was being written) is ignored by the
+reader and dropped by the next writer.
+"""
+
+import os
+import struct
+
+import numpy as np
+
+from src.card import to_ints
+from src.hand_evaluator import hand_ranking
+
+HISTORY_VERSION = 1
+HISTORY_MAGIC = b'TPHH'
+
+# magic, version, record size (padded to 16 bytes)
+HEADER_FORMAT = '<4sII4x'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+HISTORY_RECORD_DTYPE = np.dtype([
+    ('wager', '<i8'),
+    ('player_chips', '<i8'),
+    ('dealer_chips', '<i8'),
+    ('cards', 'u1', (11,)),
+    ('pick', 'u1'),
+    ('player_ranking', 'u1'),
+    ('dealer_ranking', 'u1'),
+    ('player_multiple', 'i1'),
+    ('dealer_multiple', 'i1')
+])
+RECORD_STRUCT = struct.Struct('<qqq11sBBBbb')
+RECORD_SIZE = RECORD_STRUCT.size
+assert RECORD_SIZE == HISTORY_RECORD_DTYPE.itemsize
+
+# The number of records a writer holds before writing them to the file
+DEFAULT_BUFFER_RECORDS = 4096
+
+
+class HandHistoryWriter:
+    def __init__(self, path, buffer_records=DEFAULT_BUFFER_RECORDS):
+        """
+        Opens a history file to append rounds to, creating it if it does not exist.
+
+        Params:
+            path: the location of the history file
+            buffer_records: the number of records to hold before writing them to the
+                file (1 writes every round as soon as it is appended)
+        """
+        self.path = path
+        self.buffer_records = buffer_records
+        self.buffer = bytearray()
+        self.num_buffered = 0
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            num_records = _read_num_records(path)
+            self.file = open(path, 'r+b')
+            # Drop a record that was cut short, so the records appended stay aligned
+            self.file.truncate(HEADER_SIZE + num_records * RECORD_SIZE)
+            self.file.seek(0, os.SEEK_END)
+        else:
+            self.file = open(path, 'wb')
+            self.file.write(struct.pack(HEADER_FORMAT, HISTORY_MAGIC, HISTORY_VERSION, RECORD_SIZE))
+            self.file.flush()
+
+    def append(self, result):
+        """
+        Appends a RoundResult (see round_engine.py) as one record.
+        """
+        self.buffer += RECORD_STRUCT.pack(
+            result.wager,
+            result.player_chips,
+            result.dealer_chips,
+            bytes(to_ints(result.player_hand + result.dealer_hands[0] + result.dealer_hands[1] + result.community_cards)),
+            result.pick,
+            hand_ranking[result.player_best_hand],
+            hand_ranking[result.dealer_best_hand],
+            result.player_wager_multiple,
+            result.dealer_wager_multiple
+        )
+        self.num_buffered += 1
+        if self.num_buffered >= self.buffer_records:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered records to the file.
+        """
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.buffer.clear()
+            self.num_buffered = 0
+        self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def load_history(path):
+    """
+    Memory-maps a history file.
+
+    Params:
+        path: the location of the history file
+    Returns:
+        A read-only structured array of the records (see HISTORY_RECORD_DTYPE), backed by the file
+    """
+    num_records = _read_num_records(path)
+    if num_records == 0:
+        # An empty file region cannot be memory-mapped
+        return np.zeros(0, dtype=HISTORY_RECORD_DTYPE)
+    return np.memmap(path, dtype=HISTORY_RECORD_DTYPE, mode='r', offset=HEADER_SIZE, shape=(num_records,))
+
+
+def get_round_cards(records):
+    """
+    Splits the cards of history records into the arrays determine_outcome_batch takes.
+
+    Returns:
+        Views of the player's pairs, the dealer's first pairs, the dealer's second pairs,
+        and the community cards, shaped (N, 2), (N, 2), (N, 2), and (N, 5)
+    """
+    cards = records['cards']
+    return (cards[:, 0:2], cards[:, 2:4], cards[:, 4:6], cards[:, 6:11])
+
+
+def _read_num_records(path):
+    """
+    Checks the header of a history file and returns the number of whole records it holds.
+    """
+    with open(path, 'rb') as history_file:
+        header = history_file.read(HEADER_SIZE)
+        size = os.fstat(history_file.fileno()).st_size
+
+    if len(header) < HEADER_SIZE:
+        raise ValueError('{} is not a hand history'.format(path))
+    (magic, version, record_size) = struct.unpack(HEADER_FORMAT, header)
+    if magic != HISTORY_MAGIC or version != HISTORY_VERSION or record_size != RECORD_SIZE:
+        raise ValueError('{} is not a version {} hand history'.format(path, HISTORY_VERSION))
+    return (size - HEADER_SIZE) // RECORD_SIZE
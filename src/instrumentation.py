@@ -0,0 +1,145 @@
+"""
+This file specifies the instrumentation of the hand evaluator's hot paths.
+
+When instrumentation is enabled, the functions below are replaced in hand_evaluator.py
+with wrappers that count their calls and add up the time spent in them, and the categories
+of the best hands held by the player and the dealer in every round scored by an outcome
+function are counted. The times are inclusive: the time of determine_outcome
+includes the time of the find_best_hand calls it makes.
+Ties are broken by the hand strengths (see get_hand_strength), so the time spent on
+tie-breaking shows up under get_hand_strength and compare_hand_strengths. break_tie is
+kept only as part of the hand evaluator's API; nothing in the game calls it, so its
+counter only moves when it is called directly.
+When instrumentation is disabled (the default), the original functions are restored, so
+evaluation costs exactly what it did before. Only calls made through the hand_evaluator
+module see the wrappers, so callers should refer to hand_evaluator.determine_outcome
+rather than importing the function itself.
+
+The counters are read with get_snapshot, which returns plain dictionaries, and can be
+written out as JSON with dump_snapshot.
+"""
+
+import functools
+import json
+import time
+
+import src.hand_evaluator as hand_evaluator
+
+INSTRUMENTED_FUNCTIONS = (
+    'determine_outcome',
+    'determine_outcome_from_table',
+    'get_all_possible_hands_sorted',
+    'get_best_hand',
+    'find_best_hand',
+    'get_hand_strength',
+    'compare_hand_strengths',
+    'break_tie'
+)
+# The functions that return the four values of determine_outcome, whose first two are
+# the categories of the player's and the dealer's best hands
+OUTCOME_FUNCTIONS = ('determine_outcome', 'determine_outcome_from_table')
+
+_original_functions = {}
+_function_statistics = {}
+_category_counts = {}
+
+
+class FunctionStatistics:
+    __slots__ = ('calls', 'total_seconds')
+
+    def __init__(self):
+        self.calls = 0
+        self.total_seconds = 0.0
+
+    def to_json(self):
+        return {
+            'calls': self.calls,
+            'total_seconds': self.total_seconds,
+            'mean_microseconds': self.total_seconds / self.calls * 1e6 if self.calls else 0.0
+        }
+
+
+def is_instrumentation_enabled():
+    return bool(_original_functions)
+
+
+def enable_instrumentation():
+    """
+    Replaces the instrumented functions in hand_evaluator.py with counting and timing
+    wrappers. Enabling instrumentation that is already enabled does nothing.
+    """
+    if is_instrumentation_enabled():
+        return
+    for name in INSTRUMENTED_FUNCTIONS:
+        function = getattr(hand_evaluator, name)
+        _original_functions[name] = function
+        _function_statistics.setdefault(name, FunctionStatistics())
+        setattr(hand_evaluator, name, _wrap(name, function))
+
+
+def disable_instrumentation():
+    """
+    Restores the original functions in hand_evaluator.py. The counters are kept until
+    reset_instrumentation is called.
+    """
+    for (name, function) in _original_functions.items():
+        setattr(hand_evaluator, name, function)
+    _original_functions.clear()
+
+
+def reset_instrumentation():
+    """
+    Sets every counter back to zero.
+    """
+    for name in list(_function_statistics):
+        _function_statistics[name] = FunctionStatistics()
+    _category_counts.clear()
+
+
+def get_snapshot():
+    """
+    Returns the counters as a dictionary with the following keys:
+        enabled: whether instrumentation is currently enabled
+        functions: the calls, total seconds, and mean microseconds per call of each instrumented function
+        categories: the number of best hands held by the player or the dealer in a scored
+            round with each ranking (e.g. 'flush')
+    """
+    return {
+        'enabled': is_instrumentation_enabled(),
+        'functions': {name: statistics.to_json() for (name, statistics) in _function_statistics.items()},
+        'categories': dict(_category_counts)
+    }
+
+
+def dump_snapshot(output_file):
+    """
+    Writes the current snapshot (see get_snapshot) as JSON.
+
+    Params:
+        output_file: a path or an open text file
+    """
+    if isinstance(output_file, str):
+        with open(output_file, 'w') as opened_file:
+            json.dump(get_snapshot(), opened_file, indent=2)
+    else:
+        json.dump(get_snapshot(), output_file, indent=2)
+
+
+def _wrap(name, function):
+    statistics = _function_statistics[name]
+    counts_categories = name in OUTCOME_FUNCTIONS
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            statistics.total_seconds += time.perf_counter() - start
+            statistics.calls += 1
+        if counts_categories:
+            for category in result[:2]:
+                _category_counts[category] = _category_counts.get(category, 0) + 1
+        return result
+
+    return wrapper
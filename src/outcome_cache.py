@@ -0,0 +1,210 @@
+"""
+This file specifies an opt-in memoization layer for the hand evaluator.
+
+Analyses, strategy queries, and replayed hand histories evaluate the same sets of
+cards again and again. A CachedEvaluator remembers the results of determine_outcome
+and find_best_hand (the search behind get_best_hand) in bounded least-recently-used
+caches, so repeated calls cost a dictionary lookup. Nothing is cached unless a
+CachedEvaluator is created and called in place of the functions in hand_evaluator.py.
+
+The order of the cards within a hand never changes a result, so the keys are built
+from the cards as sets. determine_outcome also returns the same result for deals that
+only differ by a permutation of the suites, so its key is the canonical form of the
+deal (see canonical.py) and isomorphic deals share a single entry. Neither does the
+order of the dealer's two hands, so they are put in a fixed order before the deal is
+canonicalized (see get_outcome_key).
+"""
+
+import operator
+import sys
+from collections import OrderedDict
+
+from src.canonical import get_canonical_key
+from src.card import Card
+import src.hand_evaluator as hand_evaluator
+
+DEFAULT_MAX_ENTRIES = 100000
+
+# A rough count of the bytes the OrderedDict holds for each entry, beyond the key and value
+ENTRY_OVERHEAD_BYTES = 104
+
+
+class CacheStatistics:
+    def __init__(self, hits, misses, evictions, entries, size_bytes):
+        """
+        Params:
+            hits: the number of lookups that found a cached result
+            misses: the number of lookups that had to compute the result
+            evictions: the number of entries dropped to stay within the limits
+            entries: the number of entries currently cached
+            size_bytes: the estimated size of the cached entries (see get_entry_size)
+        """
+        self.hits = hits
+        self.misses = misses
+        self.evictions = evictions
+        self.entries = entries
+        self.size_bytes = size_bytes
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __add__(self, other):
+        return CacheStatistics(
+            self.hits + other.hits,
+            self.misses + other.misses,
+            self.evictions + other.evictions,
+            self.entries + other.entries,
+            self.size_bytes + other.size_bytes
+        )
+
+    def __repr__(self):
+        return 'CacheStatistics(hits={}, misses={}, evictions={}, entries={}, size_bytes={})'.format(
+            self.hits, self.misses, self.evictions, self.entries, self.size_bytes
+        )
+
+
+class LRUCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=None):
+        """
+        A mapping that drops its least recently used entries once it holds more than
+        max_entries entries or more than max_bytes estimated bytes.
+
+        Params:
+            max_entries: the most entries to hold (None for no limit on the count)
+            max_bytes: the most estimated bytes to hold (None for no limit on the size)
+        """
+        if max_entries is None and max_bytes is None:
+            raise ValueError('An LRUCache needs a limit on its entries or its bytes')
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key, compute):
+        """
+        Returns the value cached under key, marking it as the most recently used.
+        On a miss, the value is computed by calling compute(), cached, and returned.
+        """
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry[0]
+
+        self.misses += 1
+        value = compute()
+        size = get_entry_size(key, value)
+        self.entries[key] = (value, size)
+        self.size_bytes += size
+        self.evict()
+        return value
+
+    def evict(self):
+        """
+        Drops the least recently used entries until the cache is within its limits.
+        """
+        while self.entries and (
+            (self.max_entries is not None and len(self.entries) > self.max_entries)
+            or (self.max_bytes is not None and self.size_bytes > self.max_bytes)
+        ):
+            (_, (_, size)) = self.entries.popitem(last=False)
+            self.size_bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Drops every entry. The hit, miss, and eviction counts are kept.
+        """
+        self.entries.clear()
+        self.size_bytes = 0
+
+    def get_statistics(self):
+        return CacheStatistics(self.hits, self.misses, self.evictions, len(self.entries), self.size_bytes)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class CachedEvaluator:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=None):
+        """
+        Memoizes determine_outcome and find_best_hand. The limits apply to each of the
+        two caches separately.
+
+        Params:
+            max_entries: the most entries each cache holds (None for no limit on the count)
+            max_bytes: the most estimated bytes each cache holds (None for no limit on the size)
+        """
+        self.outcome_cache = LRUCache(max_entries, max_bytes)
+        self.best_hand_cache = LRUCache(max_entries, max_bytes)
+
+    def determine_outcome(self, hand_one, hand_two, hand_three, community_cards):
+        """
+        Returns the same four values as determine_outcome in hand_evaluator.py.
+        """
+        key = get_outcome_key(hand_one, hand_two, hand_three, community_cards)
+        return self.outcome_cache.get_or_compute(
+            key,
+            lambda: hand_evaluator.determine_outcome(hand_one, hand_two, hand_three, community_cards)
+        )
+
+    def find_best_hand(self, player_hand, community_cards):
+        """
+        Returns the same tuple as find_best_hand in hand_evaluator.py. The best hand
+        holds the actual cards, so only the same set of seven cards shares an entry.
+        """
+        key = frozenset(map(operator.index, player_hand)).union(map(operator.index, community_cards))
+        return self.best_hand_cache.get_or_compute(
+            key,
+            lambda: hand_evaluator.find_best_hand(player_hand, community_cards)
+        )
+
+    def get_statistics(self):
+        """
+        Returns the CacheStatistics of both caches added together.
+        """
+        return self.outcome_cache.get_statistics() + self.best_hand_cache.get_statistics()
+
+    def clear(self):
+        self.outcome_cache.clear()
+        self.best_hand_cache.clear()
+
+
+def get_outcome_key(hand_one, hand_two, hand_three, community_cards):
+    """
+    Returns the cache key of a deal, which is the same whichever of the dealer's hands
+    comes first. The dealer's hands are ordered by their values; when those are the same,
+    the deal is canonicalized in both orders and the smaller key is used.
+    """
+    values_two = sorted(operator.index(card) >> 2 for card in hand_two)
+    values_three = sorted(operator.index(card) >> 2 for card in hand_three)
+    if values_two < values_three:
+        return get_canonical_key(hand_one, hand_two, hand_three, community_cards)
+    if values_three < values_two:
+        return get_canonical_key(hand_one, hand_three, hand_two, community_cards)
+    return min(
+        get_canonical_key(hand_one, hand_two, hand_three, community_cards),
+        get_canonical_key(hand_one, hand_three, hand_two, community_cards)
+    )
+
+
+def get_entry_size(key, value):
+    """
+    Estimates the bytes a cache entry holds: the entry overhead plus the objects in its
+    key and value. Card objects and strings are shared across the process (see card.py
+    and the dictionaries in hand_evaluator.py), so they are not counted.
+    """
+    return ENTRY_OVERHEAD_BYTES + _get_object_size(key) + _get_object_size(value)
+
+
+def _get_object_size(obj):
+    if isinstance(obj, (Card, str)):
+        return 0
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (tuple, list, frozenset)):
+        size += sum(_get_object_size(item) for item in obj)
+    return size
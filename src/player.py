@@ -36,7 +36,7 @@ class Player:
         Add a pair of cards to the list of hands held by the player.
 
         Params:
-            cards: a pair of card objects
+            cards: a pair of cards, either card objects or their integer forms
         """
         self.hands.append(cards)
 
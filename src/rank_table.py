@@ -0,0 +1,362 @@
+"""
+This file specifies the precomputed 7-card rank table, an alternative backend
+for evaluating hands.
+Rather than building and sorting the 21 five-card combinations of a player's
+seven cards, the table maps the seven cards directly to the strength of their
+best five-card hand (see get_hand_strength in hand_evaluator.py), so the greater
+strength always wins.
+
+The table is made up of two arrays:
+1) The flush array, which is indexed by a 13-bit mask of the ranks held in the
+   flush suite. Seven cards can only contain one flush, and a hand with a flush
+   can never contain a full house or four of a kind, so the flush suite alone
+   determines the value of the hand.
+2) The non-flush array, which is indexed by the sum of the rank keys below.
+   The rank keys are chosen so that every multiset of seven ranks (holding no
+   more than four cards of any one rank) has a unique sum.
+
+Both indexes are sums over the cards, so the five community cards can be summed
+once into a BoardState and each pocket hand finished against it with two more
+additions (see get_board_state and RankTable.get_strength_on_board).
+
+The table is built once from the functions in hand_evaluator.py, saved to a
+versioned file, and memory-mapped on later runs.
+"""
+
+import array
+import itertools
+import mmap
+import os
+import struct
+import sys
+
+import numpy as np
+
+from src.card import SUITES
+
+RANK_TABLE_VERSION = 2
+RANK_TABLE_MAGIC = b'TPRT'
+
+# magic, version, number of non-flush entries, number of flush entries
+HEADER_FORMAT = '<4sIII'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+# Strengths are stored as unsigned 32-bit integers.
+ITEM_SIZE = 4
+
+table_directory = os.path.join(os.path.dirname(__file__), '../tables/')
+
+# Indexed by card value - 2 (i.e. 2 is at index 0, and the ace is at index 12).
+RANK_KEYS = (0, 1, 5, 22, 98, 453, 2031, 8698, 22854, 83661, 262349, 636345, 1479181)
+NON_FLUSH_TABLE_SIZE = 4 * RANK_KEYS[12] + 3 * RANK_KEYS[11] + 1
+FLUSH_TABLE_SIZE = 1 << 13
+
+# Each suite counts in its own four-bit field, so the suite counts of seven cards
+# can be added up in a single integer. FLUSH_SUITE maps that sum to one plus the
+# index of the suite holding five or more cards, or 0 if there is no flush.
+SUITE_COUNT_BITS = (1, 1 << 4, 1 << 8, 1 << 12)
+FLUSH_SUITE = bytes(
+    next((suite + 1 for suite in range(4) if (counts >> (4 * suite)) & 0xF >= 5), 0)
+    for counts in range(1 << 16)
+)
+
+# The keys, suite count bits, suite indexes, and rank bits above, indexed by the integer form of a card
+CARD_RANK_KEYS = tuple(RANK_KEYS[card >> 2] for card in range(52))
+CARD_SUITE_COUNT_BITS = tuple(SUITE_COUNT_BITS[card & 3] for card in range(52))
+CARD_SUITES = tuple(card & 3 for card in range(52))
+CARD_RANK_BITS = tuple(1 << (card >> 2) for card in range(52))
+
+# The rank bit of each card placed in a sixteen-bit field for its suite, so the masks of
+# ranks held in each suite can be added up in a single integer (no card is held twice).
+SUITE_RANK_BITS_SHIFT = 16
+CARD_SUITE_RANK_BITS = tuple(1 << (SUITE_RANK_BITS_SHIFT * (card & 3) + (card >> 2)) for card in range(52))
+RANK_MASK = (1 << 13) - 1
+
+_rank_table = None
+
+
+class BoardState:
+    __slots__ = ('rank_key_sum', 'suite_counts', 'suite_rank_bits')
+
+    def __init__(self, rank_key_sum, suite_counts, suite_rank_bits):
+        """
+        The partial rank table indexes of a set of community cards, which every
+        pocket hand played on those cards shares.
+
+        Params:
+            rank_key_sum: the sum of the rank keys of the cards
+            suite_counts: the number of cards of each suite, in the four-bit fields of SUITE_COUNT_BITS
+            suite_rank_bits: the mask of ranks held in each suite, in the sixteen-bit fields
+                of CARD_SUITE_RANK_BITS
+        The batch evaluator (see get_board_states_batch in hand_evaluator.py) holds an
+        array in each of these for many boards at once.
+        """
+        self.rank_key_sum = rank_key_sum
+        self.suite_counts = suite_counts
+        self.suite_rank_bits = suite_rank_bits
+
+
+class RankTable:
+    def __init__(self, non_flush_strengths, flush_strengths, backing=None):
+        """
+        Params:
+            non_flush_strengths: a sequence of strengths indexed by the sum of rank keys
+            flush_strengths: a sequence of strengths indexed by the mask of ranks in the flush suite
+            backing: the memory map the sequences above are views into (if any)
+        """
+        self.non_flush_strengths = non_flush_strengths
+        self.flush_strengths = flush_strengths
+        self.backing = backing
+        self.arrays = None
+
+    def get_strength(self, cards):
+        """
+        Given seven cards, returns the strength of the best five-card hand they contain.
+
+        Params:
+            cards: a sequence of seven cards, either card objects or their integer forms
+        Returns:
+            The strength of the best hand (see get_hand_strength in hand_evaluator.py)
+        """
+        rank_key_sum = 0
+        suite_counts = 0
+        for card in cards:
+            rank_key_sum += CARD_RANK_KEYS[card]
+            suite_counts += CARD_SUITE_COUNT_BITS[card]
+
+        flush_suite = FLUSH_SUITE[suite_counts]
+        if flush_suite:
+            suite = flush_suite - 1
+            mask = 0
+            for card in cards:
+                if CARD_SUITES[card] == suite:
+                    mask |= CARD_RANK_BITS[card]
+            return self.flush_strengths[mask]
+        return self.non_flush_strengths[rank_key_sum]
+
+    def get_strength_on_board(self, hand, board_state):
+        """
+        Given a pocket hand and the state of the community cards (see get_board_state),
+        returns the strength of the best five-card hand they contain. This is equal to
+        get_strength of the seven cards, but only the pocket cards are examined.
+
+        Params:
+            hand: the two pocket cards, either card objects or their integer forms
+            board_state: the BoardState of the five community cards
+        Returns:
+            The strength of the best hand (see get_hand_strength in hand_evaluator.py)
+        """
+        (card_one, card_two) = hand
+        flush_suite = FLUSH_SUITE[
+            board_state.suite_counts + CARD_SUITE_COUNT_BITS[card_one] + CARD_SUITE_COUNT_BITS[card_two]
+        ]
+        if flush_suite:
+            suite_rank_bits = (
+                board_state.suite_rank_bits + CARD_SUITE_RANK_BITS[card_one] + CARD_SUITE_RANK_BITS[card_two]
+            )
+            return self.flush_strengths[(suite_rank_bits >> (SUITE_RANK_BITS_SHIFT * (flush_suite - 1))) & RANK_MASK]
+        return self.non_flush_strengths[
+            board_state.rank_key_sum + CARD_RANK_KEYS[card_one] + CARD_RANK_KEYS[card_two]
+        ]
+
+    def get_arrays(self):
+        """
+        Returns the non-flush and flush strengths as NumPy arrays for the batch
+        evaluator. Arrays over a memory-mapped table share its memory rather than
+        copying it.
+        """
+        if self.arrays is None:
+            self.arrays = (
+                np.asarray(self.non_flush_strengths, dtype=np.uint32),
+                np.asarray(self.flush_strengths, dtype=np.uint32)
+            )
+        return self.arrays
+
+    def close(self):
+        """
+        Releases the memory map backing the table, if there is one.
+        Any arrays returned by get_arrays must no longer be in use.
+        """
+        self.arrays = None
+        if self.backing is not None:
+            self.non_flush_strengths.release()
+            self.flush_strengths.release()
+            self.backing.close()
+            self.backing = None
+
+
+def get_board_state(community_cards):
+    """
+    Sums the community cards into the partial indexes every pocket hand played
+    on them shares.
+
+    Params:
+        community_cards: a sequence of cards, either card objects or their integer forms
+    Returns:
+        A BoardState
+    """
+    rank_key_sum = 0
+    suite_counts = 0
+    suite_rank_bits = 0
+    for card in community_cards:
+        rank_key_sum += CARD_RANK_KEYS[card]
+        suite_counts += CARD_SUITE_COUNT_BITS[card]
+        suite_rank_bits += CARD_SUITE_RANK_BITS[card]
+    return BoardState(rank_key_sum, suite_counts, suite_rank_bits)
+
+
+def get_rank_table_path(directory=None):
+    """
+    Returns the path of the rank table file for the current table version.
+    """
+    if directory is None:
+        directory = table_directory
+    return os.path.join(directory, 'rank_table_v{}.bin'.format(RANK_TABLE_VERSION))
+
+
+def get_rank_table():
+    """
+    Returns the rank table shared across the process, loading it (and building
+    it if necessary) on first use.
+    """
+    global _rank_table
+    if _rank_table is None:
+        _rank_table = load_rank_table()
+    return _rank_table
+
+
+def load_rank_table(path=None, build_if_missing=True):
+    """
+    Memory-maps the rank table saved at path. If the file does not exist (or was
+    written by a different table version), the table is built and saved first.
+
+    Params:
+        path: the location of the table file (defaults to the versioned file in table_directory)
+        build_if_missing: whether to build the table when no usable file exists
+    Returns:
+        A RankTable backed by the memory-mapped file
+    """
+    if path is None:
+        path = get_rank_table_path()
+
+    if not is_valid_rank_table_file(path):
+        if not build_if_missing:
+            raise FileNotFoundError('No rank table (version {}) at {}'.format(RANK_TABLE_VERSION, path))
+        save_rank_table(build_rank_table(), path)
+
+    with open(path, 'rb') as table_file:
+        backing = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    _, _, non_flush_size, flush_size = struct.unpack_from(HEADER_FORMAT, backing)
+    non_flush_end = HEADER_SIZE + ITEM_SIZE * non_flush_size
+    flush_end = non_flush_end + ITEM_SIZE * flush_size
+
+    if sys.byteorder == 'little':
+        view = memoryview(backing)
+        non_flush_strengths = view[HEADER_SIZE:non_flush_end].cast('I')
+        flush_strengths = view[non_flush_end:flush_end].cast('I')
+        view.release()
+        return RankTable(non_flush_strengths, flush_strengths, backing)
+
+    # The file is little-endian, so big-endian machines read a byte-swapped copy instead.
+    non_flush_strengths = _read_little_endian(backing[HEADER_SIZE:non_flush_end])
+    flush_strengths = _read_little_endian(backing[non_flush_end:flush_end])
+    backing.close()
+    return RankTable(non_flush_strengths, flush_strengths)
+
+
+def is_valid_rank_table_file(path):
+    """
+    Returns true if path holds a complete rank table written by the current table version.
+    """
+    try:
+        with open(path, 'rb') as table_file:
+            header = table_file.read(HEADER_SIZE)
+            size = os.fstat(table_file.fileno()).st_size
+    except OSError:
+        return False
+
+    if len(header) < HEADER_SIZE:
+        return False
+    magic, version, non_flush_size, flush_size = struct.unpack(HEADER_FORMAT, header)
+    return (
+        magic == RANK_TABLE_MAGIC
+        and version == RANK_TABLE_VERSION
+        and size == HEADER_SIZE + ITEM_SIZE * (non_flush_size + flush_size)
+    )
+
+
+def save_rank_table(table, path):
+    """
+    Writes the table to path. The file is written under a temporary name and then
+    moved into place, so other processes never see a partially written table.
+
+    Params:
+        table: the RankTable to save
+        path: the location of the table file
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    non_flush_strengths = array.array('I', table.non_flush_strengths)
+    flush_strengths = array.array('I', table.flush_strengths)
+    if sys.byteorder != 'little':
+        non_flush_strengths.byteswap()
+        flush_strengths.byteswap()
+
+    temporary_path = '{}.{}.tmp'.format(path, os.getpid())
+    with open(temporary_path, 'wb') as table_file:
+        table_file.write(struct.pack(
+            HEADER_FORMAT,
+            RANK_TABLE_MAGIC,
+            RANK_TABLE_VERSION,
+            len(non_flush_strengths),
+            len(flush_strengths)
+        ))
+        non_flush_strengths.tofile(table_file)
+        flush_strengths.tofile(table_file)
+    os.replace(temporary_path, path)
+
+
+def build_rank_table():
+    """
+    Builds the rank table by evaluating one representative set of cards for every
+    possible flush and every possible multiset of seven ranks with the functions
+    in hand_evaluator.py.
+
+    Returns:
+        An in-memory RankTable
+    """
+    from src.card import Card
+    from src.hand_evaluator import find_best_hand
+
+    non_flush_strengths = [0] * NON_FLUSH_TABLE_SIZE
+    flush_strengths = [0] * FLUSH_TABLE_SIZE
+
+    # Every flush: five to seven ranks of a single suite. The remaining cards
+    # cannot improve on a flush, so the suited cards alone are evaluated.
+    for mask in range(FLUSH_TABLE_SIZE):
+        ranks = [rank for rank in range(13) if mask & (1 << rank)]
+        if not 5 <= len(ranks) <= 7:
+            continue
+        cards = tuple(Card('diamonds', rank + 2) for rank in ranks)
+        (strength, _) = find_best_hand(cards[:2], cards[2:])
+        flush_strengths[mask] = strength
+
+    # Every multiset of seven ranks. Suites are dealt round-robin, so no suite
+    # holds more than two of the cards and repeated ranks never share a suite.
+    for ranks in itertools.combinations_with_replacement(range(13), 7):
+        if any(ranks.count(rank) > 4 for rank in set(ranks)):
+            continue
+        cards = tuple(Card(SUITES[i % 4], rank + 2) for i, rank in enumerate(ranks))
+        (strength, _) = find_best_hand(cards[:2], cards[2:])
+        non_flush_strengths[sum(RANK_KEYS[rank] for rank in ranks)] = strength
+
+    return RankTable(non_flush_strengths, flush_strengths)
+
+
+def _read_little_endian(data):
+    values = array.array('I')
+    values.frombytes(data)
+    values.byteswap()
+    return values
@@ -0,0 +1,243 @@
+"""
+This file contains the replay tool, which re-scores the rounds recorded in a hand
+history (see history.py) and reports every round whose outcome has changed -- e.g.
+after a change to the hand evaluator.
+
+The records are split into chunks of consecutive rounds, and the chunks are scored
+across a pool of processes. Each worker memory-maps the history itself, so only the
+bounds of a chunk are sent to it and only the mismatches are sent back. The chunks are
+reported in order as they finish, so an interrupted replay can be resumed from the end
+of the last chunk reported.
+
+Usage:
+    python -m src.replay rounds.bin
+    python -m src.replay rounds.bin --evaluator determine_outcome_batch --start 5000000
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import src.hand_evaluator as hand_evaluator
+from src.history import get_round_cards, load_history
+
+# The evaluators a replay can re-score rounds with. The first two are called once per
+# round; determine_outcome_batch scores a whole chunk at once.
+REPLAY_EVALUATORS = ('determine_outcome', 'determine_outcome_from_table', 'determine_outcome_batch')
+DEFAULT_CHUNK_SIZE = 20000
+# The most mismatches printed by the command-line tool
+MAX_PRINTED_MISMATCHES = 20
+
+
+class Mismatch:
+    def __init__(self, index, recorded_outcome, replayed_outcome):
+        """
+        Params:
+            index: the index of the round in the history
+            recorded_outcome: the outcome in the history, as the four values returned by determine_outcome
+            replayed_outcome: the outcome the evaluator gives now, in the same form
+        """
+        self.index = index
+        self.recorded_outcome = recorded_outcome
+        self.replayed_outcome = replayed_outcome
+
+    def __eq__(self, other):
+        return isinstance(other, Mismatch) and (self.index, self.recorded_outcome, self.replayed_outcome) == (
+            other.index, other.recorded_outcome, other.replayed_outcome
+        )
+
+    def __repr__(self):
+        return 'Mismatch(index={}, recorded_outcome={!r}, replayed_outcome={!r})'.format(
+            self.index, self.recorded_outcome, self.replayed_outcome
+        )
+
+
+class ReplayResult:
+    def __init__(self, start, end, mismatches, elapsed_seconds):
+        """
+        Params:
+            start: the index of the first round replayed
+            end: one past the index of the last round replayed (the offset to resume from)
+            mismatches: a list of the Mismatches found, in the order of the rounds
+            elapsed_seconds: the time the replay took
+        """
+        self.start = start
+        self.end = end
+        self.mismatches = mismatches
+        self.elapsed_seconds = elapsed_seconds
+
+    def rounds(self):
+        return self.end - self.start
+
+    def rounds_per_second(self):
+        return self.rounds() / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+def replay(
+    path,
+    start=0,
+    end=None,
+    evaluator='determine_outcome',
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    processes=None,
+    on_chunk_complete=None
+):
+    """
+    Re-scores the rounds from start up to end in a history file.
+
+    Params:
+        path: the location of the history file
+        start: the index of the first round to replay (the offset to resume from)
+        end: one past the index of the last round to replay (defaults to the end of the history)
+        evaluator: the name of one of the REPLAY_EVALUATORS in hand_evaluator.py
+        chunk_size: the number of rounds in each chunk
+        processes: the number of worker processes (defaults to the number of CPUs);
+            1 replays every chunk in the current process
+        on_chunk_complete: if given, called with the ReplayResult so far after each chunk,
+            in the order of the chunks
+    Returns:
+        A ReplayResult
+    """
+    if evaluator not in REPLAY_EVALUATORS:
+        raise ValueError('Unknown evaluator {!r} (expected one of {})'.format(evaluator, ', '.join(REPLAY_EVALUATORS)))
+    num_records = len(load_history(path))
+    end = num_records if end is None else min(end, num_records)
+    start = min(start, end)
+    tasks = [
+        (path, chunk_start, min(chunk_start + chunk_size, end), evaluator)
+        for chunk_start in range(start, end, chunk_size)
+    ]
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    start_time = time.perf_counter()
+    result = ReplayResult(start, start, [], 0.0)
+
+    def add_chunk(chunk_end, mismatches):
+        result.end = chunk_end
+        result.mismatches += mismatches
+        result.elapsed_seconds = time.perf_counter() - start_time
+        if on_chunk_complete is not None:
+            on_chunk_complete(result)
+
+    if processes == 1:
+        for task in tasks:
+            add_chunk(task[2], replay_chunk(task))
+    else:
+        with ProcessPoolExecutor(max_workers=min(processes, max(len(tasks), 1))) as executor:
+            # map yields the chunks in order, so the rounds before result.end are always done
+            for (task, mismatches) in zip(tasks, executor.map(replay_chunk, tasks)):
+                add_chunk(task[2], mismatches)
+
+    result.elapsed_seconds = time.perf_counter() - start_time
+    return result
+
+
+def replay_chunk(task):
+    """
+    Re-scores one chunk of a history. This runs in the worker processes, so it takes a
+    single picklable tuple.
+
+    Params:
+        task: a tuple of the history's path, the indexes of the chunk's first round and
+            of one past its last round, and the name of the evaluator
+    Returns:
+        A list of the chunk's Mismatches
+    """
+    (path, start, end, evaluator) = task
+    records = load_history(path)[start:end]
+
+    if evaluator == 'determine_outcome_batch':
+        (player_rankings, dealer_rankings, player_multiples, dealer_multiples) = hand_evaluator.determine_outcome_batch(
+            *get_round_cards(records)
+        )
+        changed = (
+            (player_rankings != records['player_ranking'])
+            | (dealer_rankings != records['dealer_ranking'])
+            | (player_multiples != records['player_multiple'])
+            | (dealer_multiples != records['dealer_multiple'])
+        )
+        # Only the changed rounds are turned into Python objects
+        changed_indexes = np.flatnonzero(changed)
+        return [
+            Mismatch(
+                start + i,
+                recorded_outcome,
+                (
+                    hand_evaluator.ranking_to_hand[int(player_rankings[i])],
+                    hand_evaluator.ranking_to_hand[int(dealer_rankings[i])],
+                    int(player_multiples[i]),
+                    int(dealer_multiples[i])
+                )
+            )
+            for (i, recorded_outcome) in zip(changed_indexes.tolist(), get_recorded_outcomes(records[changed_indexes]))
+        ]
+
+    recorded_outcomes = get_recorded_outcomes(records)
+    determine_outcome = getattr(hand_evaluator, evaluator)
+    mismatches = []
+    for (i, cards) in enumerate(records['cards'].tolist()):
+        outcome = determine_outcome(cards[0:2], cards[2:4], cards[4:6], cards[6:11])
+        if outcome != recorded_outcomes[i]:
+            mismatches.append(Mismatch(start + i, recorded_outcomes[i], outcome))
+    return mismatches
+
+
+def get_recorded_outcomes(records):
+    """
+    Returns the outcomes of history records as a list of tuples of the four values
+    returned by determine_outcome.
+    """
+    ranking_to_hand = hand_evaluator.ranking_to_hand
+    return [
+        (ranking_to_hand[player_ranking], ranking_to_hand[dealer_ranking], player_multiple, dealer_multiple)
+        for (player_ranking, dealer_ranking, player_multiple, dealer_multiple) in zip(
+            records['player_ranking'].tolist(),
+            records['dealer_ranking'].tolist(),
+            records['player_multiple'].tolist(),
+            records['dealer_multiple'].tolist()
+        )
+    ]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Re-score the rounds in a hand history and report changed outcomes.')
+    parser.add_argument('path', help='the hand history file')
+    parser.add_argument('--start', type=int, default=0, help='the index of the first round (to resume a replay)')
+    parser.add_argument('--end', type=int, default=None, help='one past the index of the last round')
+    parser.add_argument('--evaluator', choices=REPLAY_EVALUATORS, default='determine_outcome')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--processes', type=int, default=None)
+    arguments = parser.parse_args()
+
+    def report(result):
+        print('replayed through round {:,} ({} mismatches, {:,.0f} rounds/sec)'.format(
+            result.end, len(result.mismatches), result.rounds_per_second()
+        ))
+
+    try:
+        result = replay(
+            arguments.path,
+            arguments.start,
+            arguments.end,
+            arguments.evaluator,
+            arguments.chunk_size,
+            arguments.processes,
+            report
+        )
+    except KeyboardInterrupt:
+        print('interrupted; resume from the last round reported with --start')
+        raise SystemExit(1)
+
+    for mismatch in result.mismatches[:MAX_PRINTED_MISMATCHES]:
+        print(mismatch)
+    if len(result.mismatches) > MAX_PRINTED_MISMATCHES:
+        print('... and {} more'.format(len(result.mismatches) - MAX_PRINTED_MISMATCHES))
+    print('{:,} rounds in {:.2f}s ({:,.0f} rounds/sec), {} mismatches'.format(
+        result.rounds(), result.elapsed_seconds, result.rounds_per_second(), len(result.mismatches)
+    ))
+    raise SystemExit(1 if result.mismatches else 0)
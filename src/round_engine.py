@@ -0,0 +1,298 @@
+"""
+This file contains the headless round engine, which runs the rules of Triple Pocket
+Hold'em without a window or any pauses:
+1) The player places a wager, which the dealer matches.
+2) Three pairs of pocket cards are drawn. The player is shown the first pair and picks
+   it up or passes it to the dealer; if the player passes, the same happens with the
+   second pair; if the player passes again, the player is given the third pair.
+3) Five community cards are drawn and the outcome is determined.
+4) Chips are added to or deducted from the player and the dealer.
+
+The decisions are made by a strategy object (see Strategy), so the same rules drive
+simulations, tests, and the pygame front end in game_engine.py, whose strategy asks
+the user. A Round can also be stepped through one decision at a time by front ends
+that cannot wait inside a callback.
+"""
+
+import src.hand_evaluator as hand_evaluator
+from src.deck import Deck
+from src.player import Player
+
+STARTING_CHIP_NUMBER = 1000
+INITIAL_WAGER = 100
+MIN_WAGER = 10
+WAGER_INCREMENT = 10
+
+
+class RoundResult:
+    def __init__(
+        self,
+        wager,
+        player_hand,
+        dealer_hands,
+        community_cards,
+        pick,
+        player_best_hand,
+        dealer_best_hand,
+        player_wager_multiple,
+        dealer_wager_multiple,
+        player_chips=None,
+        dealer_chips=None
+    ):
+        """
+        Params:
+            wager: the number of chips wagered by the player (and matched by the dealer)
+            player_hand: the pair of pocket cards the player ended up with
+            dealer_hands: the dealer's two pairs of pocket cards
+            community_cards: the five communal cards
+            pick: the index (0-2) of the pair the player ended up with, in the order shown
+            player_best_hand: the name of the player's best poker hand (e.g. 'flush')
+            dealer_best_hand: the name of the dealer's best poker hand
+            player_wager_multiple: the multiple applied to the wager for the player
+            dealer_wager_multiple: the multiple applied to the wager for the dealer
+            player_chips: the player's chips once the wager was paid out
+            dealer_chips: the dealer's chips once the wager was paid out
+        """
+        self.wager = wager
+        self.player_hand = player_hand
+        self.dealer_hands = dealer_hands
+        self.community_cards = community_cards
+        self.pick = pick
+        self.player_best_hand = player_best_hand
+        self.dealer_best_hand = dealer_best_hand
+        self.player_wager_multiple = player_wager_multiple
+        self.dealer_wager_multiple = dealer_wager_multiple
+        self.player_chips = player_chips
+        self.dealer_chips = dealer_chips
+
+    def player_payout(self):
+        return self.player_wager_multiple * self.wager
+
+    def __repr__(self):
+        return 'RoundResult(wager={}, pick={}, player_best_hand={!r}, dealer_best_hand={!r}, player_wager_multiple={})'.format(
+            self.wager, self.pick, self.player_best_hand, self.dealer_best_hand, self.player_wager_multiple
+        )
+
+
+class Strategy:
+    """
+    Makes the player's decisions. This base strategy wagers the initial wager and always
+    picks up the first pair; subclasses override the methods below. The on_* hooks are
+    called as the round progresses and do nothing by default.
+    """
+
+    def get_wager(self, player, dealer):
+        """
+        Returns the number of chips to wager (see clamp_wager for the allowed range).
+        """
+        return INITIAL_WAGER
+
+    def pick_up(self, hand, rejected_hands):
+        """
+        Returns true to pick up hand, or false to pass it to the dealer.
+
+        Params:
+            hand: the pair of pocket cards shown to the player
+            rejected_hands: the pairs the player has already passed in this round
+        """
+        return True
+
+    def on_round_start(self, wager):
+        pass
+
+    def on_third_hand(self, hand):
+        """
+        Called when the player has passed on the first two pairs and is given the third.
+        """
+        pass
+
+    def on_round_end(self, result):
+        pass
+
+
+class Round:
+    def __init__(self, deck, player, dealer, wager, outcome_function=None):
+        """
+        Starts a round by drawing the three pairs of pocket cards the player can be shown.
+
+        Params:
+            deck: the Deck to draw the cards from
+            player: the Player for the user
+            dealer: the Player for the dealer
+            wager: the number of chips wagered
+            outcome_function: the function that determines the outcome, taking and returning
+                the same values as determine_outcome (which it defaults to), e.g.
+                determine_outcome_from_table
+        """
+        self.deck = deck
+        self.player = player
+        self.dealer = dealer
+        self.wager = wager
+        self.outcome_function = outcome_function
+        self.hands = (deck.draw_two_card_hand(), deck.draw_two_card_hand(), deck.draw_two_card_hand())
+        self.rejected_hands = []
+        self.pick = None
+
+    def is_choosing(self):
+        """
+        Returns true while the player still has to decide on the pair being shown.
+        """
+        return self.pick is None
+
+    def get_shown_hand(self):
+        return self.hands[len(self.rejected_hands)]
+
+    def accept(self):
+        """
+        The player picks up the pair being shown, and the dealer receives the pairs
+        that have not been shown.
+        """
+        self.pick = len(self.rejected_hands)
+        self.player.add_hand(self.hands[self.pick])
+        for hand in self.hands[self.pick + 1:]:
+            self.dealer.add_hand(hand)
+
+    def reject(self):
+        """
+        The player passes the pair being shown to the dealer. After the second pair is
+        passed, the player is given the third pair.
+        """
+        hand = self.get_shown_hand()
+        self.dealer.add_hand(hand)
+        self.rejected_hands.append(hand)
+        if len(self.rejected_hands) == 2:
+            self.pick = 2
+            self.player.add_hand(self.hands[2])
+
+    def finish(self):
+        """
+        Draws the community cards, determines the outcome, and pays out the wager.
+
+        Returns:
+            A RoundResult
+        """
+        community_cards = self.deck.draw_five_community_cards()
+        outcome_function = self.outcome_function or hand_evaluator.determine_outcome
+        (player_best_hand, dealer_best_hand, player_wager_multiple, dealer_wager_multiple) = outcome_function(
+            self.player.hands[0],
+            self.dealer.hands[0],
+            self.dealer.hands[1],
+            community_cards
+        )
+        self.player.alter_chip_balance(player_wager_multiple * self.wager)
+        self.dealer.alter_chip_balance(dealer_wager_multiple * self.wager)
+        return RoundResult(
+            self.wager,
+            self.player.hands[0],
+            (self.dealer.hands[0], self.dealer.hands[1]),
+            community_cards,
+            self.pick,
+            player_best_hand,
+            dealer_best_hand,
+            player_wager_multiple,
+            dealer_wager_multiple,
+            self.player.num_chips,
+            self.dealer.num_chips
+        )
+
+
+class RoundEngine:
+    def __init__(self, strategy, starting_chip_number=STARTING_CHIP_NUMBER, outcome_function=None, history=None):
+        """
+        Params:
+            strategy: the Strategy that makes the player's decisions
+            starting_chip_number: the number of chips the player and the dealer start a game with
+            outcome_function: the function that determines the outcome of each round (see Round)
+            history: if given, a HandHistoryWriter (see history.py) that every finished round is appended to
+        """
+        self.strategy = strategy
+        self.starting_chip_number = starting_chip_number
+        self.outcome_function = outcome_function
+        self.history = history
+        # Reset and reused for every round that is not given a deck
+        self.deck = Deck()
+        self.player = None
+        self.dealer = None
+        self.new_game()
+
+    def new_game(self):
+        """
+        Resets the player and the dealer to the starting number of chips.
+        """
+        self.player = Player('Player', self.starting_chip_number)
+        self.dealer = Player('Dealer', self.starting_chip_number)
+
+    def is_game_over(self):
+        return self.player.no_chips_remaining() or self.dealer.no_chips_remaining()
+
+    def start_round(self, deck=None):
+        """
+        Asks the strategy for a wager and starts a Round, which the caller steps through
+        and then passes to finish_round.
+
+        Params:
+            deck: the Deck to deal from, with every card in it (defaults to the
+                engine's own deck, which is reset)
+        """
+        if deck is None:
+            deck = self.deck
+            deck.reset()
+        self.player.clear_hands()
+        self.dealer.clear_hands()
+        wager = clamp_wager(self.strategy.get_wager(self.player, self.dealer), self.player, self.dealer)
+        self.strategy.on_round_start(wager)
+        return Round(deck, self.player, self.dealer, wager, self.outcome_function)
+
+    def play_round(self, deck=None):
+        """
+        Plays a full round, with the strategy making every decision.
+
+        Params:
+            deck: the Deck to deal from (see start_round)
+        Returns:
+            A RoundResult
+        """
+        current_round = self.start_round(deck)
+        while current_round.is_choosing():
+            if self.strategy.pick_up(current_round.get_shown_hand(), tuple(current_round.rejected_hands)):
+                current_round.accept()
+            else:
+                current_round.reject()
+                if not current_round.is_choosing():
+                    self.strategy.on_third_hand(current_round.hands[2])
+        return self.finish_round(current_round)
+
+    def finish_round(self, current_round):
+        """
+        Finishes a Round once the player has picked a pair, tells the strategy how it
+        ended, and appends it to the history.
+
+        Returns:
+            A RoundResult
+        """
+        result = current_round.finish()
+        self.strategy.on_round_end(result)
+        if self.history is not None:
+            self.history.append(result)
+        return result
+
+    def play_game(self, max_rounds=None):
+        """
+        Plays rounds until the player or the dealer runs out of chips, or until max_rounds
+        rounds have been played.
+
+        Returns:
+            A list of the RoundResults
+        """
+        results = []
+        while not self.is_game_over() and (max_rounds is None or len(results) < max_rounds):
+            results.append(self.play_round())
+        return results
+
+
+def clamp_wager(wager, player, dealer):
+    """
+    Limits a wager to the range the wager screen allows: at least MIN_WAGER, and at most
+    the chips held by whichever of the player and the dealer holds fewer.
+    """
+    return min(max(wager, MIN_WAGER), player.num_chips, dealer.num_chips)
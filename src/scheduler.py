@@ -0,0 +1,88 @@
+"""
+This file specifies the timer queue that the game engine's event loop runs.
+
+Instead of pausing, the game engine schedules what happens next (the next step of a
+reveal, for instance) as a callback due after a delay, and every pass of its single
+event loop runs the callbacks that have come due. A pending callback can also be run
+early -- which is how a click skips a delay -- or cancelled.
+"""
+
+import heapq
+import itertools
+import time
+
+
+class Timer:
+    __slots__ = ('due', 'callback', 'cancelled')
+
+    def __init__(self, due, callback):
+        """
+        Params:
+            due: the time, in milliseconds, at which the callback is due
+            callback: the function to call, with no arguments
+        """
+        self.due = due
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler:
+    def __init__(self, get_time=None):
+        """
+        Params:
+            get_time: a function returning the current time in milliseconds (defaults to
+                a monotonic clock; the game engine uses pygame.time.get_ticks)
+        """
+        self.get_time = get_time if get_time is not None else _get_monotonic_time
+        # A heap of (due, sequence number, Timer); the sequence number runs timers that
+        # are due at the same time in the order they were scheduled
+        self.timers = []
+        self.sequence = itertools.count()
+
+    def schedule(self, delay, callback):
+        """
+        Schedules callback to be called once delay milliseconds have passed.
+
+        Returns:
+            The Timer, which can be run early (see run_now) or cancelled
+        """
+        timer = Timer(self.get_time() + delay, callback)
+        heapq.heappush(self.timers, (timer.due, next(self.sequence), timer))
+        return timer
+
+    def run_due(self):
+        """
+        Calls every callback that has come due, in order. Callbacks may schedule more.
+        """
+        now = self.get_time()
+        while self.timers and self.timers[0][0] <= now:
+            (_, _, timer) = heapq.heappop(self.timers)
+            if not timer.cancelled:
+                timer.cancelled = True
+                timer.callback()
+
+    def run_now(self, timer):
+        """
+        Calls a pending timer's callback immediately instead of when it is due.
+        """
+        if not timer.cancelled:
+            timer.cancelled = True
+            timer.callback()
+
+    def clear(self):
+        """
+        Cancels every pending timer.
+        """
+        for (_, _, timer) in self.timers:
+            timer.cancelled = True
+        self.timers.clear()
+
+    def __len__(self):
+        return sum(1 for (_, _, timer) in self.timers if not timer.cancelled)
+
+
+def _get_monotonic_time():
+    return int(time.monotonic() * 1000)
@@ -0,0 +1,322 @@
+"""
+This file contains the round simulator, which plays large numbers of complete rounds
+of Triple Pocket Hold'em with the headless round engine (see round_engine.py) and a
+pluggable strategy, and adds up how the player fared.
+
+The rounds are split into shards of a fixed size. Each shard deals from its own random
+stream, addressed by the seed and the shard's index, so a shard plays exactly the same
+rounds whether it runs in a pool of processes, on its own process, or again later with
+simulate_shard -- which is how a single outlying shard can be debugged without
+re-running the whole job. The shards run across a pool of processes and their results
+are merged as they arrive; the merged totals are sums, so they do not depend on the
+order in which the shards finish.
+
+Every round can also be exported for analysis (see export.py): each worker writes the
+columns of its own shard, and the manifest is written once every shard has finished.
+"""
+
+import argparse
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from src.deck import Deck
+from src.export import EXPORT_FORMATS, RoundColumnBuilder, get_shard_name, write_manifest, write_shard
+import src.hand_evaluator as hand_evaluator
+from src.round_engine import RoundEngine, Strategy
+
+DEFAULT_ROUNDS_PER_SHARD = 100000
+# The player and the dealer are given enough chips that no wager is ever limited by
+# their balances; the engine starts a new game if either one runs out regardless.
+SIMULATION_STARTING_CHIPS = 10 ** 12
+
+
+class SimulationResult:
+    def __init__(
+        self,
+        rounds=0,
+        wins=0,
+        ties=0,
+        losses=0,
+        total_multiple=0,
+        total_squared_multiple=0,
+        total_payout=0,
+        pick_counts=(0, 0, 0),
+        player_hand_counts=None
+    ):
+        """
+        Params:
+            rounds: the number of rounds played
+            wins: the number of rounds the player won
+            ties: the number of rounds the player and the dealer tied
+            losses: the number of rounds the dealer won
+            total_multiple: the sum of the player's wager multiples over every round
+            total_squared_multiple: the sum of the squares of those multiples
+            total_payout: the number of chips the player won (or lost, if negative)
+            pick_counts: the number of rounds the player ended up with the first, second, and third pair
+            player_hand_counts: the number of rounds the player's best hand was each poker hand (e.g. 'flush')
+        """
+        self.rounds = rounds
+        self.wins = wins
+        self.ties = ties
+        self.losses = losses
+        self.total_multiple = total_multiple
+        self.total_squared_multiple = total_squared_multiple
+        self.total_payout = total_payout
+        self.pick_counts = tuple(pick_counts)
+        self.player_hand_counts = dict(player_hand_counts or {})
+
+        # Filled in by simulate once every shard has been played
+        self.seed = None
+        self.num_shards = 0
+        self.elapsed_seconds = 0.0
+
+    def add_round(self, result):
+        """
+        Adds a RoundResult (see round_engine.py) to the totals.
+        """
+        multiple = result.player_wager_multiple
+        self.rounds += 1
+        if multiple > 0:
+            self.wins += 1
+        elif multiple < 0:
+            self.losses += 1
+        else:
+            self.ties += 1
+        self.total_multiple += multiple
+        self.total_squared_multiple += multiple * multiple
+        self.total_payout += multiple * result.wager
+        pick_counts = list(self.pick_counts)
+        pick_counts[result.pick] += 1
+        self.pick_counts = tuple(pick_counts)
+        self.player_hand_counts[result.player_best_hand] = self.player_hand_counts.get(result.player_best_hand, 0) + 1
+
+    def win_probability(self):
+        return self.wins / self.rounds if self.rounds else 0.0
+
+    def tie_probability(self):
+        return self.ties / self.rounds if self.rounds else 0.0
+
+    def loss_probability(self):
+        return self.losses / self.rounds if self.rounds else 0.0
+
+    def expected_multiple(self):
+        """
+        Returns the average wager multiple for the player.
+        """
+        return self.total_multiple / self.rounds if self.rounds else 0.0
+
+    def standard_error(self):
+        """
+        Returns the standard error of the average wager multiple.
+        """
+        if not self.rounds:
+            return 0.0
+        mean = self.expected_multiple()
+        variance = self.total_squared_multiple / self.rounds - mean * mean
+        return math.sqrt(max(variance, 0.0) / self.rounds)
+
+    def rounds_per_second(self):
+        return self.rounds / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def __add__(self, other):
+        player_hand_counts = dict(self.player_hand_counts)
+        for (hand, count) in other.player_hand_counts.items():
+            player_hand_counts[hand] = player_hand_counts.get(hand, 0) + count
+        return SimulationResult(
+            self.rounds + other.rounds,
+            self.wins + other.wins,
+            self.ties + other.ties,
+            self.losses + other.losses,
+            self.total_multiple + other.total_multiple,
+            self.total_squared_multiple + other.total_squared_multiple,
+            self.total_payout + other.total_payout,
+            tuple(a + b for (a, b) in zip(self.pick_counts, other.pick_counts)),
+            player_hand_counts
+        )
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, SimulationResult)
+            and (self.rounds, self.wins, self.ties, self.losses) == (other.rounds, other.wins, other.ties, other.losses)
+            and (self.total_multiple, self.total_squared_multiple, self.total_payout)
+            == (other.total_multiple, other.total_squared_multiple, other.total_payout)
+            and self.pick_counts == other.pick_counts
+            and self.player_hand_counts == other.player_hand_counts
+        )
+
+    def __repr__(self):
+        return 'SimulationResult(rounds={}, wins={}, ties={}, losses={}, total_multiple={}, num_shards={})'.format(
+            self.rounds, self.wins, self.ties, self.losses, self.total_multiple, self.num_shards
+        )
+
+
+def simulate(
+    rounds,
+    strategy=None,
+    seed=None,
+    rounds_per_shard=DEFAULT_ROUNDS_PER_SHARD,
+    processes=None,
+    on_shard_complete=None,
+    export_directory=None,
+    export_format='npy'
+):
+    """
+    Plays rounds complete rounds across a pool of processes.
+
+    Params:
+        rounds: the number of rounds to play
+        strategy: the picklable Strategy that makes the player's decisions (defaults to
+            the base Strategy, which always picks up the first pair)
+        seed: the seed the shards' random streams are addressed from (a fresh seed is chosen if this is None)
+        rounds_per_shard: the number of rounds in each shard (the last shard may hold fewer)
+        processes: the number of worker processes (defaults to the number of CPUs);
+            1 plays every shard in the current process
+        on_shard_complete: if given, called as each shard finishes with the shard's index,
+            its SimulationResult, and the SimulationResult of every shard finished so far
+        export_directory: if given, the columns of every round are exported to this directory (see export.py)
+        export_format: the format of the exported shards (one of EXPORT_FORMATS in export.py)
+    Returns:
+        A SimulationResult, which also reports the seed used, the number of shards,
+        and the elapsed time
+    """
+    if strategy is None:
+        strategy = Strategy()
+    if rounds < 1 or rounds_per_shard < 1:
+        raise ValueError('Expected at least one round and one round per shard, got {} and {}'.format(
+            rounds, rounds_per_shard
+        ))
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError('Unknown export format {!r} (expected one of {})'.format(export_format, ', '.join(EXPORT_FORMATS)))
+    seed = np.random.SeedSequence(seed).entropy
+    num_shards = -(-rounds // rounds_per_shard)
+    export = (export_directory, export_format) if export_directory is not None else None
+    tasks = [
+        (seed, shard_index, min(rounds_per_shard, rounds - shard_index * rounds_per_shard), strategy, export)
+        for shard_index in range(num_shards)
+    ]
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    start_time = time.perf_counter()
+    result = SimulationResult()
+    if processes == 1:
+        for task in tasks:
+            shard_result = simulate_shard(task)
+            result += shard_result
+            if on_shard_complete is not None:
+                on_shard_complete(task[1], shard_result, result)
+    else:
+        with ProcessPoolExecutor(max_workers=min(processes, max(num_shards, 1))) as executor:
+            futures = {executor.submit(simulate_shard, task): task[1] for task in tasks}
+            for future in as_completed(futures):
+                shard_result = future.result()
+                result += shard_result
+                if on_shard_complete is not None:
+                    on_shard_complete(futures[future], shard_result, result)
+
+    if export is not None:
+        write_manifest(
+            export_directory,
+            [{'name': get_shard_name(task[1]), 'rounds': task[2]} for task in tasks],
+            export_format,
+            {'source': 'simulator', 'seed': seed, 'rounds_per_shard': rounds_per_shard}
+        )
+
+    result.seed = seed
+    result.num_shards = num_shards
+    result.elapsed_seconds = time.perf_counter() - start_time
+    return result
+
+
+def simulate_shard(task):
+    """
+    Plays the rounds of one shard. This runs in the worker processes, so it takes a single
+    picklable tuple. Calling it again with the same task replays exactly the same rounds.
+
+    Params:
+        task: a tuple of the simulation's seed, the shard's index, the number of rounds
+            in the shard, the Strategy, and either None or the directory and format to
+            export the shard's rounds to
+    Returns:
+        A SimulationResult for the shard
+    """
+    (seed, shard_index, rounds, strategy, export) = task
+    rng = get_shard_rng(seed, shard_index)
+    round_engine = RoundEngine(strategy, SIMULATION_STARTING_CHIPS, hand_evaluator.determine_outcome_from_table)
+    deck = Deck(rng=rng)
+
+    columns = RoundColumnBuilder() if export is not None else None
+    result = SimulationResult()
+    for _ in range(rounds):
+        if round_engine.is_game_over():
+            round_engine.new_game()
+        deck.reset()
+        round_result = round_engine.play_round(deck)
+        result.add_round(round_result)
+        if columns is not None:
+            columns.add_round(round_result)
+
+    if export is not None:
+        (export_directory, export_format) = export
+        write_shard(export_directory, get_shard_name(shard_index), columns.get_columns(), export_format)
+    return result
+
+
+def get_shard_rng(seed, shard_index):
+    """
+    Returns the random stream of a shard, which depends only on the seed and the shard's index.
+    """
+    shard_seed = np.random.SeedSequence(seed, spawn_key=(shard_index,))
+    return random.Random(int.from_bytes(shard_seed.generate_state(4).tobytes(), 'little'))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Simulate rounds of Triple Pocket Hold\'em.')
+    parser.add_argument('--rounds', type=int, default=1000000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--rounds-per-shard', type=int, default=DEFAULT_ROUNDS_PER_SHARD)
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--strategy-table', action='store_true', help='play with the solved strategy table')
+    parser.add_argument('--shard', type=int, default=None, help='only replay the shard with this index (needs --seed)')
+    parser.add_argument('--export', default=None, help='export the columns of every round to this directory')
+    parser.add_argument('--export-format', choices=EXPORT_FORMATS, default='npy')
+    arguments = parser.parse_args()
+
+    strategy = Strategy()
+    if arguments.strategy_table:
+        from src.strategy import TableStrategy, load_strategy_table
+        strategy = TableStrategy(load_strategy_table())
+
+    if arguments.shard is not None:
+        if arguments.seed is None:
+            parser.error('--shard needs the --seed of the simulation')
+        first_round = arguments.shard * arguments.rounds_per_shard
+        shard_rounds = min(arguments.rounds_per_shard, arguments.rounds - first_round)
+        export = (arguments.export, arguments.export_format) if arguments.export else None
+        print(simulate_shard((arguments.seed, arguments.shard, shard_rounds, strategy, export)))
+    else:
+        def report(shard_index, shard_result, result):
+            print('shard {}: {:.4f} per round ({} rounds so far)'.format(
+                shard_index, shard_result.expected_multiple(), result.rounds
+            ))
+
+        result = simulate(
+            arguments.rounds,
+            strategy,
+            arguments.seed,
+            arguments.rounds_per_shard,
+            arguments.processes,
+            report,
+            arguments.export,
+            arguments.export_format
+        )
+        print(result)
+        print('seed {}: {:.4f} +/- {:.4f} per round, {:,.0f} rounds/sec'.format(
+            result.seed, result.expected_multiple(), result.standard_error(), result.rounds_per_second()
+        ))
@@ -0,0 +1,406 @@
+"""
+This file specifies the strategy table, which holds the pick-or-pass decision that
+maximizes the player's expected wager multiple for every pair of pocket cards the
+player can be shown (see GameEngine.select_cards).
+
+There are two decisions:
+1) The first pair. If the player picks it up, the dealer receives two unknown pairs.
+   If the player passes, the pair goes to the dealer and a second pair is shown.
+2) The second pair, shown after the first pair was passed to the dealer. If the player
+   picks it up, the dealer receives one more unknown pair. If the player passes, the
+   player is dealt an unknown third pair and the dealer holds the first two.
+
+The table is solved offline (see solve_strategy_table). Each situation that is the same
+up to a permutation of the suites (see canonical.py) is only solved once: its expected multiples are
+estimated by playing out random deals with the batch evaluator, and the decision
+is copied to every permutation. The decisions are stored directly indexed by pair, so
+looking one up takes a couple of index computations.
+"""
+
+import argparse
+import math
+import operator
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.canonical import canonicalize_batch
+from src.deck import draw_cards_from_decks
+from src.hand_evaluator import determine_outcome_batch
+from src.round_engine import Strategy
+
+STRATEGY_TABLE_VERSION = 1
+STRATEGY_TABLE_MAGIC = b'TPST'
+
+# magic, version, number of bytes of first-pair decisions, number of bytes of second-pair decisions
+HEADER_FORMAT = '<4sIII'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+table_directory = os.path.join(os.path.dirname(__file__), '../tables/')
+
+DEFAULT_SOLVER_TRIALS = 2000
+# The number of deals each solver task plays out at once
+SOLVER_BATCH_SIZE = 200000
+
+# Every pair of distinct cards (in integer form) has an index from 0 to 1325.
+NUM_PAIRS = 1326
+# The number of pairs that share no card with a given pair, i.e. the second pairs that can follow it
+NUM_SECOND_PAIRS = math.comb(50, 2)
+PAIR_CARDS = tuple((low, high) for high in range(52) for low in range(high))
+PAIR_INDEXES = [-1] * (52 * 52)
+for pair_index, (low, high) in enumerate(PAIR_CARDS):
+    PAIR_INDEXES[low * 52 + high] = pair_index
+    PAIR_INDEXES[high * 52 + low] = pair_index
+
+class StrategyTable:
+    def __init__(self, first_decisions, second_decisions):
+        """
+        Params:
+            first_decisions: one byte per pair index, 1 if the player should pick up
+                that pair when it is shown first
+            second_decisions: a bit per (first pair index * NUM_PAIRS + second pair index),
+                1 if the player should pick up the second pair after passing the first
+        """
+        self.first_decisions = bytes(first_decisions)
+        self.second_decisions = bytes(second_decisions)
+
+    def should_accept_first_hand(self, hand):
+        """
+        Returns true if the player should pick up the first pair of pocket cards shown.
+        """
+        return self.first_decisions[get_pair_index(hand)] == 1
+
+    def should_accept_second_hand(self, first_hand, second_hand):
+        """
+        Returns true if the player should pick up the second pair of pocket cards shown,
+        having passed the first pair to the dealer.
+        """
+        index = get_pair_index(first_hand) * NUM_PAIRS + get_pair_index(second_hand)
+        return (self.second_decisions[index >> 3] >> (index & 7)) & 1 == 1
+
+    def should_accept(self, hand, rejected_hands=()):
+        """
+        Returns true if the player should pick up hand, given the pairs the player
+        has already passed to the dealer in this round.
+        """
+        if not rejected_hands:
+            return self.should_accept_first_hand(hand)
+        return self.should_accept_second_hand(rejected_hands[0], hand)
+
+
+class TableStrategy(Strategy):
+    def __init__(self, table):
+        """
+        A strategy for the round engine (see round_engine.py) that picks up or passes
+        each pair as the strategy table says.
+
+        Params:
+            table: a StrategyTable
+        """
+        self.table = table
+
+    def pick_up(self, hand, rejected_hands):
+        return self.table.should_accept(hand, rejected_hands)
+
+
+def get_pair_index(hand):
+    """
+    Returns the index (0-1325) of a pair of cards given in either form.
+    """
+    return PAIR_INDEXES[operator.index(hand[0]) * 52 + operator.index(hand[1])]
+
+
+def get_strategy_table_path(directory=None):
+    """
+    Returns the path of the strategy table file for the current table version.
+    """
+    if directory is None:
+        directory = table_directory
+    return os.path.join(directory, 'strategy_table_v{}.bin'.format(STRATEGY_TABLE_VERSION))
+
+
+def load_strategy_table(path=None):
+    """
+    Loads the strategy table saved at path. Unlike the rank table, the strategy table
+    is too slow to build on demand, so a missing table raises an error.
+
+    Params:
+        path: the location of the table file (defaults to the versioned file in table_directory)
+    Returns:
+        A StrategyTable
+    """
+    if path is None:
+        path = get_strategy_table_path()
+
+    with open(path, 'rb') as table_file:
+        data = table_file.read()
+
+    if len(data) < HEADER_SIZE:
+        raise ValueError('{} is not a strategy table'.format(path))
+    magic, version, first_size, second_size = struct.unpack_from(HEADER_FORMAT, data)
+    if (
+        magic != STRATEGY_TABLE_MAGIC
+        or version != STRATEGY_TABLE_VERSION
+        or len(data) != HEADER_SIZE + first_size + second_size
+    ):
+        raise ValueError('{} is not a version {} strategy table'.format(path, STRATEGY_TABLE_VERSION))
+
+    second_start = HEADER_SIZE + first_size
+    return StrategyTable(data[HEADER_SIZE:second_start], data[second_start:])
+
+
+def save_strategy_table(table, path=None):
+    """
+    Writes the table to path under a temporary name and then moves it into place.
+    """
+    if path is None:
+        path = get_strategy_table_path()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    temporary_path = '{}.{}.tmp'.format(path, os.getpid())
+    with open(temporary_path, 'wb') as table_file:
+        table_file.write(struct.pack(
+            HEADER_FORMAT,
+            STRATEGY_TABLE_MAGIC,
+            STRATEGY_TABLE_VERSION,
+            len(table.first_decisions),
+            len(table.second_decisions)
+        ))
+        table_file.write(table.first_decisions)
+        table_file.write(table.second_decisions)
+    os.replace(temporary_path, path)
+
+
+def solve_strategy_table(trials=DEFAULT_SOLVER_TRIALS, seed=0, processes=None):
+    """
+    Solves for the decisions that maximize the player's expected wager multiple.
+
+    For every second-pair situation, the expected multiples of picking up and passing
+    are each estimated from trials random deals. Both estimates share the same deals
+    (the next pair and the community cards), so their difference is estimated more
+    precisely than either one alone.
+    Passing the first pair is worth the average, over every second pair, of the
+    second-pair decision that is made. The decisions are made on one set of deals and
+    valued on a second, independent set: the better of two noisy estimates is too high
+    on average, which would make passing the first pair look better than it is.
+    Picking up the first pair is estimated from trials random deals per possible second
+    pair, so both sides of the first decision rest on the same number of deals.
+
+    Params:
+        trials: the number of random deals per situation
+        seed: the seed for the random streams of the solver tasks
+        processes: the number of worker processes (defaults to the number of CPUs)
+    Returns:
+        A StrategyTable
+    """
+    (first_representatives, first_classes) = find_first_hand_classes()
+    (second_representatives, second_classes) = find_second_hand_classes()
+
+    # The second-pair tasks run twice, on independent deals: once to make the decisions and once to value them
+    second_tasks = _split_into_tasks(second_representatives, trials, 'second')
+    first_tasks = _split_into_tasks(first_representatives, trials * NUM_SECOND_PAIRS, 'first')
+    tasks = second_tasks + second_tasks + first_tasks
+    seeds = np.random.SeedSequence(seed).spawn(len(tasks))
+    tasks = [task + (task_seed,) for task, task_seed in zip(tasks, seeds)]
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes == 1:
+        results = list(map(estimate_expected_multiples, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = list(executor.map(estimate_expected_multiples, tasks))
+
+    (deciding_results, valuing_results, first_results) = (
+        results[:len(second_tasks)],
+        results[len(second_tasks):2 * len(second_tasks)],
+        results[2 * len(second_tasks):]
+    )
+    return get_strategy_table(
+        np.concatenate([result[0] for result in first_results]),
+        tuple(np.concatenate([result[i] for result in deciding_results]) for i in (0, 1)),
+        tuple(np.concatenate([result[i] for result in valuing_results]) for i in (0, 1)),
+        first_classes,
+        second_classes
+    )
+
+
+def get_strategy_table(accept_first, deciding_second, valuing_second, first_classes, second_classes):
+    """
+    Makes every decision from the solver's estimates (see solve_strategy_table).
+
+    Params:
+        accept_first: the expected multiples of picking up the first pair, by class of first pair
+        deciding_second: the expected multiples of picking up and of passing the second pair,
+            by class of second-pair situation, which make the second-pair decisions
+        valuing_second: the same expected multiples estimated from independent deals, which
+            value the decisions made
+        first_classes: the class of every first pair (see find_first_hand_classes)
+        second_classes: the class of every second-pair situation (see find_second_hand_classes)
+    Returns:
+        A StrategyTable
+    """
+    (second_decisions, reject_first) = get_second_pair_decisions(deciding_second, valuing_second, second_classes)
+    first_decisions = accept_first[first_classes] >= reject_first
+
+    return StrategyTable(
+        first_decisions.astype(np.uint8).tobytes(),
+        np.packbits(second_decisions, bitorder='little').tobytes()
+    )
+
+
+def get_second_pair_decisions(deciding_second, valuing_second, second_classes):
+    """
+    Makes the second-pair decision of every situation, and values passing each first pair.
+
+    Params:
+        deciding_second, valuing_second: see get_strategy_table
+        second_classes: the class of every second-pair situation (see find_second_hand_classes)
+    Returns:
+        A boolean array of the decisions to pick up the second pair, indexed by
+        first pair index * NUM_PAIRS + second pair index (false where the pairs share a card),
+        and an array of the expected multiple of passing each first pair, i.e. the mean over
+        its NUM_SECOND_PAIRS second pairs of the value of the decision made
+    """
+    (accept_second, reject_second) = deciding_second
+    is_situation = second_classes >= 0
+    situation_classes = np.where(is_situation, second_classes, 0)
+    class_decisions = accept_second >= reject_second
+    second_decisions = class_decisions[situation_classes] & is_situation
+    class_values = np.where(class_decisions, valuing_second[0], valuing_second[1])
+    second_values = np.where(is_situation, class_values[situation_classes], 0.0)
+    reject_first = second_values.reshape(NUM_PAIRS, NUM_PAIRS).sum(axis=1) / NUM_SECOND_PAIRS
+    return (second_decisions, reject_first)
+
+
+def find_first_hand_classes():
+    """
+    Groups the pairs that are the same up to a permutation of the suites.
+
+    Returns:
+        1) an array holding the index of one pair from each group
+        2) an array holding the group of each pair index
+    """
+    (canonical_pairs, _) = canonicalize_batch(np.array(PAIR_CARDS), (2,))
+    canonical_indexes = _get_pair_indexes(canonical_pairs)
+    (representatives, classes) = np.unique(canonical_indexes, return_inverse=True)
+    return (representatives.astype(np.int32), classes.astype(np.int32))
+
+
+def find_second_hand_classes():
+    """
+    Groups the second-pair situations (a first pair passed to the dealer, followed by a
+    second pair that shares no card with it) that are the same up to a permutation
+    of the suites.
+
+    Returns:
+        1) an (N, 2) array holding the first and second pair indexes of one situation from each group
+        2) an array holding the group of each situation, indexed by
+           first pair index * NUM_PAIRS + second pair index (-1 where the pairs share a card)
+    """
+    pair_cards = np.array(PAIR_CARDS)
+    (firsts, seconds) = np.divmod(np.arange(NUM_PAIRS * NUM_PAIRS), NUM_PAIRS)
+    situation_cards = np.hstack((pair_cards[firsts], pair_cards[seconds]))
+    is_situation = (situation_cards[:, :2, np.newaxis] != situation_cards[:, np.newaxis, 2:]).all(axis=(1, 2))
+
+    (canonical_cards, _) = canonicalize_batch(situation_cards[is_situation], (2, 2))
+    canonical_situations = (
+        _get_pair_indexes(canonical_cards[:, :2]) * NUM_PAIRS + _get_pair_indexes(canonical_cards[:, 2:])
+    )
+    (representatives, situation_classes) = np.unique(canonical_situations, return_inverse=True)
+
+    classes = np.full(NUM_PAIRS * NUM_PAIRS, -1, dtype=np.int32)
+    classes[is_situation] = situation_classes
+    return (np.stack(np.divmod(representatives, NUM_PAIRS), axis=1).astype(np.int32), classes)
+
+
+def estimate_expected_multiples(task):
+    """
+    Estimates the expected wager multiples for a group of situations. This runs in the
+    worker processes, so it takes a single picklable tuple.
+
+    Params:
+        task: a tuple of the kind of situation ('first' or 'second'), an array of the
+            situations (pair indexes, see the find_*_classes functions), the number of
+            random deals per situation, and the task's SeedSequence
+    Returns:
+        For 'first' situations, a one-element tuple holding the expected multiples of picking
+        up the first pair. For 'second' situations, the expected multiples of picking up and
+        of passing the second pair.
+    """
+    (kind, situations, trials, task_seed) = task
+    rng = np.random.default_rng(task_seed)
+    pair_cards = np.array(PAIR_CARDS, dtype=np.int8)
+
+    if kind == 'first':
+        first_hands = pair_cards[situations]
+        decks = _get_remaining_cards(first_hands)
+        totals = np.zeros(len(situations))
+        for start in range(0, trials, SOLVER_BATCH_SIZE):
+            batch_trials = min(SOLVER_BATCH_SIZE, trials - start)
+            drawn_cards = draw_cards_from_decks(rng, np.repeat(decks, batch_trials, axis=0), 9)
+            (_, _, multiples, _) = determine_outcome_batch(
+                np.repeat(first_hands, batch_trials, axis=0),
+                drawn_cards[:, 0:2],
+                drawn_cards[:, 2:4],
+                drawn_cards[:, 4:9]
+            )
+            totals += multiples.reshape(len(situations), batch_trials).sum(axis=1)
+        return (totals / trials,)
+
+    first_hands = np.repeat(pair_cards[situations[:, 0]], trials, axis=0)
+    second_hands = np.repeat(pair_cards[situations[:, 1]], trials, axis=0)
+    decks = np.repeat(_get_remaining_cards(np.hstack((pair_cards[situations[:, 0]], pair_cards[situations[:, 1]]))), trials, axis=0)
+    drawn_cards = draw_cards_from_decks(rng, decks, 7)
+
+    (_, _, accept_multiples, _) = determine_outcome_batch(second_hands, first_hands, drawn_cards[:, 0:2], drawn_cards[:, 2:7])
+    (_, _, reject_multiples, _) = determine_outcome_batch(drawn_cards[:, 0:2], first_hands, second_hands, drawn_cards[:, 2:7])
+    return (
+        accept_multiples.reshape(len(situations), trials).mean(axis=1),
+        reject_multiples.reshape(len(situations), trials).mean(axis=1)
+    )
+
+
+def _get_remaining_cards(dead_cards):
+    """
+    Given an (N, k) array of dead cards, returns an (N, 52 - k) array of the cards left in each deck.
+    """
+    in_deck = np.ones((len(dead_cards), 52), dtype=bool)
+    in_deck[np.arange(len(dead_cards))[:, np.newaxis], dead_cards] = False
+    return np.nonzero(in_deck)[1].astype(np.int8).reshape(len(dead_cards), -1)
+
+
+def _get_pair_indexes(pairs):
+    """
+    Given an (N, 2) array of pairs of distinct cards, returns an array of their pair indexes.
+    """
+    low = np.minimum(pairs[:, 0], pairs[:, 1]).astype(np.int64)
+    high = np.maximum(pairs[:, 0], pairs[:, 1]).astype(np.int64)
+    return high * (high - 1) // 2 + low
+
+
+def _split_into_tasks(situations, trials, kind):
+    """
+    Splits situations into solver tasks of roughly SOLVER_BATCH_SIZE deals each.
+    """
+    situations_per_task = max(1, SOLVER_BATCH_SIZE // trials)
+    return [
+        (kind, situations[start:start + situations_per_task], trials)
+        for start in range(0, len(situations), situations_per_task)
+    ]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Solve and save the pick-or-pass strategy table.')
+    parser.add_argument('--trials', type=int, default=DEFAULT_SOLVER_TRIALS, help='random deals per situation')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--output', default=None, help='where to save the table')
+    arguments = parser.parse_args()
+
+    save_strategy_table(
+        solve_strategy_table(arguments.trials, arguments.seed, arguments.processes),
+        arguments.output
+    )
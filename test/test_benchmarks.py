@@ -0,0 +1,44 @@
+import unittest
+
+import src.hand_evaluator as poker
+from benchmarks.run_benchmarks import TIE_BREAKERS, build_corpus, find_slowdowns, get_tie_pairs, run_benchmarks
+from src.card import Card
+
+
+class BenchmarkTest(unittest.TestCase):
+    def test_corpus_is_seeded(self):
+        self.assertEqual(build_corpus(5, 50), build_corpus(5, 50))
+        self.assertNotEqual(build_corpus(5, 50), build_corpus(6, 50))
+
+    def test_run_benchmarks(self):
+        results = run_benchmarks(seed=2, corpus_size=20, min_seconds=0, names=['is_pair', 'headless_round'])
+
+        self.assertEqual(set(results['benchmarks']), {'is_pair', 'headless_round'})
+        for result in results['benchmarks'].values():
+            self.assertGreater(result['ops_per_second'], 0)
+            self.assertLessEqual(result['p50_microseconds'], result['p99_microseconds'])
+
+    def test_tie_pairs_share_a_ranking(self):
+        corpus = build_corpus(3, 300)
+        hands = [tuple(poker.find_best_hand(deal[0:2], deal[6:11])[1]) for deal in corpus]
+        tie_pairs = get_tie_pairs(hands)
+
+        self.assertEqual(sum(len(pairs) for pairs in tie_pairs.values()), len(hands))
+        for (name, hand_names) in TIE_BREAKERS.items():
+            rankings = {poker.hand_ranking[hand_name] for hand_name in hand_names}
+            for (hand_one, hand_two) in tie_pairs[name]:
+                self.assertIn(poker.get_best_possible_ranking(hand_one), rankings)
+                self.assertEqual(poker.get_best_possible_ranking(hand_one), poker.get_best_possible_ranking(hand_two))
+
+        # The only hand of its ranking is paired with itself
+        four_of_a_kind = tuple(Card(suite, 9) for suite in ('diamonds', 'hearts', 'spades', 'clubs')) + (Card('clubs', 2),)
+        self.assertEqual(get_tie_pairs([four_of_a_kind])['break_tie_four_of_a_kind'], [(four_of_a_kind, four_of_a_kind)])
+
+    def test_find_slowdowns(self):
+        baseline = {'benchmarks': {'fast': {'ops_per_second': 100.0}, 'slow': {'ops_per_second': 100.0}}}
+        results = {'benchmarks': {
+            'fast': {'ops_per_second': 95.0},
+            'slow': {'ops_per_second': 80.0},
+            'new': {'ops_per_second': 1.0}
+        }}
+        self.assertEqual(find_slowdowns(results, baseline, threshold=0.1), [('slow', 100.0, 80.0)])
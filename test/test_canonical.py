@@ -0,0 +1,80 @@
+import itertools
+import random
+import unittest
+
+import numpy as np
+
+import src.hand_evaluator as poker
+from src.canonical import (
+    apply_permutation, canonicalize, canonicalize_batch, get_canonical_key, invert_permutation
+)
+from src.card import Card
+
+
+def permute_suites(cards, permutation):
+    return tuple((card & ~3) | permutation[card & 3] for card in cards)
+
+
+class CanonicalTest(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(11)
+
+    def deal_situation(self):
+        cards = self.rng.sample(range(52), 11)
+        return (tuple(cards[0:2]), tuple(cards[2:4]), tuple(cards[4:6]), tuple(cards[6:11]))
+
+    def test_isomorphic_situations_share_a_key(self):
+        for _ in range(200):
+            situation = self.deal_situation()
+            key = get_canonical_key(*situation)
+            for permutation in itertools.permutations(range(4)):
+                permuted_situation = [permute_suites(group, permutation) for group in situation]
+                self.assertEqual(get_canonical_key(*permuted_situation), key)
+                # Neither the order of cards within a group nor the card form matters
+                reordered_situation = [tuple(reversed(group)) for group in permuted_situation]
+                self.assertEqual(get_canonical_key(*reordered_situation), key)
+
+        self.assertEqual(
+            get_canonical_key((Card('spades', 14), Card('hearts', 13))),
+            get_canonical_key((Card('clubs', 14), Card('diamonds', 13)))
+        )
+
+    def test_different_situations_have_different_keys(self):
+        suited = (Card('spades', 14), Card('spades', 13))
+        offsuit = (Card('spades', 14), Card('hearts', 13))
+        self.assertNotEqual(get_canonical_key(suited), get_canonical_key(offsuit))
+        # The order of the groups matters
+        self.assertNotEqual(get_canonical_key(suited, offsuit), get_canonical_key(offsuit, suited))
+
+    def test_permutation(self):
+        for _ in range(100):
+            situation = self.deal_situation()
+            (canonical_groups, permutation) = canonicalize(*situation)
+            self.assertEqual(sorted(permutation), [0, 1, 2, 3])
+            for group, canonical_group in zip(situation, canonical_groups):
+                self.assertEqual(tuple(sorted(apply_permutation(group, permutation))), canonical_group)
+                self.assertEqual(
+                    sorted(apply_permutation(canonical_group, invert_permutation(permutation))),
+                    sorted(group)
+                )
+
+    def test_outcome_is_invariant(self):
+        for _ in range(50):
+            situation = self.deal_situation()
+            (canonical_groups, _) = canonicalize(*situation)
+            (_, _, multiple, _) = poker.determine_outcome(*situation)
+            (_, _, canonical_multiple, _) = poker.determine_outcome(*canonical_groups)
+            self.assertEqual(canonical_multiple, multiple)
+
+    def test_batch_matches_canonicalize(self):
+        situations = [self.deal_situation() for _ in range(300)]
+        cards = np.array([sum(situation, ()) for situation in situations])
+        (canonical_cards, permutations) = canonicalize_batch(cards, (2, 2, 2, 5))
+
+        for situation, row, permutation in zip(situations, canonical_cards, permutations):
+            (canonical_groups, expected_permutation) = canonicalize(*situation)
+            self.assertEqual(tuple(row.tolist()), sum(canonical_groups, ()))
+            self.assertEqual(tuple(permutation.tolist()), expected_permutation)
+
+        with self.assertRaises(ValueError):
+            canonicalize_batch(cards, (2, 2, 2))
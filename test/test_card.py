@@ -0,0 +1,130 @@
+import pickle
+import random
+import unittest
+
+import numpy as np
+
+import src.hand_evaluator as poker
+from src.card import CARDS, Card, card_from_int, card_to_int, get_img_path, to_cards, to_ints
+from src.deck import ROUND_COMMUNITY_COLUMNS, ROUND_HAND_COLUMNS, Deck, deal_rounds
+import src.deck as deck_module
+
+
+class CardTest(unittest.TestCase):
+    def test_cards_are_shared(self):
+        self.assertIs(Card('spades', 14), Card('spades', 14))
+        self.assertIs(pickle.loads(pickle.dumps(Card('hearts', 2))), Card('hearts', 2))
+        self.assertEqual(len(set(map(id, CARDS))), 52)
+
+    def test_integer_form(self):
+        for card in range(52):
+            self.assertEqual(card_to_int(CARDS[card].suite, CARDS[card].value), card)
+            self.assertEqual(int(card_from_int(card)), card)
+            self.assertEqual(CARDS[card].value, (card >> 2) + 2)
+        self.assertEqual(to_ints(to_cards((0, 51))), (0, 51))
+        self.assertEqual(get_img_path(Card('clubs', 12)), 'cards/queen_of_clubs.png')
+        self.assertEqual(get_img_path(int(Card('clubs', 12))), Card('clubs', 12).img_path)
+
+    def test_cards_have_no_instance_dict(self):
+        with self.assertRaises(AttributeError):
+            Card('spades', 2).color = 'black'
+
+    def test_cards_are_immutable(self):
+        card = Card('spades', 2)
+        for name in ('suite', 'value', 'index'):
+            with self.assertRaises(AttributeError):
+                setattr(card, name, 3)
+            with self.assertRaises(AttributeError):
+                delattr(card, name)
+        self.assertEqual((card.suite, card.value, card.index), ('spades', 2, 2))
+
+    def test_decks(self):
+        self.assertEqual(sorted(map(int, Deck().cards)), list(range(52)))
+        self.assertEqual(sorted(Deck(integer_cards=True).cards), list(range(52)))
+
+    def test_deck_draws_and_resets(self):
+        deck = Deck(integer_cards=True, rng=random.Random(5))
+        cards = deck.cards
+        drawn = deck.draw_two_card_hand() + deck.draw_five_community_cards()
+        self.assertEqual(len(set(drawn)), 7)
+        self.assertEqual(len(deck), 45)
+        self.assertTrue(set(drawn).isdisjoint(deck.cards[:len(deck)]))
+
+        deck.reset()
+        self.assertIs(deck.cards, cards)
+        self.assertEqual(len(deck), 52)
+        self.assertEqual(sorted(deck.draw() for _ in range(52)), list(range(52)))
+        with self.assertRaises(IndexError):
+            deck.draw()
+
+    def test_decks_with_the_same_seed_draw_the_same_cards(self):
+        first_deck = Deck(rng=random.Random(3))
+        second_deck = Deck(rng=random.Random(3))
+        for _ in range(3):
+            self.assertEqual(
+                [first_deck.draw_two_card_hand() for _ in range(3)],
+                [second_deck.draw_two_card_hand() for _ in range(3)]
+            )
+            first_deck.reset()
+            second_deck.reset()
+
+    def test_deck_draws_are_uniform(self):
+        deck = Deck(integer_cards=True, rng=random.Random(11))
+        counts = [0] * 52
+        for _ in range(5200):
+            deck.reset()
+            counts[deck.draw_two_card_hand()[1]] += 1
+        self.assertLess(max(counts), 160)
+        self.assertGreater(min(counts), 50)
+
+    def test_deal_rounds(self):
+        rounds = deal_rounds(3000, seed=4)
+
+        self.assertEqual(rounds.shape, (3000, 11))
+        self.assertEqual(rounds.dtype, np.uint8)
+        self.assertTrue((rounds < 52).all())
+        self.assertTrue((np.sort(rounds, axis=1)[:, 1:] != np.sort(rounds, axis=1)[:, :-1]).all())
+        self.assertTrue(np.array_equal(rounds, deal_rounds(3000, seed=4)))
+        self.assertFalse(np.array_equal(rounds, deal_rounds(3000, seed=5)))
+        # Every card is dealt in every position about equally often
+        counts = np.stack([np.bincount(column, minlength=52) for column in rounds.T])
+        self.assertGreater(counts.min(), 20)
+        self.assertLess(counts.max(), 110)
+
+    def test_deal_rounds_in_chunks(self):
+        original_chunk_size = deck_module.DEAL_CHUNK_SIZE
+        deck_module.DEAL_CHUNK_SIZE = 7
+        try:
+            rounds = deal_rounds(30, seed=2)
+        finally:
+            deck_module.DEAL_CHUNK_SIZE = original_chunk_size
+        self.assertEqual(rounds.shape, (30, 11))
+        self.assertTrue(all(len(set(row)) == 11 for row in rounds.tolist()))
+        self.assertEqual(deal_rounds(0).shape, (0, 11))
+
+    def test_dealt_rounds_feed_the_batch_evaluator(self):
+        rounds = deal_rounds(200, seed=8)
+        (player_hands, dealer_hands_one, dealer_hands_two) = (rounds[:, columns] for columns in ROUND_HAND_COLUMNS)
+        outcomes = poker.determine_outcome_batch(
+            player_hands, dealer_hands_one, dealer_hands_two, rounds[:, ROUND_COMMUNITY_COLUMNS]
+        )
+        for (i, row) in enumerate(rounds.tolist()):
+            (_, _, player_multiple, dealer_multiple) = poker.determine_outcome_from_table(
+                row[0:2], row[2:4], row[4:6], row[6:11]
+            )
+            self.assertEqual((outcomes[2][i], outcomes[3][i]), (player_multiple, dealer_multiple))
+
+    def test_determine_outcome_on_integers(self):
+        random.seed(99)
+        for _ in range(100):
+            deck = Deck(integer_cards=True)
+            hands = (deck.draw_two_card_hand(), deck.draw_two_card_hand(), deck.draw_two_card_hand())
+            community_cards = deck.draw_five_community_cards()
+
+            outcome = poker.determine_outcome(*hands, community_cards)
+            self.assertEqual(outcome, poker.determine_outcome(*map(to_cards, hands), to_cards(community_cards)))
+            self.assertEqual(outcome, poker.determine_outcome_from_table(*hands, community_cards))
+
+
+if __name__ == '__main__':
+    unittest.main()
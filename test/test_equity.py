@@ -0,0 +1,108 @@
+import itertools
+import unittest
+
+import numpy as np
+
+import src.hand_evaluator as poker
+from src.card import Card, to_ints
+from src.equity import calculate_exact_outcome, draw_cards, estimate_outcome, score_boards_starting_with
+
+
+class ExactOutcomeTest(unittest.TestCase):
+    def setUp(self):
+        self.player_hand = (Card('spades', 14), Card('hearts', 14))
+        self.dealer_hand_one = (Card('clubs', 7), Card('diamonds', 2))
+        self.dealer_hand_two = (Card('spades', 9), Card('spades', 8))
+
+    def test_enumerates_every_board(self):
+        outcome = calculate_exact_outcome(self.player_hand, self.dealer_hand_one, self.dealer_hand_two, processes=2)
+
+        self.assertEqual(outcome.num_boards, 1370754)
+        self.assertEqual(outcome.wins + outcome.ties + outcome.losses, outcome.num_boards)
+        self.assertEqual(outcome.win_probability() + outcome.tie_probability() + outcome.loss_probability(), 1)
+        self.assertGreater(outcome.win_probability(), outcome.loss_probability())
+
+    def test_matches_determine_outcome(self):
+        pocket_cards = tuple(map(to_ints, (self.player_hand, self.dealer_hand_one, self.dealer_hand_two)))
+        dead_cards = set(itertools.chain.from_iterable(pocket_cards))
+        remaining_cards = tuple(card for card in range(52) if card not in dead_cards)
+
+        for first_card_index in range(36, 42):
+            outcome = score_boards_starting_with((pocket_cards, remaining_cards, first_card_index))
+
+            expected_multiples = []
+            for later_cards in itertools.combinations(remaining_cards[first_card_index + 1:], 4):
+                community_cards = (remaining_cards[first_card_index],) + later_cards
+                (_, _, multiple, _) = poker.determine_outcome(*pocket_cards, community_cards)
+                expected_multiples.append(multiple)
+
+            self.assertEqual(outcome.num_boards, len(expected_multiples))
+            self.assertEqual(outcome.wins, sum(multiple > 0 for multiple in expected_multiples))
+            self.assertEqual(outcome.losses, sum(multiple < 0 for multiple in expected_multiples))
+            self.assertEqual(outcome.total_multiple, sum(expected_multiples))
+
+    def test_needs_distinct_cards(self):
+        for hands in (
+            (self.player_hand, self.player_hand, self.dealer_hand_two),
+            (self.player_hand, self.dealer_hand_one, (self.dealer_hand_two[0], self.player_hand[1])),
+            (self.player_hand, self.dealer_hand_one, (self.dealer_hand_two[0], 52)),
+            (self.player_hand, self.dealer_hand_one, self.dealer_hand_two[:1])
+        ):
+            with self.assertRaises(ValueError):
+                calculate_exact_outcome(*hands, processes=1)
+
+
+class MonteCarloOutcomeTest(unittest.TestCase):
+    def setUp(self):
+        self.player_hand = (Card('spades', 14), Card('hearts', 14))
+        self.dealer_hands = ((Card('clubs', 7), Card('diamonds', 2)), (Card('spades', 9), Card('spades', 8)))
+
+    def test_reproducible(self):
+        outcome_one = estimate_outcome(self.player_hand, trials=50000, seed=7, shards=5, processes=1)
+        outcome_two = estimate_outcome(self.player_hand, trials=50000, seed=7, shards=5, processes=2)
+
+        self.assertEqual(outcome_one.trials, 50000)
+        self.assertEqual(outcome_one.num_shards, 5)
+        self.assertEqual(outcome_one.seed, 7)
+        self.assertGreater(outcome_one.trials_per_second(), 0)
+        for attribute in ('wins', 'ties', 'losses', 'total_multiple', 'total_squared_multiple'):
+            self.assertEqual(getattr(outcome_one, attribute), getattr(outcome_two, attribute))
+
+    def test_matches_exact_outcome(self):
+        exact_outcome = calculate_exact_outcome(self.player_hand, *self.dealer_hands, processes=1)
+        estimated_outcome = estimate_outcome(self.player_hand, self.dealer_hands, trials=200000, seed=11, processes=1)
+
+        self.assertLess(
+            abs(estimated_outcome.expected_multiple() - float(exact_outcome.expected_multiple())),
+            5 * estimated_outcome.standard_error()
+        )
+        self.assertAlmostEqual(estimated_outcome.win_probability(), float(exact_outcome.win_probability()), delta=0.01)
+
+    def test_draw_cards(self):
+        cards = np.array([card for card in range(52) if card % 3], dtype=np.int8)
+        drawn_cards = draw_cards(np.random.default_rng(5), cards, 1000, 9)
+
+        self.assertEqual(drawn_cards.shape, (1000, 9))
+        self.assertTrue(np.isin(drawn_cards, cards).all())
+        self.assertTrue(all(len(set(row)) == 9 for row in drawn_cards.tolist()))
+
+    def test_too_many_dealer_hands(self):
+        with self.assertRaises(ValueError):
+            estimate_outcome(self.player_hand, self.dealer_hands * 2, trials=10)
+
+    def test_needs_trials(self):
+        for processes in (1, 2):
+            with self.assertRaises(ValueError):
+                estimate_outcome(self.player_hand, trials=0, processes=processes)
+        with self.assertRaises(ValueError):
+            estimate_outcome(self.player_hand, trials=10, shards=0, processes=1)
+
+    def test_needs_distinct_cards(self):
+        with self.assertRaises(ValueError):
+            estimate_outcome(self.player_hand, (self.player_hand,), trials=10, processes=1)
+        with self.assertRaises(ValueError):
+            estimate_outcome(self.player_hand, dead_cards=(self.player_hand[0],), trials=10, processes=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.deck import Deck
+from src.export import COLUMN_DTYPES, ColumnarDataset, export_history
+from src.history import HandHistoryWriter, load_history
+from src.round_engine import RoundEngine, Strategy
+from src.simulator import simulate
+
+
+class ExportTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def get_path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_export_history(self):
+        history_path = self.get_path('history.bin')
+        with HandHistoryWriter(history_path) as history:
+            engine = RoundEngine(Strategy(), 10 ** 9, history=history)
+            deck = Deck(rng=random.Random(2))
+            for _ in range(250):
+                deck.reset()
+                engine.play_round(deck)
+        records = load_history(history_path)
+
+        for file_format in ('npy', 'npz'):
+            dataset = export_history(history_path, self.get_path(file_format), shard_rounds=100, file_format=file_format)
+            self.assertEqual((dataset.rounds, [len(shard) for shard in dataset.shards]), (250, [100, 100, 50]))
+
+            columns = dataset.select(list(COLUMN_DTYPES))
+            for (column, dtype) in COLUMN_DTYPES.items():
+                self.assertEqual(columns[column].dtype, dtype)
+            self.assertTrue(np.array_equal(columns['player_multiple'], records['player_multiple']))
+            self.assertTrue(np.array_equal(columns['player_chip_delta'], np.diff(records['player_chips'], prepend=10 ** 9)))
+
+            flushes = dataset.select(['player_multiple'], where=lambda shard: shard['player_ranking'] == 6)
+            self.assertTrue(np.array_equal(
+                flushes['player_multiple'], records['player_multiple'][records['player_ranking'] == 6]
+            ))
+
+        # Columns of .npy shards are memory-mapped, and only opened when used
+        shard = ColumnarDataset(self.get_path('npy')).shards[0]
+        self.assertIsInstance(shard['wager'], np.memmap)
+        self.assertEqual(sorted(shard.columns), ['wager'])
+
+    def test_simulator_export(self):
+        export_directory = self.get_path('simulation')
+        result = simulate(1000, seed=5, rounds_per_shard=300, processes=1, export_directory=export_directory)
+        dataset = ColumnarDataset(export_directory)
+
+        self.assertEqual(dataset.rounds, 1000)
+        self.assertEqual(dataset.metadata['seed'], 5)
+        columns = dataset.select(['player_multiple', 'player_chip_delta', 'pick'])
+        self.assertEqual(int(columns['player_multiple'].sum()), result.total_multiple)
+        self.assertEqual(int(columns['player_chip_delta'].sum()), result.total_payout)
+        self.assertTrue((columns['pick'] == 0).all())
+
+        with self.assertRaises(ValueError):
+            simulate(10, export_directory=export_directory, export_format='csv')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import os
+import time
+import unittest
+from unittest import mock
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+from src.game_engine import HAND_SCREEN, MENU_SCREEN, ROUND_END_SCREEN, WAGER_SCREEN, WAITING, GameEngine
+from src.gui import GUI
+from src.gui_constants import (
+    ACCEPT_BUTTON_LOCATION,
+    BACK_BUTTON_LOCATION,
+    CONFIRM_BUTTON_LOCATION,
+    PLAY_BUTTON_LOCATION,
+    PLAY_TEXT_LOCATION,
+    WAGER_PLUS_BUTTON_LOCATION
+)
+
+
+class DirtyRectTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.gui = GUI()
+        self.gui.initialize_gui()
+
+    def tearDown(self):
+        pygame.quit()
+
+    def flush(self):
+        """
+        Flushes the GUI and returns the arguments of each display update it made.
+        """
+        with mock.patch('pygame.display.update') as update:
+            self.gui.flush_display()
+        return [call.args for call in update.call_args_list]
+
+    def test_a_screen_is_pushed_in_one_update(self):
+        self.gui.create_menu_screen()
+        self.assertEqual(self.flush(), [()])
+        self.assertEqual(self.flush(), [])
+
+    def test_hover_pushes_only_the_button(self):
+        self.gui.create_menu_screen()
+        self.flush()
+
+        (x, y) = PLAY_TEXT_LOCATION
+        self.gui.update_menu_screen_mouse_motion(0, 0, x, y)
+        self.gui.update_menu_screen_mouse_motion(x, y, 0, 0)
+        [(rects,)] = self.flush()
+
+        self.assertGreater(len(rects), 0)
+        button = pygame.Rect(PLAY_BUTTON_LOCATION)
+        self.assertTrue(all(button.contains(rect) for rect in rects))
+        self.assertEqual(pygame.Rect(rects[0]).unionall(rects[1:]), button)
+
+
+class FrameRateTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.engine = GameEngine(frame_rate=50)
+        self.engine.gui = GUI()
+        self.engine.gui.initialize_gui()
+
+    def tearDown(self):
+        pygame.quit()
+
+    def test_frames_are_capped(self):
+        self.engine.next_frame()
+        start = time.perf_counter()
+        for _ in range(10):
+            self.engine.next_frame()
+        self.assertGreater(time.perf_counter() - start, 0.15)
+
+    def test_waiting_sleeps_between_frames(self):
+        waited = []
+        start = time.process_time()
+        self.engine.wait(200, lambda: waited.append(True))
+        while not waited:
+            self.engine.run_frame()
+        self.assertLess(time.process_time() - start, 0.1)
+
+
+class GameFlowTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = GameEngine(frame_rate=1000)
+        self.engine.start_game()
+
+    def tearDown(self):
+        pygame.quit()
+
+    def click(self, location=(0, 0)):
+        """
+        Clicks the middle of a button (or a point) and runs a frame.
+        """
+        if len(location) == 4:
+            location = pygame.Rect(location).center
+        pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=location, button=1))
+        self.engine.run_frame()
+
+    def test_a_round_with_every_wait_skipped(self):
+        self.assertEqual(self.engine.state, MENU_SCREEN)
+        self.click(PLAY_BUTTON_LOCATION)
+        self.assertEqual(self.engine.state, WAITING)
+        self.click()
+        self.assertEqual(self.engine.state, WAGER_SCREEN)
+
+        self.click(WAGER_PLUS_BUTTON_LOCATION)
+        self.click(CONFIRM_BUTTON_LOCATION)
+        self.assertEqual(self.engine.state, WAITING)
+        self.click()
+        self.assertEqual(self.engine.state, HAND_SCREEN)
+
+        self.click(ACCEPT_BUTTON_LOCATION)
+        for _ in range(4):
+            self.assertEqual(self.engine.state, WAITING)
+            self.click()
+        self.assertEqual(self.engine.state, ROUND_END_SCREEN)
+        self.assertEqual(self.engine.result.wager, 110)
+        self.assertEqual(self.engine.result.pick, 0)
+        self.assertEqual(len(self.engine.scheduler), 0)
+
+        self.click(BACK_BUTTON_LOCATION)
+        self.assertEqual(self.engine.state, MENU_SCREEN)
+
+    def test_waits_end_by_themselves(self):
+        self.click(PLAY_BUTTON_LOCATION)
+        later = pygame.time.get_ticks() + 500
+        with mock.patch.object(self.engine.scheduler, 'get_time', return_value=later):
+            self.engine.run_frame()
+        self.assertEqual(self.engine.state, WAGER_SCREEN)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import unittest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+from src.card import CARDS
+from src.gui import GUI
+from src.gui_constants import DECK_IMG_PATH, TITLE_IMG_PATH
+from src.player import Player
+
+
+class AssetCacheTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.gui = GUI()
+        self.gui.initialize_gui()
+
+    def tearDown(self):
+        pygame.quit()
+
+    def test_images_are_loaded_once_and_converted(self):
+        assets = self.gui.assets
+        display_format = self.gui.game_display.get_bitsize()
+
+        self.assertEqual(len(assets.card_surfaces), 52)
+        self.assertIs(assets.get_card(CARDS[5]), assets.get_card(5))
+        self.assertIs(assets.get_card(CARDS[5]), assets.get_image(CARDS[5].img_path))
+        self.assertEqual(assets.get_card(51).get_size(), (87, 130))
+        self.assertEqual(assets.get_card(51).get_bitsize(), display_format)
+        self.assertTrue(assets.get_image(TITLE_IMG_PATH).get_flags() & pygame.SRCALPHA)
+        self.assertIs(assets.get_image(DECK_IMG_PATH), assets.images[DECK_IMG_PATH])
+        self.assertEqual(len(assets.images), 54)
+
+    def test_cards_are_drawn_from_the_cache(self):
+        player = Player('Player', 1000)
+        dealer = Player('Dealer', 1000)
+        player.add_hand((CARDS[0], CARDS[1]))
+        dealer.add_hand((2, 3))
+        dealer.add_hand((4, 5))
+
+        self.gui.show_first_hand(CARDS[10], CARDS[11])
+        self.gui.reveal_player_cards(player, dealer)
+        self.gui.reveal_common_cards(CARDS[6:11])
+        self.assertEqual(len(self.gui.assets.images), 54)
+
+    def test_fonts_and_text_are_cached(self):
+        assets = self.gui.assets
+        self.assertIs(assets.get_font(20), assets.get_font(20))
+        self.assertIsNot(assets.get_font(20), assets.get_font(30))
+
+        surface = assets.get_text('Play', 20, (255, 255, 255))
+        self.assertIs(assets.get_text('Play', 20, (255, 255, 255)), surface)
+        self.assertIsNot(assets.get_text('Play', 20, (0, 0, 0)), surface)
+
+        self.gui.create_rules_screen()
+        for _ in range(3):
+            self.gui.update_menu_screen_mouse_motion(0, 0, 250, 470)
+            self.gui.update_menu_screen_mouse_motion(250, 470, 0, 0)
+        statistics = assets.text_surfaces.get_statistics()
+        self.assertGreater(statistics.hits, 0)
+        self.assertLessEqual(statistics.entries, 256)
+
+    def test_text_cache_is_bounded(self):
+        for chips in range(300):
+            self.gui.render_text(str(chips), 20, (0, 0), (0, 0, 0))
+        self.assertEqual(len(self.gui.assets.text_surfaces), 256)
+
+
+if __name__ == '__main__':
+    unittest.main()
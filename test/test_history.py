@@ -0,0 +1,93 @@
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+import src.hand_evaluator as poker
+from src.card import to_ints
+from src.deck import Deck
+from src.history import HEADER_SIZE, RECORD_SIZE, HandHistoryWriter, get_round_cards, load_history
+from src.round_engine import RoundEngine, Strategy
+
+
+class PassingStrategy(Strategy):
+    def pick_up(self, hand, rejected_hands):
+        return len(rejected_hands) == 1
+
+
+class HistoryTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'history.bin')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def play_rounds(self, num_rounds, buffer_records=4096, seed=1):
+        with HandHistoryWriter(self.path, buffer_records) as history:
+            engine = RoundEngine(PassingStrategy(), history=history)
+            deck = Deck(rng=random.Random(seed))
+            results = []
+            for _ in range(num_rounds):
+                deck.reset()
+                results.append(engine.play_round(deck))
+        return results
+
+    def test_records_match_rounds(self):
+        results = self.play_rounds(50)
+        records = load_history(self.path)
+
+        self.assertIsInstance(records, np.memmap)
+        self.assertEqual(len(records), 50)
+        for (record, result) in zip(records, results):
+            self.assertEqual(
+                tuple(record['cards']),
+                to_ints(result.player_hand + result.dealer_hands[0] + result.dealer_hands[1] + result.community_cards)
+            )
+            self.assertEqual(record['pick'], 1)
+            self.assertEqual(record['wager'], result.wager)
+            self.assertEqual((record['player_chips'], record['dealer_chips']), (result.player_chips, result.dealer_chips))
+            self.assertEqual(poker.ranking_to_hand[record['player_ranking']], result.player_best_hand)
+            self.assertEqual(poker.ranking_to_hand[record['dealer_ranking']], result.dealer_best_hand)
+            self.assertEqual(
+                (record['player_multiple'], record['dealer_multiple']),
+                (result.player_wager_multiple, result.dealer_wager_multiple)
+            )
+
+    def test_records_feed_the_batch_evaluator(self):
+        self.play_rounds(100)
+        records = load_history(self.path)
+        outcomes = poker.determine_outcome_batch(*get_round_cards(records))
+
+        self.assertTrue(np.array_equal(outcomes[2], records['player_multiple']))
+        self.assertTrue(np.array_equal(outcomes[3], records['dealer_multiple']))
+
+    def test_appending_and_truncated_records(self):
+        self.play_rounds(3, buffer_records=1)
+        self.play_rounds(2, seed=2)
+        self.assertEqual(len(load_history(self.path)), 5)
+
+        # A record cut short is ignored, and dropped by the next writer
+        with open(self.path, 'ab') as history_file:
+            history_file.write(b'\x01' * (RECORD_SIZE // 2))
+        self.assertEqual(len(load_history(self.path)), 5)
+        self.play_rounds(1, seed=3)
+        self.assertEqual(os.path.getsize(self.path), HEADER_SIZE + 6 * RECORD_SIZE)
+        self.assertEqual(load_history(self.path)[5]['wager'], 100)
+
+    def test_empty_and_invalid_files(self):
+        HandHistoryWriter(self.path).close()
+        self.assertEqual(len(load_history(self.path)), 0)
+
+        with open(self.path, 'wb') as history_file:
+            history_file.write(b'not a history file')
+        with self.assertRaises(ValueError):
+            load_history(self.path)
+        with self.assertRaises(ValueError):
+            HandHistoryWriter(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
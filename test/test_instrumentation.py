@@ -0,0 +1,81 @@
+import io
+import json
+import unittest
+
+import src.hand_evaluator as poker
+import src.instrumentation as instrumentation
+from src.card import Card
+from src.round_engine import Strategy
+from src.simulator import simulate_shard
+
+
+class InstrumentationTest(unittest.TestCase):
+    def setUp(self):
+        self.original_determine_outcome = poker.determine_outcome
+        instrumentation.reset_instrumentation()
+
+    def tearDown(self):
+        instrumentation.disable_instrumentation()
+        instrumentation.reset_instrumentation()
+
+    def play_round(self):
+        player_hand = (Card('spades', 14), Card('hearts', 14))
+        dealer_hand_one = (Card('clubs', 7), Card('diamonds', 2))
+        dealer_hand_two = (Card('spades', 9), Card('spades', 8))
+        community_cards = (Card('spades', 2), Card('clubs', 14), Card('spades', 4), Card('diamonds', 10), Card('spades', 6))
+        return poker.determine_outcome(player_hand, dealer_hand_one, dealer_hand_two, community_cards)
+
+    def test_disabled_by_default(self):
+        self.play_round()
+        snapshot = instrumentation.get_snapshot()
+        self.assertFalse(snapshot['enabled'])
+        self.assertEqual(snapshot['categories'], {})
+        self.assertIs(poker.determine_outcome, self.original_determine_outcome)
+
+    def test_counts_calls_and_categories(self):
+        expected_outcome = self.play_round()
+        instrumentation.enable_instrumentation()
+        instrumentation.enable_instrumentation()
+        self.assertEqual(self.play_round(), expected_outcome)
+        self.play_round()
+
+        snapshot = instrumentation.get_snapshot()
+        self.assertTrue(snapshot['enabled'])
+        self.assertEqual(snapshot['functions']['determine_outcome']['calls'], 2)
+        self.assertEqual(snapshot['functions']['find_best_hand']['calls'], 6)
+        # The ties are broken by the strength of each best hand
+        self.assertEqual(snapshot['functions']['get_hand_strength']['calls'], 6)
+        self.assertGreater(snapshot['functions']['get_hand_strength']['total_seconds'], 0)
+        self.assertEqual(snapshot['functions']['break_tie']['calls'], 0)
+        self.assertGreater(snapshot['functions']['determine_outcome']['total_seconds'], 0)
+        # Three of a kind for the player and a flush (from the second hand) for the dealer
+        self.assertEqual(snapshot['categories'], {'three of a kind': 2, 'flush': 2})
+
+        instrumentation.disable_instrumentation()
+        self.play_round()
+        self.assertIs(poker.determine_outcome, self.original_determine_outcome)
+        self.assertEqual(instrumentation.get_snapshot()['functions']['determine_outcome']['calls'], 2)
+
+    def test_dump_snapshot(self):
+        instrumentation.enable_instrumentation()
+        poker.get_best_hand(poker.get_all_possible_hands_sorted(
+            (Card('spades', 14), Card('hearts', 14)),
+            (Card('spades', 2), Card('clubs', 14), Card('spades', 4), Card('diamonds', 10), Card('hearts', 6))
+        ))
+
+        output_file = io.StringIO()
+        instrumentation.dump_snapshot(output_file)
+        snapshot = json.loads(output_file.getvalue())
+        self.assertEqual(snapshot['functions']['get_best_hand']['calls'], 1)
+        self.assertEqual(snapshot['functions']['get_all_possible_hands_sorted']['calls'], 1)
+        self.assertEqual(snapshot['categories'], {})
+
+    def test_counts_simulated_rounds(self):
+        instrumentation.enable_instrumentation()
+        result = simulate_shard((4, 0, 50, Strategy(), None))
+
+        snapshot = instrumentation.get_snapshot()
+        self.assertEqual(snapshot['functions']['determine_outcome_from_table']['calls'], 50)
+        self.assertEqual(sum(snapshot['categories'].values()), 100)
+        for (category, count) in result.player_hand_counts.items():
+            self.assertGreaterEqual(snapshot['categories'][category], count)
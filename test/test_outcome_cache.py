@@ -0,0 +1,88 @@
+import random
+import unittest
+
+import src.hand_evaluator as poker
+from src.card import Card
+from src.outcome_cache import CachedEvaluator, LRUCache
+
+
+class LRUCacheTest(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_entries=2)
+        cache.get_or_compute('a', lambda: 1)
+        cache.get_or_compute('b', lambda: 2)
+        self.assertEqual(cache.get_or_compute('a', lambda: -1), 1)
+        cache.get_or_compute('c', lambda: 3)
+
+        self.assertEqual(set(cache.entries), {'a', 'c'})
+        statistics = cache.get_statistics()
+        self.assertEqual((statistics.hits, statistics.misses, statistics.evictions, statistics.entries), (1, 3, 1, 2))
+        self.assertEqual(statistics.hit_rate(), 0.25)
+
+    def test_byte_limit(self):
+        cache = LRUCache(max_entries=None, max_bytes=2000)
+        for i in range(100):
+            cache.get_or_compute(('key', i), lambda: tuple(range(10)))
+
+        statistics = cache.get_statistics()
+        self.assertLessEqual(statistics.size_bytes, 2000)
+        self.assertEqual(statistics.entries + statistics.evictions, 100)
+        self.assertGreater(statistics.evictions, 0)
+
+    def test_needs_a_limit(self):
+        with self.assertRaises(ValueError):
+            LRUCache(max_entries=None, max_bytes=None)
+
+
+class CachedEvaluatorTest(unittest.TestCase):
+    def test_matches_determine_outcome(self):
+        evaluator = CachedEvaluator(max_entries=50)
+        rng = random.Random(3)
+        for _ in range(300):
+            cards = rng.sample(range(52), 11)
+            deal = (tuple(cards[0:2]), tuple(cards[2:4]), tuple(cards[4:6]), tuple(cards[6:11]))
+            self.assertEqual(evaluator.determine_outcome(*deal), poker.determine_outcome(*deal))
+            self.assertEqual(evaluator.determine_outcome(*deal), poker.determine_outcome(*deal))
+            self.assertEqual(evaluator.find_best_hand(deal[0], deal[3]), poker.find_best_hand(deal[0], deal[3]))
+
+        self.assertLessEqual(len(evaluator.outcome_cache), 50)
+        statistics = evaluator.get_statistics()
+        self.assertEqual(statistics.hits, 300)
+        self.assertEqual(statistics.misses, 600)
+
+    def test_shared_keys(self):
+        evaluator = CachedEvaluator()
+        player_hand = (Card('spades', 14), Card('hearts', 13))
+        dealer_hand_one = (Card('clubs', 7), Card('diamonds', 2))
+        dealer_hand_two = (Card('spades', 9), Card('spades', 8))
+        community_cards = (Card('hearts', 2), Card('clubs', 13), Card('spades', 4), Card('diamonds', 10), Card('hearts', 6))
+        evaluator.determine_outcome(player_hand, dealer_hand_one, dealer_hand_two, community_cards)
+
+        # The same deal with its cards reordered, and with hearts and spades swapped
+        swap = {'spades': 'hearts', 'hearts': 'spades', 'clubs': 'clubs', 'diamonds': 'diamonds'}
+        swapped = lambda cards: tuple(Card(swap[card.suite], card.value) for card in reversed(cards))
+        evaluator.determine_outcome(*map(swapped, (player_hand, dealer_hand_one, dealer_hand_two, community_cards)))
+        evaluator.find_best_hand(player_hand, community_cards)
+        evaluator.find_best_hand(tuple(reversed(player_hand)), tuple(reversed(community_cards)))
+
+        self.assertEqual(evaluator.outcome_cache.get_statistics().hits, 1)
+        self.assertEqual(evaluator.best_hand_cache.get_statistics().hits, 1)
+
+    def test_dealer_hands_in_either_order(self):
+        evaluator = CachedEvaluator()
+        rng = random.Random(8)
+        for _ in range(200):
+            cards = rng.sample(range(52), 11)
+            (hand_one, hand_two, hand_three, community_cards) = (cards[0:2], cards[2:4], cards[4:6], cards[6:11])
+            outcome = evaluator.determine_outcome(hand_one, hand_two, hand_three, community_cards)
+            self.assertEqual(evaluator.determine_outcome(hand_one, hand_three, hand_two, community_cards), outcome)
+
+        # Dealer's hands with the same values, in both orders
+        player_hand = (Card('spades', 14), Card('hearts', 13))
+        dealer_hand_one = (Card('clubs', 9), Card('spades', 8))
+        dealer_hand_two = (Card('spades', 9), Card('clubs', 8))
+        community_cards = (Card('clubs', 2), Card('clubs', 13), Card('clubs', 4), Card('diamonds', 10), Card('hearts', 6))
+        evaluator.determine_outcome(player_hand, dealer_hand_one, dealer_hand_two, community_cards)
+        evaluator.determine_outcome(player_hand, dealer_hand_two, dealer_hand_one, community_cards)
+
+        self.assertEqual(evaluator.outcome_cache.get_statistics().hits, 201)
@@ -1,6 +1,7 @@
+import random
 import unittest
 import src.hand_evaluator as poker
-from src.card import Card
+from src.card import Card, CARDS
 
 class PokerEngineTest(unittest.TestCase):
     def testIsRoyalFlush(self):
@@ -297,6 +298,78 @@ class PokerEngineTest(unittest.TestCase):
         
         self.assertEqual(poker.break_tie_high_card(hand_one, hand_two), 1)
 
+    def test_break_tie_high_card_second_hand(self):
+        hand_one = (Card('spades', 9), Card('clubs', 8), Card('spades', 6), Card('hearts', 5), Card('hearts', 4))
+        hand_two = (Card('diamonds', 14), Card('spades', 8), Card('hearts', 4), Card('spades', 3), Card('clubs', 2))
+
+        self.assertEqual(poker.break_tie_high_card(hand_one, hand_two), 2)
+        self.assertEqual(poker.break_tie_high_card(hand_one, hand_one), 0)
+
+    def test_break_tie_three_of_a_kind_second_kicker(self):
+        hand_one = (Card('spades', 12), Card('hearts', 12), Card('diamonds', 12), Card('clubs', 9), Card('spades', 3))
+        hand_two = (Card('clubs', 12), Card('hearts', 12), Card('diamonds', 12), Card('spades', 9), Card('spades', 4))
+
+        self.assertEqual(poker.break_tie_three_of_a_kind(hand_one, hand_two), 2)
+
+    def test_get_hand_strength(self):
+        full_house = (Card('spades', 10), Card('hearts', 10), Card('clubs', 10), Card('spades', 2), Card('hearts', 2))
+        lower_full_house = (Card('spades', 9), Card('hearts', 9), Card('clubs', 9), Card('spades', 14), Card('hearts', 14))
+        flush = (Card('spades', 14), Card('spades', 13), Card('spades', 12), Card('spades', 11), Card('spades', 9))
+        two_pairs = (Card('spades', 13), Card('hearts', 13), Card('clubs', 12), Card('spades', 5), Card('hearts', 5))
+        better_kicker = (Card('clubs', 13), Card('diamonds', 13), Card('hearts', 14), Card('clubs', 5), Card('diamonds', 5))
+        better_kicker = tuple(sorted(better_kicker, key=lambda card: card.value, reverse=True))
+
+        self.assertEqual(poker.get_strength_ranking(poker.get_hand_strength(full_house)), poker.hand_ranking['full house'])
+        self.assertGreater(poker.get_hand_strength(full_house), poker.get_hand_strength(lower_full_house))
+        self.assertGreater(poker.get_hand_strength(lower_full_house), poker.get_hand_strength(flush))
+        self.assertGreater(poker.get_hand_strength(better_kicker), poker.get_hand_strength(two_pairs))
+        self.assertEqual(
+            poker.get_hand_strength(two_pairs),
+            poker.get_hand_strength(tuple(Card('diamonds' if card.suite == 'spades' else card.suite, card.value) for card in two_pairs))
+        )
+
+    def test_get_best_hand(self):
+        player_hand = (Card('spades', 10), Card('hearts', 10))
+        community_cards = (Card('clubs', 10), Card('spades', 2), Card('hearts', 2), Card('clubs', 2), Card('diamonds', 14))
+
+        (strength, best_hand) = poker.get_best_hand(poker.get_all_possible_hands_sorted(player_hand, community_cards))
+        self.assertEqual(poker.get_strength_ranking(strength), poker.hand_ranking['full house'])
+        self.assertEqual([card.value for card in best_hand], [10, 10, 10, 2, 2])
+
+    def test_find_best_hand(self):
+        player_hand = (Card('spades', 10), Card('hearts', 10))
+        community_cards = (Card('clubs', 10), Card('spades', 2), Card('hearts', 2), Card('clubs', 2), Card('diamonds', 14))
+
+        (strength, best_hand) = poker.find_best_hand(player_hand, community_cards)
+        self.assertEqual(poker.get_strength_ranking(strength), poker.hand_ranking['full house'])
+        self.assertEqual([card.value for card in best_hand], [10, 10, 10, 2, 2])
+
+    def test_find_best_hand_matches_get_best_hand(self):
+        rng = random.Random(10)
+        # Decks of high cards and of two suites make the rarer hands common
+        decks = (
+            CARDS,
+            [card for card in CARDS if card.value >= 9],
+            [card for card in CARDS if card.suite in ('spades', 'hearts')]
+        )
+        for deck in decks:
+            for _ in range(1000):
+                cards = rng.sample(deck, 7)
+                (expected_strength, _) = poker.get_best_hand(poker.get_all_possible_hands_sorted(cards[:2], cards[2:]))
+                (strength, best_hand) = poker.find_best_hand(cards[:2], cards[2:])
+                self.assertEqual(strength, expected_strength)
+                self.assertEqual(poker.get_hand_strength(best_hand), strength)
+
+    def test_iter_possible_hands_sorted(self):
+        player_hand = (Card('spades', 3), Card('hearts', 12))
+        community_cards = (Card('clubs', 10), Card('spades', 14), Card('hearts', 2), Card('clubs', 7), Card('diamonds', 9))
+
+        hands = list(poker.iter_possible_hands_sorted(player_hand, community_cards))
+        expected_hands = poker.get_all_possible_hands_sorted(player_hand, community_cards)
+        self.assertEqual(len(hands), 21)
+        self.assertEqual(sorted(map(list, hands), key=poker.get_hand_strength), sorted(expected_hands, key=poker.get_hand_strength))
+        self.assertEqual([card.value for card in hands[0]], [14, 12, 10, 9, 7])
+
     def test_get_wager_multiples(self):
         self.assertEqual(poker.get_wager_multiples(1, 10), (50, -50))
         self.assertEqual(poker.get_wager_multiples(1, 9), (20, -20))
@@ -0,0 +1,121 @@
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+import src.hand_evaluator as poker
+import src.rank_table as rank_table
+from src.card import Card
+from src.deck import Deck
+
+
+class RankTableTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.table = rank_table.get_rank_table()
+
+    def test_matches_determine_outcome(self):
+        random.seed(1234)
+        for _ in range(500):
+            deck = Deck()
+            hand_one = deck.draw_two_card_hand()
+            hand_two = deck.draw_two_card_hand()
+            hand_three = deck.draw_two_card_hand()
+            community_cards = deck.draw_five_community_cards()
+
+            self.assertEqual(
+                poker.determine_outcome_from_table(hand_one, hand_two, hand_three, community_cards),
+                poker.determine_outcome(hand_one, hand_two, hand_three, community_cards)
+            )
+
+    def test_get_strength_on_board(self):
+        rng = random.Random(99)
+        for _ in range(2000):
+            cards = rng.sample(range(52), 7)
+            board_state = rank_table.get_board_state(cards[2:])
+            self.assertEqual(self.table.get_strength_on_board(cards[:2], board_state), self.table.get_strength(cards))
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = rank_table.get_rank_table_path(directory)
+            rank_table.save_rank_table(self.table, path)
+            self.assertTrue(rank_table.is_valid_rank_table_file(path))
+
+            loaded_table = rank_table.load_rank_table(path, build_if_missing=False)
+            self.assertEqual(list(loaded_table.flush_strengths), list(self.table.flush_strengths))
+            self.assertEqual(
+                loaded_table.non_flush_strengths[:1000000].tobytes(),
+                self.table.non_flush_strengths[:1000000].tobytes()
+            )
+            loaded_table.close()
+
+    def test_missing_table(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'missing.bin')
+            with self.assertRaises(FileNotFoundError):
+                rank_table.load_rank_table(path, build_if_missing=False)
+
+    def test_rejects_other_versions(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'old.bin')
+            with open(path, 'wb') as table_file:
+                table_file.write(rank_table.RANK_TABLE_MAGIC + b'\x00' * 12)
+            self.assertFalse(rank_table.is_valid_rank_table_file(path))
+
+
+class BatchEvaluatorTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(2024)
+        self.rounds = np.argsort(rng.random((2000, 52)), axis=1)[:, :11]
+
+    def test_get_strengths_batch(self):
+        seven_cards = self.rounds[:, 4:11]
+        strengths = poker.get_strengths_batch(seven_cards)
+
+        self.assertEqual(strengths.shape, (2000,))
+        for cards, strength in zip(seven_cards.tolist(), strengths.tolist()):
+            (expected_strength, _) = poker.get_best_hand(poker.get_all_possible_hands_sorted(tuple(cards[:2]), tuple(cards[2:])))
+            self.assertEqual(strength, expected_strength)
+
+    def test_determine_outcome_batch(self):
+        rounds = self.rounds
+        (player_rankings, dealer_rankings, player_multiples, dealer_multiples) = poker.determine_outcome_batch(
+            rounds[:, 0:2], rounds[:, 2:4], rounds[:, 4:6], rounds[:, 6:11]
+        )
+
+        for i, cards in enumerate(rounds.tolist()):
+            outcome = poker.determine_outcome(tuple(cards[0:2]), tuple(cards[2:4]), tuple(cards[4:6]), tuple(cards[6:11]))
+            self.assertEqual(outcome, (
+                poker.ranking_to_hand[player_rankings[i]],
+                poker.ranking_to_hand[dealer_rankings[i]],
+                player_multiples[i],
+                dealer_multiples[i]
+            ))
+
+    def test_many_hands_per_board(self):
+        boards = self.rounds[:20, 6:11]
+        board_states = poker.get_board_states_batch(boards[:, np.newaxis, :])
+        hands = np.array([(low, high) for high in range(52) for low in range(high)])
+        strengths = poker.get_strengths_on_boards_batch(hands, board_states)
+
+        self.assertEqual(strengths.shape, (20, len(hands)))
+        for board, board_strengths in zip(boards, strengths):
+            # Hands sharing a card with the board are never dealt, so their strengths are not checked.
+            dealt = ~np.isin(hands, board).any(axis=1)
+            seven_cards = np.hstack((hands[dealt], np.broadcast_to(board, (int(dealt.sum()), 5))))
+            self.assertEqual(board_strengths[dealt].tolist(), poker.get_strengths_batch(seven_cards).tolist())
+
+    def test_flushes(self):
+        # A royal flush in spades and a flush in hearts, sharing three community cards
+        spades = [int(Card('spades', value)) for value in (14, 13, 12, 11, 10)]
+        hearts = [int(Card('hearts', value)) for value in (9, 7, 5, 3, 2)]
+        cards = np.array([spades + hearts[:2], hearts + spades[:2]])
+
+        rankings = poker.get_strengths_batch(cards) >> poker.STRENGTH_RANKING_SHIFT
+        self.assertEqual(rankings.tolist(), [poker.hand_ranking['royal flush'], poker.hand_ranking['flush']])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.deck import Deck
+from src.history import HEADER_SIZE, HISTORY_RECORD_DTYPE, HandHistoryWriter
+from src.replay import REPLAY_EVALUATORS, Mismatch, replay
+from src.round_engine import RoundEngine, Strategy
+
+
+class ReplayTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, 'history.bin')
+        with HandHistoryWriter(cls.path) as history:
+            engine = RoundEngine(Strategy(), 10 ** 9, history=history)
+            deck = Deck(rng=random.Random(6))
+            for _ in range(300):
+                deck.reset()
+                engine.play_round(deck)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def change_multiple(self, path, index):
+        """
+        Writes a copy of the history with the player's multiple of one round changed.
+        """
+        with open(self.path, 'rb') as history_file:
+            data = bytearray(history_file.read())
+        records = np.frombuffer(data, dtype=HISTORY_RECORD_DTYPE, offset=HEADER_SIZE)
+        records['player_multiple'][index] += 1
+        with open(path, 'wb') as history_file:
+            history_file.write(data)
+
+    def test_unchanged_history(self):
+        for evaluator in REPLAY_EVALUATORS:
+            result = replay(self.path, evaluator=evaluator, chunk_size=64, processes=1)
+            self.assertEqual((result.start, result.end, result.rounds()), (0, 300, 300))
+            self.assertEqual(result.mismatches, [])
+            self.assertGreater(result.rounds_per_second(), 0)
+
+    def test_mismatches(self):
+        path = os.path.join(self.directory.name, 'changed.bin')
+        self.change_multiple(path, 123)
+
+        results = [
+            replay(path, evaluator=evaluator, chunk_size=50, processes=1) for evaluator in REPLAY_EVALUATORS
+        ]
+        self.assertEqual([mismatch.index for mismatch in results[0].mismatches], [123])
+        recorded_outcome = results[0].mismatches[0].recorded_outcome
+        replayed_outcome = results[0].mismatches[0].replayed_outcome
+        self.assertEqual(recorded_outcome[2], replayed_outcome[2] + 1)
+        self.assertEqual(recorded_outcome[:2] + recorded_outcome[3:], replayed_outcome[:2] + replayed_outcome[3:])
+        for result in results[1:]:
+            self.assertEqual(result.mismatches, results[0].mismatches)
+
+        self.assertEqual(replay(path, start=124, processes=1).mismatches, [])
+        self.assertEqual(
+            replay(path, start=100, end=200, chunk_size=30, processes=2).mismatches,
+            [Mismatch(123, recorded_outcome, replayed_outcome)]
+        )
+
+    def test_resuming(self):
+        ends = []
+        result = replay(
+            self.path, start=250, chunk_size=20, processes=1, on_chunk_complete=lambda result: ends.append(result.end)
+        )
+        self.assertEqual(ends, [270, 290, 300])
+        self.assertEqual(result.rounds(), 50)
+        self.assertEqual(replay(self.path, start=400, processes=1).rounds(), 0)
+
+        with self.assertRaises(ValueError):
+            replay(self.path, evaluator='get_best_hand')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import random
+import unittest
+
+import src.hand_evaluator as poker
+from src.deck import Deck
+from src.player import Player
+from src.round_engine import MIN_WAGER, Round, RoundEngine, Strategy, clamp_wager
+
+
+class RejectingStrategy(Strategy):
+    def __init__(self):
+        self.shown_hands = []
+        self.third_hands = []
+        self.results = []
+
+    def get_wager(self, player, dealer):
+        return 50
+
+    def pick_up(self, hand, rejected_hands):
+        self.shown_hands.append((hand, rejected_hands))
+        return False
+
+    def on_third_hand(self, hand):
+        self.third_hands.append(hand)
+
+    def on_round_end(self, result):
+        self.results.append(result)
+
+
+def draw_round_cards(deck):
+    """
+    Returns the eleven cards a round draws from deck, in the order they are drawn.
+    """
+    return [deck.draw() for _ in range(11)]
+
+
+class RoundEngineTest(unittest.TestCase):
+    def setUp(self):
+        random.seed(42)
+
+    def test_pick_up_first_hand(self):
+        engine = RoundEngine(Strategy())
+        deck = Deck(rng=random.Random(7))
+        hands = draw_round_cards(Deck(rng=random.Random(7)))
+        result = engine.play_round(deck)
+
+        self.assertEqual(result.pick, 0)
+        self.assertEqual(result.wager, 100)
+        self.assertEqual(result.player_hand, (hands[0], hands[1]))
+        self.assertEqual(result.dealer_hands, ((hands[2], hands[3]), (hands[4], hands[5])))
+        self.assertEqual(result.community_cards, tuple(hands[6:11]))
+        self.assertEqual(
+            (result.player_best_hand, result.dealer_best_hand, result.player_wager_multiple, result.dealer_wager_multiple),
+            poker.determine_outcome(result.player_hand, *result.dealer_hands, result.community_cards)
+        )
+        self.assertEqual(engine.player.num_chips, 1000 + result.player_payout())
+        self.assertEqual(engine.dealer.num_chips, 1000 - result.player_payout())
+
+    def test_reject_both_hands(self):
+        strategy = RejectingStrategy()
+        engine = RoundEngine(strategy)
+        deck = Deck(rng=random.Random(7))
+        hands = draw_round_cards(Deck(rng=random.Random(7)))
+        result = engine.play_round(deck)
+
+        first_hand = (hands[0], hands[1])
+        second_hand = (hands[2], hands[3])
+        self.assertEqual(strategy.shown_hands, [(first_hand, ()), (second_hand, (first_hand,))])
+        self.assertEqual(strategy.third_hands, [(hands[4], hands[5])])
+        self.assertEqual(strategy.results, [result])
+        self.assertEqual(result.pick, 2)
+        self.assertEqual(result.wager, 50)
+        self.assertEqual(result.dealer_hands, (first_hand, second_hand))
+
+    def test_stepping_through_a_round(self):
+        player = Player('Player', 1000)
+        dealer = Player('Dealer', 1000)
+        deck = Deck(rng=random.Random(7))
+        hands = draw_round_cards(Deck(rng=random.Random(7)))
+        current_round = Round(deck, player, dealer, 100)
+
+        self.assertTrue(current_round.is_choosing())
+        self.assertEqual(current_round.get_shown_hand(), (hands[0], hands[1]))
+        current_round.reject()
+        self.assertEqual(current_round.get_shown_hand(), (hands[2], hands[3]))
+        current_round.accept()
+        self.assertFalse(current_round.is_choosing())
+
+        result = current_round.finish()
+        self.assertEqual(result.pick, 1)
+        self.assertEqual(player.hands, [(hands[2], hands[3])])
+        self.assertEqual(dealer.hands, [(hands[0], hands[1]), (hands[4], hands[5])])
+
+    def test_play_game(self):
+        engine = RoundEngine(Strategy(), starting_chip_number=200)
+        results = engine.play_game()
+
+        self.assertTrue(engine.is_game_over())
+        self.assertGreater(len(results), 0)
+        self.assertTrue(all(result.wager <= 400 for result in results))
+        self.assertEqual(len(engine.play_game(max_rounds=5)), 0)
+        engine.new_game()
+        self.assertLessEqual(len(engine.play_game(max_rounds=5)), 5)
+
+    def test_clamp_wager(self):
+        player = Player('Player', 1000)
+        dealer = Player('Dealer', 300)
+        self.assertEqual(clamp_wager(100, player, dealer), 100)
+        self.assertEqual(clamp_wager(5000, player, dealer), 300)
+        self.assertEqual(clamp_wager(0, player, dealer), MIN_WAGER)
@@ -0,0 +1,57 @@
+import unittest
+
+from src.scheduler import Scheduler
+
+
+class SchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 0
+        self.scheduler = Scheduler(lambda: self.now)
+        self.calls = []
+
+    def schedule(self, delay, name):
+        return self.scheduler.schedule(delay, lambda: self.calls.append(name))
+
+    def test_timers_run_in_order_once_due(self):
+        self.schedule(300, 'c')
+        self.schedule(100, 'a')
+        self.schedule(100, 'b')
+        self.scheduler.run_due()
+        self.assertEqual(self.calls, [])
+
+        self.now = 100
+        self.scheduler.run_due()
+        self.assertEqual(self.calls, ['a', 'b'])
+        self.assertEqual(len(self.scheduler), 1)
+
+        self.now = 1000
+        self.scheduler.run_due()
+        self.scheduler.run_due()
+        self.assertEqual(self.calls, ['a', 'b', 'c'])
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_run_now_and_cancel(self):
+        early = self.schedule(100, 'early')
+        cancelled = self.schedule(100, 'cancelled')
+        self.scheduler.run_now(early)
+        cancelled.cancel()
+        self.scheduler.run_now(cancelled)
+        self.assertEqual(self.calls, ['early'])
+
+        self.now = 100
+        self.scheduler.run_due()
+        self.assertEqual(self.calls, ['early'])
+
+        self.schedule(0, 'cleared')
+        self.scheduler.clear()
+        self.scheduler.run_due()
+        self.assertEqual(self.calls, ['early'])
+
+    def test_callbacks_can_schedule_timers(self):
+        self.scheduler.schedule(0, lambda: self.schedule(0, 'next'))
+        self.scheduler.run_due()
+        self.assertEqual(self.calls, ['next'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from src.round_engine import Strategy
+from src.simulator import SimulationResult, simulate, simulate_shard
+
+
+class PassingStrategy(Strategy):
+    def pick_up(self, hand, rejected_hands):
+        return False
+
+
+class SimulatorTest(unittest.TestCase):
+    def test_reproducible(self):
+        shard_results = {}
+        on_shard_complete = lambda shard_index, shard_result, result: shard_results.setdefault(shard_index, shard_result)
+        result_one = simulate(3000, seed=11, rounds_per_shard=700, processes=1)
+        result_two = simulate(3000, seed=11, rounds_per_shard=700, processes=2, on_shard_complete=on_shard_complete)
+
+        self.assertEqual(result_one, result_two)
+        self.assertEqual(result_one.rounds, 3000)
+        self.assertEqual(result_one.num_shards, 5)
+        self.assertEqual(result_one.seed, 11)
+        self.assertEqual(result_one.wins + result_one.ties + result_one.losses, 3000)
+        self.assertEqual(sum(result_one.player_hand_counts.values()), 3000)
+        self.assertEqual(result_one.pick_counts, (3000, 0, 0))
+        self.assertEqual(result_one.total_payout, 100 * result_one.total_multiple)
+
+        # Any one shard can be replayed on its own
+        self.assertEqual(sorted(shard_results), [0, 1, 2, 3, 4])
+        self.assertEqual(shard_results[4].rounds, 200)
+        self.assertEqual(simulate_shard((11, 3, 700, Strategy(), None)), shard_results[3])
+        self.assertEqual(sum(shard_results.values(), SimulationResult()), result_one)
+
+    def test_strategy(self):
+        result = simulate(500, strategy=PassingStrategy(), seed=3, processes=1)
+        self.assertEqual(result.pick_counts, (0, 0, 500))
+        self.assertNotEqual(result, simulate(500, seed=4, processes=1))
+
+    def test_no_rounds(self):
+        result = SimulationResult()
+        self.assertEqual(
+            (result.win_probability(), result.tie_probability(), result.loss_probability()), (0.0, 0.0, 0.0)
+        )
+        self.assertEqual((result.expected_multiple(), result.standard_error()), (0.0, 0.0))
+        with self.assertRaises(ValueError):
+            simulate(0, seed=3, processes=1)
+        with self.assertRaises(ValueError):
+            simulate(10, seed=3, rounds_per_shard=0, processes=1)
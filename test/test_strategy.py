@@ -0,0 +1,107 @@
+import itertools
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.card import Card, SUITES
+from src.strategy import (
+    NUM_PAIRS, NUM_SECOND_PAIRS, PAIR_CARDS, find_first_hand_classes, find_second_hand_classes,
+    get_pair_index, get_second_pair_decisions, get_strategy_table, load_strategy_table, save_strategy_table, solve_strategy_table
+)
+
+
+class StrategyTableTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.table = solve_strategy_table(trials=4, seed=3, processes=1)
+
+    def test_pair_indexes(self):
+        self.assertEqual(len(PAIR_CARDS), NUM_PAIRS)
+        for pair_index, (low, high) in enumerate(PAIR_CARDS):
+            self.assertEqual(get_pair_index((low, high)), pair_index)
+            self.assertEqual(get_pair_index((high, low)), pair_index)
+        self.assertEqual(get_pair_index((Card('hearts', 14), Card('spades', 14))), get_pair_index((49, 50)))
+
+    def test_classes(self):
+        (first_representatives, first_classes) = find_first_hand_classes()
+        (second_representatives, second_classes) = find_second_hand_classes()
+
+        self.assertEqual(len(first_representatives), 169)
+        self.assertEqual(NUM_SECOND_PAIRS, 1225)
+        self.assertEqual(int((second_classes >= 0).sum()), NUM_PAIRS * NUM_SECOND_PAIRS)
+        self.assertEqual(int(second_classes.max()) + 1, len(second_representatives))
+        self.assertEqual(second_classes[get_pair_index((0, 1)) * NUM_PAIRS + get_pair_index((1, 2))], -1)
+
+    def test_passing_the_first_pair_is_the_mean_over_second_pairs(self):
+        (second_representatives, second_classes) = find_second_hand_classes()
+        rng = np.random.default_rng(5)
+        (accept_second, reject_second, valued_accept, valued_reject) = (
+            rng.normal(size=len(second_representatives)) for _ in range(4)
+        )
+        (second_decisions, reject_first) = get_second_pair_decisions(
+            (accept_second, reject_second), (valued_accept, valued_reject), second_classes
+        )
+
+        for first_index in (0, 77, NUM_PAIRS - 1):
+            first_cards = set(PAIR_CARDS[first_index])
+            values = []
+            for (second_index, second_cards) in enumerate(PAIR_CARDS):
+                situation = first_index * NUM_PAIRS + second_index
+                if first_cards.isdisjoint(second_cards):
+                    situation_class = second_classes[situation]
+                    accept = accept_second[situation_class] >= reject_second[situation_class]
+                    values.append(valued_accept[situation_class] if accept else valued_reject[situation_class])
+                    self.assertEqual(second_decisions[situation], accept)
+                else:
+                    self.assertFalse(second_decisions[situation])
+            self.assertEqual(len(values), NUM_SECOND_PAIRS)
+            self.assertAlmostEqual(reject_first[first_index], np.mean(values))
+
+    def test_barely_better_first_pairs_are_accepted(self):
+        # Every second-pair decision is worth 0, but is estimated with noise; picking up
+        # any first pair is worth slightly more
+        (first_representatives, first_classes) = find_first_hand_classes()
+        (second_representatives, second_classes) = find_second_hand_classes()
+        rng = np.random.default_rng(9)
+        (deciding_second, valuing_second) = (
+            tuple(rng.normal(scale=0.1, size=len(second_representatives)) for _ in range(2)) for _ in range(2)
+        )
+        accept_first = np.full(len(first_representatives), 0.02)
+
+        table = get_strategy_table(accept_first, deciding_second, valuing_second, first_classes, second_classes)
+        self.assertTrue(all(table.should_accept(pair) for pair in PAIR_CARDS))
+        # Valuing the decisions with the estimates that made them would pass every first pair
+        self.assertGreater(np.maximum(*deciding_second).mean(), 0.05)
+
+    def test_obvious_decisions(self):
+        for (suite_one, suite_two) in itertools.combinations(SUITES, 2):
+            self.assertTrue(self.table.should_accept((Card(suite_one, 14), Card(suite_two, 14))))
+            self.assertFalse(self.table.should_accept((Card(suite_one, 7), Card(suite_two, 2))))
+
+        rejected_hand = (Card('clubs', 7), Card('diamonds', 2))
+        self.assertTrue(self.table.should_accept((Card('spades', 14), Card('hearts', 14)), (rejected_hand,)))
+
+    def test_isomorphic_situations_match(self):
+        first_hand = (Card('spades', 12), Card('spades', 11))
+        second_hand = (Card('hearts', 10), Card('spades', 9))
+        decision = self.table.should_accept(second_hand, (first_hand,))
+
+        for permutation in itertools.permutations(SUITES):
+            suite_map = dict(zip(SUITES, permutation))
+            permute = lambda hand: tuple(Card(suite_map[card.suite], card.value) for card in hand)
+            self.assertEqual(self.table.should_accept(permute(first_hand)), self.table.should_accept(first_hand))
+            self.assertEqual(self.table.should_accept(permute(second_hand), (permute(first_hand),)), decision)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'strategy_table.bin')
+            save_strategy_table(self.table, path)
+            loaded_table = load_strategy_table(path)
+
+            self.assertEqual(loaded_table.first_decisions, self.table.first_decisions)
+            self.assertEqual(loaded_table.second_decisions, self.table.second_decisions)
+
+            with self.assertRaises(FileNotFoundError):
+                load_strategy_table(os.path.join(directory, 'missing.bin'))